@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Find expensive Synthesizer V API call patterns in the repository's scripts.
+
+Every API call crosses the script/host bridge, so the cost of a script is dominated by
+how many calls it makes. Using the method metadata from the API IR, this tool looks for
+
+- invariant: API getters inside a loop whose receiver and arguments don't change in it,
+- repeated:  the same API call made more than once per loop iteration,
+- proxy:     indexed access to a `new Proxy(...)` backed note array, where every
+             `notes[i]` / `notes.length` is another getNote / getNumNotes call,
+- quadratic: linear searches or nested note loops inside a loop over notes,
+
+and ranks them by estimated bridge-call count for a configurable project size. A quadratic
+pattern counts as bridge calls only when its inner work calls the API (a Proxy-backed array
+scanned, API calls in the nested loop); otherwise it is reported by its in-script
+comparisons, which are listed separately and left out of the ranking. Loop trip
+counts are guessed from loop headers (`getNumNotes`, `notes.length`, `getNumTracks`, ...),
+sort comparators run n*log2(n) times, and functions are weighted by how often their
+callers (including callbacks such as `processTrack(processNotes, ...)`) invoke them.
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import api_ir
+from check_api import JS_BUILTINS, collect_scripts, strip_literals
+
+
+class ProjectSize(NamedTuple):
+    """Collection sizes used to estimate loop trip counts."""
+    notes: int = 2000      # Notes per group
+    groups: int = 4        # Group references per track
+    tracks: int = 8
+    controls: int = 500    # Pitch controls per group
+    other: int = 8         # Any other array, e.g. voices or selections of UUIDs
+
+
+class ApiInfo(NamedTuple):
+    members: Set[str]
+    getters: Set[str]      # Parameterless get/has/is methods
+    sv_members: Set[str]
+
+
+class Region(NamedTuple):
+    kind: str              # "function", "loop" or "comparator"
+    start: int             # Start of the construct (keyword)
+    body_start: int
+    end: int               # Index past the closing brace / statement
+    name: str = ""
+    params: Tuple[str, ...] = ()
+    header: str = ""
+
+
+class Finding(NamedTuple):
+    path: str
+    line: int
+    kind: str
+    calls: int             # Estimated bridge calls
+    message: str
+    comparisons: int = 0   # Estimated in-script comparisons, for findings without bridge calls
+
+    def __str__(self):
+        count = self.calls or self.comparisons
+        return f"{count:>14,}  {Path(self.path).name}:{self.line}  {self.kind:<9}  {self.message}"
+
+
+_IDENT = r"[A-Za-z_$][\w$]*"
+_FUNCTION_RE = re.compile(rf"\bfunction\b\s*({_IDENT})?\s*\(")
+_LOOP_RE = re.compile(r"\b(for|while)\s*\(")
+_CALL_RE = re.compile(rf"\.\s*({_IDENT})\s*\(")
+_PLAIN_CALL_RE = re.compile(rf"(?<![\w$.])({_IDENT})\s*\(")
+_ASSIGN_RES = (
+    re.compile(rf"\b(?:var|let|const)\s+({_IDENT})"),
+    re.compile(rf"(?<![\w$.])({_IDENT})\s*(?:[-+*/%|&]?=)(?!=)"),
+    re.compile(rf"(?<![\w$.])({_IDENT})\s*(?:\+\+|--)"),
+    re.compile(rf"(?:\+\+|--)\s*({_IDENT})"),
+)
+_NOTE_LIKE_RE = re.compile(r"getNumNotes|[nN]otes\b|entries\b")
+_READER_RE = re.compile(r"(get|has|is)[A-Z]")
+_LINEAR_SEARCH = {"indexOf", "lastIndexOf", "includes", "find", "findIndex", "filter"}
+_KEYWORDS = {"if", "for", "while", "switch", "return", "function", "catch", "typeof", "new"}
+
+_PAIRS = {"(": ")", "[": "]", "{": "}"}
+_CLOSERS = {v: k for k, v in _PAIRS.items()}
+
+
+def load_api_info(classes: List[api_ir.ClassInfo]) -> ApiInfo:
+    """Collect bridge-call names and getters from the parsed classes."""
+    members, getters, sv_members = set(), set(), set()
+    for c in classes:
+        for m in c.methods.values():
+            members.add(m.name)
+            if c.name == "SV":
+                sv_members.add(m.name)
+            if not m.is_property and not m.params and re.match(r"(get|has|is)[A-Z]", m.name):
+                getters.add(m.name)
+    return ApiInfo(members, getters, sv_members)
+
+
+def match_forward(code: str, i: int) -> int:
+    """Index past the bracket closing the one at code[i]."""
+    depth = 0
+    for j in range(i, len(code)):
+        ch = code[j]
+        if ch in _PAIRS:
+            depth += 1
+        elif ch in _CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return j + 1
+    return len(code)
+
+
+def match_backward(code: str, i: int) -> int:
+    """Index of the bracket opening the one closed at code[i]."""
+    depth = 0
+    for j in range(i, -1, -1):
+        ch = code[j]
+        if ch in _CLOSERS:
+            depth += 1
+        elif ch in _PAIRS:
+            depth -= 1
+            if depth == 0:
+                return j
+    return 0
+
+
+def receiver_of(code: str, dot: int) -> str:
+    """The expression before `.member`, e.g. `SV.getProject().getTimeAxis()` or `notes[i]`."""
+    i = dot - 1
+    while True:
+        while i >= 0 and code[i].isspace():
+            i -= 1
+        if i >= 0 and code[i] in ")]":
+            i = match_backward(code, i) - 1
+            continue
+        j = i
+        while j >= 0 and (code[j].isalnum() or code[j] in "_$"):
+            j -= 1
+        if j == i:
+            break
+        i = j
+        k = i
+        while k >= 0 and code[k].isspace():
+            k -= 1
+        if k >= 0 and code[k] == ".":
+            i = k - 1
+            continue
+        break
+    return " ".join(code[i + 1:dot].split())
+
+
+def split_args(text: str) -> List[str]:
+    """Split a call's argument text on top-level commas."""
+    args, depth, current = [], 0, []
+    for ch in text:
+        if ch in _PAIRS:
+            depth += 1
+        elif ch in _CLOSERS:
+            depth -= 1
+        if ch == "," and depth == 0:
+            args.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    if "".join(current).strip():
+        args.append("".join(current).strip())
+    return args
+
+
+def identifiers(text: str) -> Set[str]:
+    """Free identifiers in an expression, ignoring property names after a dot."""
+    return set(re.findall(rf"(?<![\w$.])({_IDENT})", text))
+
+
+def assigned_in(text: str) -> Set[str]:
+    return {name for pattern in _ASSIGN_RES for name in pattern.findall(text)}
+
+
+def find_regions(code: str) -> List[Region]:
+    """Locate functions, loops and sort comparators."""
+    regions = []
+    for m in _FUNCTION_RE.finditer(code):
+        params_end = match_forward(code, m.end() - 1)
+        brace = code.find("{", params_end)
+        if brace < 0:
+            continue
+        end = match_forward(code, brace)
+        params = tuple(p.strip() for p in code[m.end():params_end - 1].split(",") if p.strip())
+        name = m.group(1) or ""
+        before = code[:m.start()].rstrip()
+        if not name:
+            assigned = re.search(rf"({_IDENT})\s*[:=]$", before)
+            name = assigned.group(1) if assigned else ""
+        kind = "comparator" if re.search(r"\.sort\s*\($", before) else "function"
+        regions.append(Region(kind, m.start(), brace + 1, end, name, params))
+
+    for m in _LOOP_RE.finditer(code):
+        if m.group(1) == "while" and code[:m.start()].rstrip().endswith("}"):
+            continue  # Tail of a do-while
+        header_end = match_forward(code, m.end() - 1)
+        rest = code[header_end:].lstrip()
+        body_start = len(code) - len(rest)
+        if rest.startswith("{"):
+            end = match_forward(code, body_start)
+        else:
+            semicolon = code.find(";", body_start)
+            end = semicolon + 1 if semicolon >= 0 else len(code)
+        regions.append(Region("loop", m.start(), body_start, end, header=code[m.start():header_end]))
+    return regions
+
+
+class ScriptAnalysis:
+    """Analysis state for a single script."""
+
+    def __init__(self, path: str, source: str, api: ApiInfo, size: ProjectSize):
+        self.path = path
+        self.code = strip_literals(source)
+        self.api = api
+        self.size = size
+        self.regions = find_regions(self.code)
+        self.functions = {r.name: r for r in self.regions if r.kind == "function" and r.name}
+        self.line_starts = [0] + [i + 1 for i, ch in enumerate(self.code) if ch == "\n"]
+        self.proxy_functions = {name for name, r in self.functions.items()
+                                if "new Proxy(" in self.code[r.body_start:r.end]}
+        self.proxied = self._find_proxied_params()
+        self.invocations = self._invocation_counts()
+
+    def line_of(self, offset: int) -> int:
+        lo, hi = 0, len(self.line_starts)
+        while lo + 1 < hi:
+            mid = (lo + hi) // 2
+            if self.line_starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid
+        return lo + 1
+
+    def function_at(self, offset: int) -> Optional[Region]:
+        """Innermost function (or comparator) containing offset."""
+        best = None
+        for r in self.regions:
+            if r.kind != "loop" and r.body_start <= offset < r.end:
+                if best is None or r.body_start > best.body_start:
+                    best = r
+        return best
+
+    def loops_at(self, offset: int) -> List[Region]:
+        """Loops containing offset within its innermost function, outermost first."""
+        func = self.function_at(offset)
+        lo, hi = (func.body_start, func.end) if func else (0, len(self.code))
+        loops = [r for r in self.regions if r.kind == "loop" and r.start <= offset < r.end
+                 and lo <= r.start < hi]
+        return sorted(loops, key=lambda r: r.start)
+
+    def trips(self, region: Region) -> int:
+        """Estimated iterations of a loop or comparator."""
+        size = self.size
+        if region.kind == "comparator":
+            return max(1, int(size.notes * math.log2(max(size.notes, 2))))
+        header = region.header
+        func = self.function_at(region.start)
+        proxied = self.proxied.get(func.name if func else "", set())
+        if "getNumNoteGroupsInLibrary" in header:
+            return size.groups * size.tracks
+        if "getNumTracks" in header:
+            return size.tracks
+        if "getNumGroups" in header:
+            return size.groups
+        if "getNumPitchControls" in header or "ontrol" in header:
+            return size.controls
+        if _NOTE_LIKE_RE.search(header) or identifiers(header) & proxied:
+            return size.notes
+        bound = re.search(r"<=?\s*(\d+)\s*;", header)
+        if bound:
+            return int(bound.group(1))
+        return size.other
+
+    def is_note_loop(self, region: Region) -> bool:
+        func = self.function_at(region.start)
+        proxied = self.proxied.get(func.name if func else "", set())
+        return bool(_NOTE_LIKE_RE.search(region.header) or identifiers(region.header) & proxied)
+
+    def _calls_in(self, region: Region):
+        """Plain `name(args)` calls in a function body, skipping nested functions."""
+        for m in _PLAIN_CALL_RE.finditer(self.code, region.body_start, region.end):
+            name = m.group(1)
+            if name in _KEYWORDS or self.function_at(m.start()) != region:
+                continue
+            args_end = match_forward(self.code, m.end() - 1)
+            yield m.start(), name, split_args(self.code[m.end():args_end - 1])
+
+    def _find_proxied_params(self) -> Dict[str, Set[str]]:
+        """Variables and parameters holding a Proxy-backed note array, by function name."""
+        proxied: Dict[str, Set[str]] = {}
+        if not self.proxy_functions:
+            return proxied
+
+        def is_proxy_expr(arg):
+            m = re.match(rf"({_IDENT})\s*\(", arg)
+            return bool(m and m.group(1) in self.proxy_functions)
+
+        # Parameters of callback-style helpers invoked with a proxy: process(groupAsNotesArray(g), ...)
+        callback_args: Dict[Tuple[str, int], Set[int]] = {}
+        for func in self.functions.values():
+            for m in re.finditer(rf"\b(?:var|let|const)\s+({_IDENT})\s*=\s*({_IDENT})\s*\(",
+                                 self.code[func.body_start:func.end]):
+                if m.group(2) in self.proxy_functions:
+                    proxied.setdefault(func.name, set()).add(m.group(1))
+            for _, name, args in self._calls_in(func):
+                positions = {i for i, a in enumerate(args) if is_proxy_expr(a)}
+                if not positions:
+                    continue
+                if name in func.params:
+                    callback_args.setdefault((func.name, func.params.index(name)), set()).update(positions)
+                elif name in self.functions:
+                    target = self.functions[name]
+                    proxied.setdefault(name, set()).update(
+                        target.params[i] for i in positions if i < len(target.params))
+
+        # Named functions passed as those callbacks: processTrack(processNotes, ...)
+        for func in self.functions.values():
+            for _, name, args in self._calls_in(func):
+                for index, arg in enumerate(args):
+                    positions = callback_args.get((name, index))
+                    if positions and arg in self.functions:
+                        target = self.functions[arg]
+                        proxied.setdefault(arg, set()).update(
+                            target.params[i] for i in positions if i < len(target.params))
+        return proxied
+
+    def loop_multiplier(self, offset: int) -> int:
+        result = 1
+        for loop in self.loops_at(offset):
+            result *= self.trips(loop)
+        return result
+
+    def _invocation_counts(self) -> Dict[str, int]:
+        """Worst-case invocations of each named function over one run of the script."""
+        callers: Dict[str, List[Tuple[str, int]]] = {}
+        invoked_params: Dict[Tuple[str, int], int] = {}
+        call_sites = []
+        for func in self.functions.values():
+            for offset, name, args in self._calls_in(func):
+                mult = self.loop_multiplier(offset)
+                if name in func.params:
+                    key = (func.name, func.params.index(name))
+                    invoked_params[key] = max(invoked_params.get(key, 0), mult)
+                call_sites.append((func.name, name, args, mult))
+
+        for caller, name, args, mult in call_sites:
+            if name in self.functions:
+                callers.setdefault(name, []).append((caller, mult))
+            for index, arg in enumerate(args):
+                per_call = invoked_params.get((name, index))
+                if per_call and arg in self.functions:
+                    callers.setdefault(arg, []).append((caller, mult * per_call))
+
+        counts: Dict[str, int] = {}
+
+        def count(name, stack=()):
+            if name in counts:
+                return counts[name]
+            if name in stack or name not in callers:
+                return 1
+            result = max(count(caller, stack + (name,)) * mult for caller, mult in callers[name])
+            counts[name] = result
+            return result
+
+        for name in self.functions:
+            count(name)
+        return counts
+
+    def weight(self, offset: int) -> int:
+        """Estimated executions of the code at offset over one run."""
+        weight = self.loop_multiplier(offset)
+        func = self.function_at(offset)
+        # Comparators run inside the function that calls sort
+        while func is not None and func.kind == "comparator":
+            weight *= self.trips(func) * self.loop_multiplier(func.start)
+            func = self.function_at(func.start)
+        if func is not None:
+            weight *= self.invocations.get(func.name, 1)
+        return weight
+
+    def findings(self) -> List[Finding]:
+        results = []
+        results += self._invariant_and_repeated()
+        results += self._proxy_accesses()
+        results += self._quadratic()
+        return sorted(results, key=lambda f: (-f.calls, -f.comparisons, f.line))
+
+    def _is_api_call(self, receiver: str, member: str) -> bool:
+        if receiver == "SV":
+            return member in self.api.sv_members
+        return member in self.api.members and member not in JS_BUILTINS
+
+    def _invariant_and_repeated(self) -> List[Finding]:
+        results = []
+        seen: Dict[Tuple[int, str], List[int]] = {}
+        for m in _CALL_RE.finditer(self.code):
+            member = m.group(1)
+            receiver = receiver_of(self.code, m.start())
+            if not self._is_api_call(receiver, member):
+                continue
+            loops = self.loops_at(m.start())
+            if not loops and (self.function_at(m.start()) or Region("", 0, 0, 0)).kind != "comparator":
+                continue
+            args_end = match_forward(self.code, m.end() - 1)
+            call = f"{receiver}.{member}({' '.join(self.code[m.end():args_end - 1].split())})"
+
+            if _READER_RE.match(member):
+                inner = loops[-1] if loops else self.function_at(m.start())
+                seen.setdefault((inner.start, call), []).append(m.start())
+
+            chain_calls = [c for c in re.findall(rf"\.\s*({_IDENT})\s*\(", call)]
+            if member not in self.api.getters or any(c not in self.api.getters for c in chain_calls):
+                continue
+            used = identifiers(call) - {"SV"}
+            hoist_from = None
+            for loop in loops:
+                if not (used & assigned_in(self.code[loop.start:loop.end])):
+                    hoist_from = loop
+                    break
+            if hoist_from is None:
+                continue
+            calls = self.weight(m.start())
+            results.append(Finding(
+                self.path, self.line_of(m.start()), "invariant", calls,
+                f"{call} does not change inside the loop at line {self.line_of(hoist_from.start)}; "
+                f"call it once before the loop"))
+
+        for (_, call), offsets in seen.items():
+            if len(offsets) > 1:
+                extra = sum(self.weight(o) for o in offsets[1:])
+                results.append(Finding(
+                    self.path, self.line_of(offsets[0]), "repeated", extra,
+                    f"{call} is called {len(offsets)} times per iteration; keep the result in a variable"))
+        return results
+
+    def _proxy_accesses(self) -> List[Finding]:
+        results = []
+        for name, variables in self.proxied.items():
+            func = self.functions.get(name)
+            if func is None:
+                continue
+            body = self.code[func.body_start:func.end]
+            for var in variables:
+                for m in re.finditer(rf"(?<![\w$.]){re.escape(var)}\s*(\[|\.length\b)", body):
+                    offset = func.body_start + m.start()
+                    if not self.loops_at(offset):
+                        continue
+                    bridge = "getNote" if m.group(1) == "[" else "getNumNotes"
+                    results.append(Finding(
+                        self.path, self.line_of(offset), "proxy", self.weight(offset),
+                        f"{var}{'[...]' if bridge == 'getNote' else '.length'} in {name}() goes through the "
+                        f"Proxy, one {bridge}() bridge call per access; read the notes into an array once"))
+        return results
+
+    def _bridge_calls_in(self, region: Region) -> int:
+        """Estimated bridge calls made by the API calls and Proxy accesses within a region."""
+        calls = 0
+        for m in _CALL_RE.finditer(self.code, region.start, region.end):
+            if self._is_api_call(receiver_of(self.code, m.start()), m.group(1)):
+                calls += self.weight(m.start())
+        func = self.function_at(region.start)
+        for var in self.proxied.get(func.name if func else "", set()):
+            for m in re.finditer(rf"(?<![\w$.]){re.escape(var)}\s*(\[|\.length\b)", self.code[region.start:region.end]):
+                calls += self.weight(region.start + m.start())
+        return calls
+
+    def _quadratic(self) -> List[Finding]:
+        results = []
+        for m in _CALL_RE.finditer(self.code):
+            member = m.group(1)
+            if member not in _LINEAR_SEARCH:
+                continue
+            loops = self.loops_at(m.start())
+            if not loops:
+                continue
+            # Only arrays that grow inside the same loop, e.g. visited.indexOf(...) / visited.push(...)
+            receiver = receiver_of(self.code, m.start())
+            loop = loops[-1]
+            if not re.search(rf"(?<![\w$.]){re.escape(receiver)}\s*\.\s*push\s*\(",
+                             self.code[loop.start:loop.end]):
+                continue
+            n = self.trips(loop)
+            scans = self.weight(m.start()) * n // 2
+            func = self.function_at(m.start())
+            if receiver in self.proxied.get(func.name if func else "", set()):
+                # Every element the scan reads is a getNote call
+                results.append(Finding(
+                    self.path, self.line_of(m.start()), "quadratic", scans,
+                    f"{receiver}.{member}() scans a Proxy-backed array that grows with every iteration, "
+                    f"one getNote() per element; read the notes into an array once"))
+            else:
+                results.append(Finding(
+                    self.path, self.line_of(m.start()), "quadratic", 0,
+                    f"{receiver}.{member}() scans an array that grows with the loop "
+                    f"(at most ~n^2/2 comparisons); use an object as a set", comparisons=scans))
+
+        for inner in (r for r in self.regions if r.kind == "loop"):
+            outer = self.loops_at(inner.start)
+            outer = [o for o in outer if o.start != inner.start]
+            # A nested `while` usually advances the outer cursor (runs of notes), which stays linear
+            fresh_counter = re.match(rf"for\s*\(\s*(?:var|let)\s+{_IDENT}\s*=", inner.header)
+            if outer and fresh_counter and self.is_note_loop(inner) and self.is_note_loop(outer[-1]):
+                calls = self._bridge_calls_in(inner)
+                message = (f"note loop nested in the note loop at line {self.line_of(outer[-1].start)}; "
+                           f"O(n^2) in the number of notes")
+                if calls:
+                    results.append(Finding(self.path, self.line_of(inner.start), "quadratic", calls,
+                                           f"{message}, with bridge calls in the inner loop"))
+                else:
+                    results.append(Finding(self.path, self.line_of(inner.start), "quadratic", 0, message,
+                                           comparisons=self.weight(inner.body_start)))
+        return results
+
+
+def analyze(path: str, api: ApiInfo, size: ProjectSize) -> List[Finding]:
+    source = Path(path).read_text(encoding="utf-8")
+    return ScriptAnalysis(path, source, api, size).findings()
+
+
+def main():
+    repo_root = Path(__file__).resolve().parent.parent
+    defaults = ProjectSize()
+
+    parser = argparse.ArgumentParser(description="Rank expensive Synthesizer V API call patterns in scripts.")
+    parser.add_argument("paths", nargs="*", default=[str(repo_root)],
+                        help="scripts or directories of scripts (default: repository root)")
+    parser.add_argument("--ir", default=api_ir.DEFAULT_IR_PATH, help="API IR written by generate_types.py")
+    parser.add_argument("--docs-dir", default=api_ir.DEFAULT_DOCS_DIR, help="HTML docs, used when the IR is missing; the .d.ts is used when both are")
+    for field in ProjectSize._fields:
+        parser.add_argument(f"--{field}", type=int, default=getattr(defaults, field),
+                            help=f"project size: {field} (default {getattr(defaults, field)})")
+    parser.add_argument("--top", type=int, default=10, help="findings to show per script, 0 for all")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        api = load_api_info(api_ir.load_classes(Path(args.ir), Path(args.docs_dir)))
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 2
+    size = ProjectSize(*(getattr(args, field) for field in ProjectSize._fields))
+
+    report = {str(p): analyze(str(p), api, size) for p in collect_scripts(args.paths)}
+    ranked = sorted(report.items(), key=lambda item: -sum(f.calls for f in item[1]))
+
+    if args.json:
+        print(json.dumps({path: [f._asdict() for f in findings] for path, findings in ranked}, indent=1))
+        return 0
+
+    print(f"Project size: {', '.join(f'{k}={v}' for k, v in size._asdict().items())}")
+    for path, findings in ranked:
+        if not findings:
+            continue
+        bridged = [f for f in findings if f.calls]
+        in_script = [f for f in findings if not f.calls]
+        print(f"\n{Path(path).name}: ~{sum(f.calls for f in bridged):,} avoidable bridge calls")
+        for finding in bridged[:args.top or None]:
+            print(f"  {finding}")
+        if in_script:
+            print(f"  in-script comparisons, not bridge calls (~{sum(f.comparisons for f in in_script):,}):")
+            for finding in in_script[:args.top or None]:
+                print(f"  {finding}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
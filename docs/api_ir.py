@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Compact intermediate representation (IR) of the Synthesizer V Studio Scripting API.
+
+`generate_types.py` parses the HTML documentation into `ClassInfo` / `MethodInfo`
+records. This module defines those records and a versioned on-disk format for them,
+so downstream tools can load the parsed API instead of re-parsing HTML.
+
+Two encodings are supported, selected by file suffix:
+
+JSON (`.json`), human readable and diffable:
+
+    {
+      "format": "svapi-ir",
+      "version": 1,
+      "classes": [
+        {
+          "name": "Note", "description": "...", "extends": "ScriptableNestedObject",
+          "methods": [
+            {
+              "name": "getOnset", "params": [["name", "type", "description"], ...],
+              "returnType": "number", "returnDesc": "...", "description": "...",
+              "inheritedFrom": null, "static": false, "property": false
+            }
+          ]
+        }
+      ]
+    }
+
+Binary (`.bin`), all integers little-endian:
+
+    header   "SVIR" | u16 version | u16 flags (0) | u32 string count | u32 class count
+    strings  u32 byte length | UTF-8 strings joined by NUL
+    records  u32 count | u32 values
+
+Every string in the records is an index into the string table, `NONE` (0xFFFFFFFF)
+encodes a missing value. Records are laid out as
+
+    class:  name, description, extends, method count, methods...
+    method: name, return type, return desc, description, inherited from,
+            flags (1 = static, 2 = property), param count, (name, type, description)...
+
+The version is bumped whenever either layout changes; loaders reject other versions.
+"""
+
+import json
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+IR_FORMAT = "svapi-ir"
+IR_VERSION = 1
+
+DOCS_DIR = Path(__file__).resolve().parent
+DEFAULT_IR_PATH = DOCS_DIR / "synthesizer-v-api.ir.json"
+DEFAULT_DOCS_DIR = DOCS_DIR / "dreamtonics-api"
+DEFAULT_DTS_PATH = DOCS_DIR / "synthesizer-v-api.d.ts"
+
+_MAGIC = b"SVIR"
+_HEADER = struct.Struct("<4sHHII")
+_U32 = struct.Struct("<I")
+_NONE = 0xFFFFFFFF
+
+_FLAG_STATIC = 1
+_FLAG_PROPERTY = 2
+
+_intern = sys.intern
+
+
+class ParamInfo(NamedTuple):
+    """A single method parameter. Strings are interned, so repeated types share storage."""
+    name: str
+    type: str
+    description: str
+
+
+class MethodInfo:
+    """Information about a method or property."""
+    __slots__ = (
+        "name", "params", "return_type", "return_desc", "description",
+        "inherited_from", "is_static", "is_property",
+    )
+
+    def __init__(self):
+        self.name = ""
+        self.params: List[ParamInfo] = []
+        self.return_type = "void"
+        self.return_desc = ""  # Detailed return type description from HTML
+        self.description = ""
+        self.inherited_from: Optional[str] = None
+        self.is_static = False
+        self.is_property = False  # True for constants/properties, False for methods
+
+
+class ClassInfo:
+    """Information about a class."""
+    __slots__ = ("name", "methods", "description", "extends")
+
+    def __init__(self, name: str):
+        self.name = _intern(name)
+        self.methods: Dict[str, MethodInfo] = {}  # Use dict to avoid duplicates
+        self.description = ""
+        self.extends: Optional[str] = None
+
+
+class IRFormatError(ValueError):
+    """Raised when a file is not a compatible serialized IR."""
+
+
+def classes_to_json(classes: Iterable[ClassInfo]) -> dict:
+    """Convert classes to the JSON document structure."""
+    return {
+        "format": IR_FORMAT,
+        "version": IR_VERSION,
+        "classes": [
+            {
+                "name": c.name,
+                "description": c.description,
+                "extends": c.extends,
+                "methods": [
+                    {
+                        "name": m.name,
+                        "params": [list(p) for p in m.params],
+                        "returnType": m.return_type,
+                        "returnDesc": m.return_desc,
+                        "description": m.description,
+                        "inheritedFrom": m.inherited_from,
+                        "static": m.is_static,
+                        "property": m.is_property,
+                    }
+                    for m in c.methods.values()
+                ],
+            }
+            for c in classes
+        ],
+    }
+
+
+def classes_from_json(doc: dict) -> List[ClassInfo]:
+    """Build classes from the JSON document structure."""
+    if doc.get("format") != IR_FORMAT:
+        raise IRFormatError(f"not an IR document: format={doc.get('format')!r}")
+    if doc.get("version") != IR_VERSION:
+        raise IRFormatError(f"unsupported IR version {doc.get('version')}, expected {IR_VERSION}")
+
+    classes = []
+    for c in doc["classes"]:
+        class_info = ClassInfo(c["name"])
+        class_info.description = _intern(c["description"])
+        class_info.extends = _intern(c["extends"]) if c["extends"] else None
+        for m in c["methods"]:
+            method = MethodInfo()
+            method.name = _intern(m["name"])
+            method.params = [ParamInfo(_intern(n), _intern(t), _intern(d)) for n, t, d in m["params"]]
+            method.return_type = _intern(m["returnType"])
+            method.return_desc = _intern(m["returnDesc"])
+            method.description = _intern(m["description"])
+            method.inherited_from = _intern(m["inheritedFrom"]) if m["inheritedFrom"] else None
+            method.is_static = m["static"]
+            method.is_property = m["property"]
+            class_info.methods[method.name] = method
+        classes.append(class_info)
+    return classes
+
+
+def dumps_binary(classes: Iterable[ClassInfo]) -> bytes:
+    """Encode classes in the binary format."""
+    strings: List[str] = []
+    index: Dict[str, int] = {}
+
+    def ref(s: Optional[str]) -> int:
+        if s is None:
+            return _NONE
+        i = index.get(s)
+        if i is None:
+            if "\0" in s:
+                raise ValueError(f"string contains NUL: {s!r}")
+            i = index[s] = len(strings)
+            strings.append(s)
+        return i
+
+    classes = list(classes)
+    records = array("I")
+    for c in classes:
+        records.extend((ref(c.name), ref(c.description), ref(c.extends), len(c.methods)))
+        for m in c.methods.values():
+            flags = (_FLAG_STATIC if m.is_static else 0) | (_FLAG_PROPERTY if m.is_property else 0)
+            records.extend((
+                ref(m.name), ref(m.return_type), ref(m.return_desc), ref(m.description),
+                ref(m.inherited_from), flags, len(m.params),
+            ))
+            for p in m.params:
+                records.extend((ref(p.name), ref(p.type), ref(p.description)))
+
+    if sys.byteorder != "little":
+        records.byteswap()
+    blob = "\0".join(strings).encode("utf-8")
+    return b"".join((
+        _HEADER.pack(_MAGIC, IR_VERSION, 0, len(strings), len(classes)),
+        _U32.pack(len(blob)), blob,
+        _U32.pack(len(records)), records.tobytes(),
+    ))
+
+
+def loads_binary(data: bytes) -> List[ClassInfo]:
+    """Decode classes from the binary format."""
+    if len(data) < _HEADER.size:
+        raise IRFormatError("truncated IR header")
+    magic, version, _flags, string_count, class_count = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise IRFormatError("not a binary IR file")
+    if version != IR_VERSION:
+        raise IRFormatError(f"unsupported IR version {version}, expected {IR_VERSION}")
+
+    offset = _HEADER.size
+    (blob_len,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    blob = data[offset:offset + blob_len].decode("utf-8")
+    offset += blob_len
+    strings = [_intern(s) for s in blob.split("\0")] if string_count else []
+    if len(strings) != string_count:
+        raise IRFormatError("string table size mismatch")
+
+    (record_count,) = _U32.unpack_from(data, offset)
+    offset += _U32.size
+    records = array("I")
+    records.frombytes(data[offset:offset + record_count * records.itemsize])
+    if sys.byteorder != "little":
+        records.byteswap()
+
+    def text(i: int) -> Optional[str]:
+        return None if i == _NONE else strings[i]
+
+    it = iter(records)
+    classes = []
+    for _ in range(class_count):
+        class_info = ClassInfo(strings[next(it)])
+        class_info.description = strings[next(it)]
+        class_info.extends = text(next(it))
+        for _ in range(next(it)):
+            method = MethodInfo()
+            method.name = strings[next(it)]
+            method.return_type = strings[next(it)]
+            method.return_desc = strings[next(it)]
+            method.description = strings[next(it)]
+            method.inherited_from = text(next(it))
+            flags = next(it)
+            method.is_static = bool(flags & _FLAG_STATIC)
+            method.is_property = bool(flags & _FLAG_PROPERTY)
+            method.params = [
+                ParamInfo(strings[next(it)], strings[next(it)], strings[next(it)])
+                for _ in range(next(it))
+            ]
+            class_info.methods[method.name] = method
+        classes.append(class_info)
+    return classes
+
+
+def dump_ir(classes: Iterable[ClassInfo], path: Path) -> None:
+    """Write classes to path; `.bin` selects the binary format, anything else JSON."""
+    path = Path(path)
+    if path.suffix == ".bin":
+        path.write_bytes(dumps_binary(classes))
+    else:
+        text = json.dumps(classes_to_json(classes), ensure_ascii=False, separators=(",", ":"))
+        path.write_text(text, encoding="utf-8")
+
+
+def load_ir(path: Path) -> List[ClassInfo]:
+    """Read classes written by `dump_ir`, detecting the format from the content."""
+    data = Path(path).read_bytes()
+    if data[:len(_MAGIC)] == _MAGIC:
+        return loads_binary(data)
+    return classes_from_json(json.loads(data.decode("utf-8")))
+
+
+# Declarations as generate_types.py writes them into synthesizer-v-api.d.ts
+_DTS_CLASS_RE = re.compile(r"declare (?:class (\w+)(?: extends (\w+))?|const (\w+) :) \{$")
+_DTS_MEMBER_RE = re.compile(r"  (static )?(readonly )?(\w+)(?:\((.*)\))?: (.+);$")
+_DTS_PARAM_RE = re.compile(r", (?=[A-Za-z_$][\w$]*\??: )")
+
+
+def parse_dts(text: str) -> List[ClassInfo]:
+    """
+    Recover the classes from TypeScript definitions written by generate_types.py.
+
+    Used when neither an IR nor the HTML documentation is available. The definitions
+    only list each class's own members, so nothing is marked as inherited; types are
+    the TypeScript ones.
+    """
+    classes: List[ClassInfo] = []
+    current: Optional[ClassInfo] = None
+    comment: Optional[List[str]] = None
+    doc: List[str] = []
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if comment is not None:
+            if stripped.startswith("*/"):
+                doc, comment = comment, None
+            elif stripped.startswith("*"):
+                comment.append(stripped[1:].strip())
+            elif comment:
+                comment[-1] += " " + stripped  # A wrapped line of the previous tag or sentence
+            continue
+        if stripped.startswith("/**"):
+            comment = []
+            continue
+
+        match = _DTS_CLASS_RE.match(line)
+        if match:
+            current = ClassInfo(match.group(1) or match.group(3))
+            current.extends = match.group(2) and _intern(match.group(2))
+            current.description = _intern(" ".join(d for d in doc if not d.startswith("@")))
+            classes.append(current)
+            doc = []
+            continue
+        if line.startswith("}"):
+            current = None
+            continue
+
+        match = _DTS_MEMBER_RE.match(line)
+        if current is None or not match:
+            if stripped:
+                doc = []
+            continue
+
+        static, readonly, name, params, return_type = match.groups()
+        method = MethodInfo()
+        method.name = _intern(name)
+        method.is_static = bool(static)
+        method.is_property = params is None
+        method.return_type = _intern(return_type)
+        method.description = _intern(" ".join(d for d in doc if not d.startswith("@")))
+
+        descriptions = {}
+        for tag in doc:
+            if tag.startswith("@param "):
+                param, _, description = tag[len("@param "):].partition(" ")
+                descriptions[param] = description
+        for param in _DTS_PARAM_RE.split(params) if params else []:
+            param_name, _, param_type = param.partition(": ")
+            param_name = param_name.rstrip("?")
+            method.params.append(ParamInfo(_intern(param_name), _intern(param_type),
+                                           _intern(descriptions.get(param_name, ""))))
+        current.methods[method.name] = method
+        doc = []
+
+    return classes
+
+
+def load_classes(ir_path: Optional[Path] = None, docs_dir: Optional[Path] = None,
+                 dts_path: Optional[Path] = None) -> List[ClassInfo]:
+    """
+    Load the API classes for a downstream tool.
+
+    Uses the serialized IR when it exists, then the HTML documentation, and finally the
+    committed TypeScript definitions, so the tools work on a fresh checkout. Default
+    paths are next to this module, whatever the working directory.
+    """
+    ir_path = Path(ir_path or DEFAULT_IR_PATH)
+    docs_dir = Path(docs_dir or DEFAULT_DOCS_DIR)
+    dts_path = Path(dts_path or DEFAULT_DTS_PATH)
+    if ir_path.exists():
+        return load_ir(ir_path)
+    if docs_dir.exists():
+        from generate_types import parse_docs_dir
+        return parse_docs_dir(docs_dir, verbose=False)
+    if dts_path.exists():
+        return parse_dts(dts_path.read_text(encoding="utf-8"))
+    raise FileNotFoundError(
+        f"None of {ir_path}, {docs_dir} or {dts_path} exists, run download.py and generate_types.py first.")
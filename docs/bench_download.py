@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Benchmark download.py offline, against a local stand-in for the documentation server.
+
+The 24 pages are served from a recorded copy (`dreamtonics-api/`, as written by
+download.py) by a local HTTP server that shapes every response: a time to first byte
+with random jitter, a bandwidth cap, and a share of requests failing with 503 or with
+a connection reset halfway through the body. Faults and jitter come from a seeded
+random generator, so a scenario injects the same faults on every run.
+
+`download_all` runs once per scenario and repetition, and the median wall time,
+throughput (correctly saved bytes per second) and failure count are compared with
+a stored baseline. Without a recording, synthetic pages with the same names are used.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import socket
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import download
+
+DEFAULT_PAGES_DIR = "dreamtonics-api"
+DEFAULT_BASELINE_PATH = "bench_download_baseline.json"
+URL_PREFIX = "/scripting/"
+
+CHUNK_SIZE = 16 * 1024  # Bytes written between bandwidth pauses
+MIN_DIFFERENCE = 0.05  # Seconds; smaller wall time changes are timer and scheduler noise
+
+
+class Scenario(NamedTuple):
+    name: str
+    latency: float  # Seconds to the first byte of every response
+    jitter: float  # Up to this many seconds added to the latency
+    bandwidth: float  # Bytes per second, 0 for unlimited
+    error_rate: float  # Share of requests answered with 503
+    reset_rate: float  # Share of requests reset halfway through the body
+    description: str
+
+
+SCENARIOS = {s.name: s for s in [
+    Scenario("fast-lan", 0.001, 0.001, 0, 0.0, 0.0,
+             "local network, no faults"),
+    Scenario("transatlantic", 0.18, 0.04, 256 * 1024, 0.0, 0.0,
+             "180 ms round trip at 2 Mbit/s"),
+    Scenario("flaky-mirror", 0.06, 0.25, 1024 * 1024, 0.1, 0.1,
+             "overloaded mirror: 10% errors, 10% resets, high jitter"),
+]}
+
+
+def recorded_pages(directory: Path) -> Optional[Dict[str, bytes]]:
+    """The pages download.py fetches, read from a previous download, or None if any is missing."""
+    names = download.ADDITIONAL_PAGES + [f"{c}.html" for c in download.CLASSES]
+    if not all((directory / name).is_file() for name in names):
+        return None
+    return {name: (directory / name).read_bytes() for name in names}
+
+
+def synthetic_pages(seed: int = 1) -> Dict[str, bytes]:
+    """Pages with the downloaded names and sizes typical of the documentation (8 to 120 KB)."""
+    rng = random.Random(seed)
+    words = "note group track time position blick value returns index of the in a to is".split()
+    pages = {}
+    for name in download.ADDITIONAL_PAGES + [f"{c}.html" for c in download.CLASSES]:
+        size = rng.randrange(8 * 1024, 120 * 1024)
+        body = []
+        while sum(map(len, body)) < size:
+            body.append(f"<p>{' '.join(rng.choice(words) for _ in range(20))}</p>\n")
+        pages[name] = f"<html><head><title>{name}</title></head><body>\n{''.join(body)}</body></html>\n".encode()
+    return pages
+
+
+class ShapedServer(ThreadingHTTPServer):
+    """Serves `pages` under URL_PREFIX, shaped as the scenario describes."""
+
+    daemon_threads = True
+
+    def __init__(self, pages: Dict[str, bytes], scenario: Scenario, seed: int):
+        super().__init__(("127.0.0.1", 0), ShapedHandler)
+        self.pages = pages
+        self.scenario = scenario
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "resets": 0}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{URL_PREFIX}"
+
+    def draw(self):
+        """Delay and fault for the next request, in request order."""
+        s = self.scenario
+        with self.lock:
+            self.counts["requests"] += 1
+            delay = s.latency + self.rng.uniform(0, s.jitter)
+            fault = self.rng.random()
+            if fault < s.error_rate:
+                self.counts["errors"] += 1
+                return delay, "error"
+            if fault < s.error_rate + s.reset_rate:
+                self.counts["resets"] += 1
+                return delay, "reset"
+            return delay, None
+
+
+class ShapedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        delay, fault = self.server.draw()
+        time.sleep(delay)
+
+        name = self.path[len(URL_PREFIX):] if self.path.startswith(URL_PREFIX) else None
+        body = self.server.pages.get(name)
+        if body is None:
+            self.send_error(404)
+            return
+        if fault == "error":
+            self.send_error(503, "Service Unavailable")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        length = len(body) // 2 if fault == "reset" else len(body)
+        bandwidth = self.server.scenario.bandwidth
+        started = time.perf_counter()
+        for sent in range(0, length, CHUNK_SIZE):
+            chunk = body[sent:min(sent + CHUNK_SIZE, length)]
+            self.wfile.write(chunk)
+            if bandwidth:
+                ahead = (sent + len(chunk)) / bandwidth - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+        if fault == "reset":
+            # Zero linger makes close() send RST instead of FIN
+            self.wfile.flush()
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.connection.close()
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Measurement(NamedTuple):
+    wall: float  # Seconds
+    throughput: float  # Correctly saved bytes per second
+    failures: int  # Pages download_all reported as failed
+    corrupt: int  # Pages reported saved whose content differs from the server's
+    requests: int
+    injected: int  # Errors and resets the server injected
+
+
+def run_scenario(pages: Dict[str, bytes], scenario: Scenario, seed: int, delay: Optional[float]) -> Measurement:
+    """Run download_all once against a fresh server."""
+    server = ShapedServer(pages, scenario, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            kwargs = {} if delay is None else {"delay": delay}
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                _, failures = download.download_all(server.base_url, Path(tmp), **kwargs)
+                wall = time.perf_counter() - started
+
+            saved = corrupt = 0
+            for name, body in pages.items():
+                path = Path(tmp) / name
+                if not path.exists():
+                    continue
+                if path.read_bytes() == body:
+                    saved += len(body)
+                else:
+                    corrupt += 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    counts = server.counts
+    return Measurement(wall, saved / wall, failures, corrupt, counts["requests"], counts["errors"] + counts["resets"])
+
+
+def median(measurements: List[Measurement]) -> Measurement:
+    return Measurement(*(statistics.median(values) for values in zip(*measurements)))
+
+
+def compare(name: str, result: Measurement, baseline: Optional[dict], tolerance: float) -> bool:
+    """Print a scenario's result against its baseline; returns False on a regression."""
+    line = (f"{name:<14} {result.wall:7.2f}s {result.throughput / 1024:8.1f} KB/s "
+            f"{result.failures:3.0f} failed {result.corrupt:2.0f} corrupt  "
+            f"({result.requests:.0f} requests, {result.injected:.0f} faults)")
+    if not baseline:
+        print(line + "  [no baseline]")
+        return True
+
+    change = result.wall / baseline["wall"] - 1
+    slower = change > tolerance and result.wall - baseline["wall"] > MIN_DIFFERENCE
+    regressed = slower or result.failures > baseline["failures"] or result.corrupt > baseline["corrupt"]
+    print(f"{line}  baseline {baseline['wall']:.2f}s {change:+.1%}, {baseline['failures']:.0f} failed"
+          f"{'  REGRESSION' if regressed else ''}")
+    return not regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark download.py against a local shaped docs server.")
+    parser.add_argument("--pages", default=DEFAULT_PAGES_DIR, help="recorded pages written by download.py")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run, repeatable (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the median is reported")
+    parser.add_argument("--seed", type=int, default=1, help="seed for jitter and injected faults")
+    parser.add_argument("--delay", type=float, help="override the downloader's delay between requests")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="stored results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed wall time increase (default: 0.1)")
+    args = parser.parse_args()
+
+    pages = recorded_pages(Path(args.pages))
+    corpus = "recorded"
+    if pages is None:
+        pages = synthetic_pages()
+        corpus = "synthetic"
+    size = sum(map(len, pages.values()))
+    print(f"{len(pages)} {corpus} pages, {size / 1024:.0f} KB")
+
+    baseline_path = Path(args.baseline)
+    stored = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    recorded_with = (stored.get("corpus"), stored.get("bytes"), stored.get("delay"), stored.get("seed"))
+    if stored and recorded_with != (corpus, size, args.delay, args.seed):
+        print(f"baseline {baseline_path} was recorded with {stored.get('bytes')} bytes of {stored.get('corpus')} "
+              f"pages, delay {stored.get('delay')} and seed {stored.get('seed')}, not comparing")
+        stored = {}
+
+    ok = True
+    results = {}
+    for name in args.scenario or list(SCENARIOS):
+        scenario = SCENARIOS[name]
+        result = median([run_scenario(pages, scenario, args.seed, args.delay) for _ in range(args.repeat)])
+        results[name] = result._asdict()
+        ok &= compare(name, result, stored.get("scenarios", {}).get(name), args.tolerance)
+
+    if args.save_baseline:
+        scenarios = dict(stored.get("scenarios", {}), **results)
+        baseline = {"corpus": corpus, "bytes": size, "delay": args.delay, "seed": args.seed, "scenarios": scenarios}
+        baseline_path.write_text(json.dumps(baseline, indent=1) + "\n", encoding="utf-8")
+        print(f"saved baseline to {baseline_path}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API IR: memory use of the slotted records against the previous
+dict-backed classes, and dump/load cost of the JSON and binary encodings.
+
+The corpus is the parsed documentation (from the IR or `dreamtonics-api/`) replicated
+`--scale` times under distinct class names. Without either, a synthetic corpus of the
+same shape is generated.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+import api_ir
+from api_ir import ClassInfo, MethodInfo, ParamInfo
+
+
+class LegacyMethodInfo:
+    """The dict-backed method record used before the compact IR."""
+    def __init__(self):
+        self.name = ""
+        self.params = []  # (name, type, description)
+        self.return_type = "void"
+        self.return_desc = ""
+        self.description = ""
+        self.inherited_from = None
+        self.is_static = False
+        self.is_property = False
+
+
+class LegacyClassInfo:
+    """The dict-backed class record used before the compact IR."""
+    def __init__(self, name):
+        self.name = name
+        self.methods = {}
+        self.description = ""
+        self.extends = None
+
+
+def fresh(s):
+    """Return an equal string that is a separate object, as HTML parsing produces."""
+    if s is None or len(s) < 2:
+        return s
+    return (s + " ")[:-1]
+
+
+def synthetic_corpus(seed: int = 1) -> List[ClassInfo]:
+    """A corpus shaped like the real documentation: 23 classes, ~16 methods each."""
+    rng = random.Random(seed)
+    types = ["number", "string", "boolean", "object", "Note", "NoteGroup", "Track", "Array.<number>"]
+    words = "the note group track time position blick value returns index of in a to is".split()
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n)).capitalize() + "."
+
+    param_descs = [sentence(6) for _ in range(40)]
+    classes = []
+    for ci in range(23):
+        class_info = ClassInfo(f"Class{ci}")
+        class_info.description = sentence(12)
+        for mi in range(16):
+            method = MethodInfo()
+            method.name = f"method{mi}"
+            method.description = sentence(15)
+            method.return_type = rng.choice(types)
+            method.return_desc = sentence(5)
+            method.params = [
+                ParamInfo(f"arg{pi}", rng.choice(types), rng.choice(param_descs))
+                for pi in range(rng.randrange(3))
+            ]
+            class_info.methods[method.name] = method
+        classes.append(class_info)
+    return classes
+
+
+def replicate(classes, scale):
+    """Serialize-free copy of the corpus `scale` times as (legacy, compact) records."""
+    legacy, compact = [], []
+    for k in range(scale):
+        for c in classes:
+            name = f"{c.name}{k}"
+            lc, cc = LegacyClassInfo(fresh(name)), ClassInfo(name)
+            lc.description, cc.description = fresh(c.description), sys.intern(c.description)
+            lc.extends, cc.extends = fresh(c.extends), c.extends and sys.intern(c.extends)
+            for m in c.methods.values():
+                lm, cm = LegacyMethodInfo(), MethodInfo()
+                for attr in ("name", "return_type", "return_desc", "description", "inherited_from"):
+                    value = getattr(m, attr)
+                    setattr(lm, attr, fresh(value))
+                    setattr(cm, attr, value and sys.intern(value))
+                lm.is_static = cm.is_static = m.is_static
+                lm.is_property = cm.is_property = m.is_property
+                lm.params = [(fresh(n), fresh(t), fresh(d)) for n, t, d in m.params]
+                cm.params = [ParamInfo(*map(sys.intern, p)) for p in m.params]
+                lc.methods[lm.name] = lm
+                cc.methods[cm.name] = cm
+            legacy.append(lc)
+            compact.append(cc)
+    return legacy, compact
+
+
+def measure(build):
+    """Return (result, bytes allocated and still alive) for build()."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API IR.")
+    parser.add_argument("--scale", type=int, default=100, help="corpus replication factor")
+    parser.add_argument("--ir", default=api_ir.DEFAULT_IR_PATH, help="IR to use as the base corpus")
+    args = parser.parse_args()
+
+    try:
+        base = api_ir.load_classes(Path(args.ir))
+        source = "documentation"
+    except FileNotFoundError:
+        base = synthetic_corpus()
+        source = "synthetic"
+    total_methods = sum(len(c.methods) for c in base) * args.scale
+    print(f"Corpus: {source} x{args.scale} ({len(base) * args.scale} classes, {total_methods} methods)")
+
+    # Build the two variants separately so each measurement only sees its own objects.
+    legacy, legacy_bytes = measure(lambda: replicate(base, args.scale)[0])
+    del legacy
+    compact, compact_bytes = measure(lambda: replicate(base, args.scale)[1])
+    print(f"  dict-backed records: {legacy_bytes / 1e6:8.2f} MB")
+    print(f"  compact records:     {compact_bytes / 1e6:8.2f} MB ({compact_bytes / legacy_bytes:.0%})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in (".json", ".bin"):
+            path = Path(tmp) / f"ir{suffix}"
+            dump = timed(lambda: api_ir.dump_ir(compact, path))
+            load = timed(lambda: api_ir.load_ir(path))
+            size = path.stat().st_size
+            print(f"  {suffix[1:]:4}: {size / 1e6:6.2f} MB, dump {dump * 1e3:7.1f} ms, load {load * 1e3:7.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
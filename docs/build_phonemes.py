@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Compile docs/phonemes.json into per-language phoneme tables.
+
+phonemes.json is a JavaScript object literal (`var phonemes = {...}`) listing, for each
+synthesis language, its phonemes and their categories. This script reads it in a single
+streaming pass: the tokenizer consumes the file in chunks and emits `(path, value)` events
+for scalar values, which the model builder folds into
+
+- a phoneme -> (language bitset, category bitset) table for O(1) validity checks, and
+- a sorted phoneme list per language.
+
+The output directory gets one shard per language, so a consumer only loads the language it uses:
+
+    index.json          languages, categories and the phoneme bitsets
+    <Language>.json     {"language", "categories", "phonemes": [sorted], "category": [index per phoneme]}
+    <Language>.js       var PHONEMES_<Language> = {"phoneme": "category", ...};
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, TextIO, Tuple, Union
+
+SHARD_VERSION = 1
+OTHER_CATEGORY = "other"
+
+Scalar = Union[str, float, bool, None]
+Path_ = Tuple[Union[str, int], ...]
+
+_PUNCTUATION = set("{}[]:,=;")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+
+
+class LiteralSyntaxError(ValueError):
+    """Raised when the input is not a JavaScript object literal this parser understands."""
+
+
+def _chars(f: TextIO, chunk_size: int = 1 << 16) -> Iterator[str]:
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield from chunk
+
+
+def tokenize(f: TextIO) -> Iterator[Tuple[str, Scalar]]:
+    """Yield (kind, value) tokens: punct, string, number, ident."""
+    chars = _chars(f)
+    pending: Optional[str] = None
+
+    def take() -> Optional[str]:
+        nonlocal pending
+        if pending is not None:
+            ch, pending = pending, None
+            return ch
+        return next(chars, None)
+
+    while True:
+        ch = take()
+        if ch is None:
+            return
+        if ch.isspace():
+            continue
+        if ch == "/":
+            nxt = take()
+            if nxt == "/":
+                while ch not in ("\n", None):
+                    ch = take()
+                continue
+            if nxt == "*":
+                prev = ""
+                while True:
+                    ch = take()
+                    if ch is None or (prev == "*" and ch == "/"):
+                        break
+                    prev = ch
+                continue
+            raise LiteralSyntaxError("unexpected '/'")
+        if ch in _PUNCTUATION:
+            yield "punct", ch
+        elif ch in "\"'":
+            quote, text = ch, []
+            while True:
+                ch = take()
+                if ch is None:
+                    raise LiteralSyntaxError("unterminated string")
+                if ch == quote:
+                    break
+                if ch == "\\":
+                    ch = take()
+                    if ch is None:
+                        raise LiteralSyntaxError("unterminated string")
+                    if ch == "u":
+                        ch = chr(int("".join(take() for _ in range(4)), 16))
+                    else:
+                        ch = _ESCAPES.get(ch, ch)
+                text.append(ch)
+            yield "string", "".join(text)
+        elif ch.isalnum() or ch in "_$-+.":
+            text = [ch]
+            while True:
+                ch = take()
+                if ch is None or not (ch.isalnum() or ch in "_$.+-"):
+                    pending = ch
+                    break
+                text.append(ch)
+            word = "".join(text)
+            if re.fullmatch(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?", word):
+                yield "number", float(word)
+            else:
+                yield "ident", word
+        else:
+            raise LiteralSyntaxError(f"unexpected character {ch!r}")
+
+
+def events(f: TextIO) -> Iterator[Tuple[Path_, Scalar]]:
+    """Yield (path, value) for every scalar in the literal assigned by `var name = {...}`."""
+    tokens = tokenize(f)
+    lookahead: List[Tuple[str, Scalar]] = []
+
+    def peek():
+        if not lookahead:
+            lookahead.append(next(tokens, ("eof", None)))
+        return lookahead[0]
+
+    def take():
+        token = peek()
+        lookahead.clear()
+        return token
+
+    def expect(kind, value=None):
+        token = take()
+        if token[0] != kind or (value is not None and token[1] != value):
+            raise LiteralSyntaxError(f"expected {value or kind}, got {token[1]!r}")
+        return token
+
+    def value(path):
+        kind, tok = take()
+        if kind == "punct" and tok == "{":
+            while peek() != ("punct", "}"):
+                key_kind, key = take()
+                if key_kind not in ("ident", "string", "number"):
+                    raise LiteralSyntaxError(f"bad object key {key!r}")
+                expect("punct", ":")
+                yield from value(path + (key,))
+                if peek() == ("punct", ","):
+                    take()
+            take()
+        elif kind == "punct" and tok == "[":
+            index = 0
+            while peek() != ("punct", "]"):
+                yield from value(path + (index,))
+                index += 1
+                if peek() == ("punct", ","):
+                    take()
+            take()
+        elif kind in ("string", "number"):
+            yield path, tok
+        elif kind == "ident" and tok in ("true", "false", "null", "undefined"):
+            yield path, {"true": True, "false": False}.get(tok)
+        else:
+            raise LiteralSyntaxError(f"unexpected token {tok!r}")
+
+    # Optional `var name =` prefix
+    if peek()[0] == "ident" and peek()[1] in ("var", "let", "const"):
+        take()
+        expect("ident")
+        expect("punct", "=")
+    yield from value(())
+
+
+class PhonemeModel(NamedTuple):
+    """Indexed phoneme inventory."""
+    languages: List[str]
+    categories: List[str]
+    # phoneme -> (bit per language in `languages`, bit per category in `categories`)
+    phonemes: Dict[str, Tuple[int, int]]
+    # language -> sorted [(phoneme, category index)]
+    by_language: Dict[str, List[Tuple[str, int]]]
+    # language -> its bit in the language masks of `phonemes`
+    language_bits: Dict[str, int]
+
+    def is_valid(self, phoneme: str, language: str) -> bool:
+        """Whether the phoneme belongs to the language; False for unknown languages."""
+        bits = self.phonemes.get(phoneme)
+        return bool(bits and bits[0] & self.language_bits.get(language, 0))
+
+    def languages_of(self, phoneme: str) -> List[str]:
+        mask = self.phonemes.get(phoneme, (0, 0))[0]
+        return [lang for i, lang in enumerate(self.languages) if mask & (1 << i)]
+
+
+def _language_name(group: Dict[str, Scalar]) -> str:
+    if group.get("key"):
+        return str(group["key"])
+    # Groups without a key, like "STD-exclusive"
+    words = re.findall(r"[A-Za-z0-9]+", str(group.get("en", "")))
+    return "".join(w[:1].upper() + w[1:] for w in words) or "Unnamed"
+
+
+def build_model(source: TextIO) -> PhonemeModel:
+    """Fold the literal's events into a PhonemeModel in one pass over the input."""
+    categories: List[str] = []
+    group_names: Dict[int, Dict[str, Scalar]] = {}
+    items: Dict[Path_, Dict[str, Scalar]] = {}
+
+    for path, value in events(source):
+        if path[:2] != ("tones", "table"):
+            continue
+        rest = path[2:]
+        if rest[0] == "category_map" and len(rest) == 3 and rest[1] not in categories:
+            categories.append(rest[1])
+        elif rest[0] == "groups" and len(rest) == 4 and rest[2] == "group_name":
+            group_names.setdefault(rest[1], {})[rest[3]] = value
+        elif rest[0] == "groups" and rest[-1] in ("phoneme", "category") and "sections" in rest:
+            items.setdefault(rest[:-1], {})[rest[-1]] = value
+
+    categories.append(OTHER_CATEGORY)
+    languages = [_language_name(group_names.get(i, {})) for i in range(max(group_names, default=-1) + 1)]
+
+    phonemes: Dict[str, Tuple[int, int]] = {}
+    by_language: Dict[str, Dict[str, int]] = {lang: {} for lang in languages}
+    for item_path, item in items.items():
+        phoneme = item.get("phoneme")
+        if not isinstance(phoneme, str):
+            continue
+        language_index = item_path[1]
+        category = item.get("category") or OTHER_CATEGORY
+        if category not in categories:
+            categories.insert(len(categories) - 1, category)
+        category_index = categories.index(category)
+
+        lang_mask, cat_mask = phonemes.get(phoneme, (0, 0))
+        phonemes[phoneme] = (lang_mask | 1 << language_index, cat_mask | 1 << category_index)
+        by_language[languages[language_index]].setdefault(phoneme, category_index)
+
+    return PhonemeModel(
+        languages, categories, phonemes,
+        {lang: sorted(table.items()) for lang, table in by_language.items()},
+        {lang: 1 << i for i, lang in enumerate(languages)},
+    )
+
+
+def write_shards(model: PhonemeModel, output_dir: Path) -> List[Path]:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+
+    index = {
+        "version": SHARD_VERSION,
+        "languages": [
+            {"name": lang, "shard": f"{lang}.json", "script": f"{lang}.js", "count": len(model.by_language[lang])}
+            for lang in model.languages
+        ],
+        "categories": model.categories,
+        "phonemes": {p: list(bits) for p, bits in sorted(model.phonemes.items())},
+    }
+    path = output_dir / "index.json"
+    path.write_text(json.dumps(index, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+    written.append(path)
+
+    for lang in model.languages:
+        entries = model.by_language[lang]
+        shard = {
+            "version": SHARD_VERSION,
+            "language": lang,
+            "categories": model.categories,
+            "phonemes": [p for p, _ in entries],
+            "category": [c for _, c in entries],
+        }
+        path = output_dir / f"{lang}.json"
+        path.write_text(json.dumps(shard, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+        written.append(path)
+
+        lines = [
+            "// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.",
+            f"// {lang} phonemes and their categories; check with PHONEMES_{lang}.hasOwnProperty(p).",
+            f"var PHONEMES_{lang} = {{",
+        ]
+        lines += [f"\t{json.dumps(p, ensure_ascii=False)}: \"{model.categories[c]}\"," for p, c in entries]
+        lines.append("};")
+        path = output_dir / f"{lang}.js"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def load_language(shard_dir: Path, language: str) -> Dict[str, str]:
+    """Load one language shard as a phoneme -> category mapping."""
+    shard = json.loads((Path(shard_dir) / f"{language}.json").read_text(encoding="utf-8"))
+    if shard.get("version") != SHARD_VERSION:
+        raise ValueError(f"unsupported phoneme shard version {shard.get('version')}")
+    categories = shard["categories"]
+    return {p: categories[c] for p, c in zip(shard["phonemes"], shard["category"])}
+
+
+def main():
+    here = Path(__file__).resolve().parent
+
+    parser = argparse.ArgumentParser(description="Compile phonemes.json into per-language phoneme tables.")
+    parser.add_argument("--input", default=str(here / "phonemes.json"), help="phoneme literal to compile")
+    parser.add_argument("--output-dir", default=str(here / "phonemes"), help="where to write the shards")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        try:
+            model = build_model(f)
+        except LiteralSyntaxError as e:
+            print(f"Error: {args.input}: {e}")
+            return 1
+
+    written = write_shards(model, Path(args.output_dir))
+    print(f"Compiled {len(model.phonemes)} phonemes in {len(model.languages)} languages:")
+    for lang in model.languages:
+        print(f"  {lang}: {len(model.by_language[lang])}")
+    print(f"✓ Wrote {len(written)} files to: {Path(args.output_dir).absolute()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Check the repository's Synthesizer V scripts against the parsed Scripting API.
+
+Builds a symbol table from the API IR written by `generate_types.py`, then scans every
+script for `.member(` call sites and reports, as `file:line`, calls that don't resolve.
+Where the receiver's class can be inferred (`SV`, chains starting at `SV`, variables
+assigned from them) the member is looked up in that class and its bases. Other calls
+that only match some API member by name are reported as unchecked.
+
+Files are scanned in parallel and results are cached by file content hash, so repeated
+runs over an unchanged tree only hash the files.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+import api_ir
+from api_ir import ClassInfo
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_PATH = api_ir.DOCS_DIR / ".check-api-cache.json"
+
+# Members of JavaScript built-ins used by scripts (Array, String, Number, Math, JSON, Object, ...)
+JS_BUILTINS = frozenset("""
+    push pop shift unshift slice splice sort reverse concat join indexOf lastIndexOf includes
+    map filter forEach reduce reduceRight some every find findIndex fill flat flatMap keys values entries
+    split trim trimStart trimEnd toLowerCase toUpperCase replace replaceAll charAt charCodeAt
+    codePointAt substring substr startsWith endsWith match matchAll search padStart padEnd repeat
+    localeCompare normalize toString toFixed toPrecision valueOf hasOwnProperty isArray
+    round floor ceil abs min max pow sqrt log log2 log10 exp random sign trunc sin cos tan atan2 hypot
+    stringify parse assign create freeze defineProperty getOwnPropertyNames getPrototypeOf
+    call apply bind then catch finally test exec fromCharCode now getTime
+    parseInt parseFloat isNaN isFinite isInteger get set has delete add clear
+""".split())
+
+# `.name(` call sites; the optional group captures an identifier receiver right before the dot
+_CALL_RE = re.compile(r"(?:\b([A-Za-z_$][\w$]*)\s*)?\.\s*([A-Za-z_$][\w$]*)\s*\(")
+# Functions and methods the script defines for itself
+_DEFINED_RES = (
+    re.compile(r"\bfunction\s+([A-Za-z_$][\w$]*)"),
+    re.compile(r"([A-Za-z_$][\w$]*)\s*[:=]\s*function\b"),
+    re.compile(r"([A-Za-z_$][\w$]*)\s*[:=]\s*\([^()]*\)\s*=>"),
+)
+# Receiver type inference: assignments, chain roots, `.member(` links and the string argument of SV.create
+_ASSIGN_RE = re.compile(r"(?<![\w$.])([A-Za-z_$][\w$]*)\s*=(?![=>])\s*")
+_ROOT_RE = re.compile(r"(?<![\w$.])([A-Za-z_$][\w$]*)(?=\s*\.)")
+_MEMBER_CALL_RE = re.compile(r"\s*\.\s*([A-Za-z_$][\w$]*)\s*\(")
+_STRING_ARG_RE = re.compile(r"\s*[\"']([A-Za-z_$][\w$]*)[\"']\s*\)")
+_EXPRESSION_END_RE = re.compile(r"\s*(?:[;,)}\]]|$)")
+# Comments, string and template literals; replaced by blanks that keep line numbers
+_STRIP_RE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`",
+    re.DOTALL,
+)
+
+
+class SymbolTable(NamedTuple):
+    """API members by name, and the members visible on each class including inherited ones."""
+    members: FrozenSet[str]
+    classes: Dict[str, FrozenSet[str]]
+    returns: Dict[str, Dict[str, str]]  # Class -> member -> API class it returns, where it returns one
+
+
+class Finding(NamedTuple):
+    path: str
+    line: int
+    receiver: str
+    member: str
+    kind: str  # "unknown", "removed" (in the previous API, gone from the current one) or "unchecked"
+    receiver_class: str = ""  # The receiver's inferred class, if any
+
+    def __str__(self):
+        target = f"{self.receiver}.{self.member}" if self.receiver else self.member
+        on = f" on {self.receiver_class}" if self.receiver_class else ""
+        if self.kind == "unchecked":
+            return f"{self.path}:{self.line}: unchecked API member '{target}', the receiver's class is not known"
+        return f"{self.path}:{self.line}: {self.kind} API member '{target}'{on}"
+
+
+def _class_of(type_name: str, classes: Dict[str, FrozenSet[str]]) -> Optional[str]:
+    """The API class a return type names (`Note`, `NoteGroup | undefined`), or None."""
+    names = [t.strip() for t in type_name.split("|") if t.strip() not in ("undefined", "null", "")]
+    return names[0] if len(names) == 1 and names[0] in classes else None
+
+
+def build_symbol_table(classes: List[ClassInfo]) -> SymbolTable:
+    """Index the parsed classes for constant-time member lookups."""
+    own = {c.name: {m.name: m for m in c.methods.values()} for c in classes}
+    extends = {c.name: c.extends for c in classes}
+
+    resolved: Dict[str, Dict[str, object]] = {}
+    for name in own:
+        members: Dict[str, object] = {}
+        seen = set()
+        current: Optional[str] = name
+        while current and current not in seen:
+            seen.add(current)
+            for member, method in own.get(current, {}).items():
+                members.setdefault(member, method)  # Overrides shadow inherited members
+            current = extends.get(current)
+        resolved[name] = members
+
+    table = {name: frozenset(members) for name, members in resolved.items()}
+    returns: Dict[str, Dict[str, str]] = {}
+    for name, members in resolved.items():
+        classes_returned = {member: _class_of(method.return_type, table) for member, method in members.items()}
+        returns[name] = {member: cls for member, cls in classes_returned.items() if cls}
+    all_members = frozenset(m for names in own.values() for m in names)
+    return SymbolTable(all_members, table, returns)
+
+
+def strip_literals(source: str) -> str:
+    """Blank out comments and string literals, keeping newlines so line numbers stay valid."""
+    return _STRIP_RE.sub(lambda m: re.sub(r"[^\n]", " ", m.group(0)), source)
+
+
+def _closing_paren(code: str, i: int) -> int:
+    """Index past the parenthesis matching the one at `i`, or -1."""
+    depth = 0
+    for j in range(i, len(code)):
+        if code[j] == "(":
+            depth += 1
+        elif code[j] == ")":
+            depth -= 1
+            if depth == 0:
+                return j + 1
+    return -1
+
+
+def _chain(code: str, source: str, start: int, root_type: Optional[str], table: SymbolTable,
+           receivers: Dict[int, str]) -> Tuple[Optional[str], int]:
+    """
+    Follow a `root.a(...).b(...)` call chain from the end of its root identifier.
+
+    Records the receiver class of every member in the chain in `receivers` (keyed by the
+    member's offset) and returns (class of the whole chain or None, end offset).
+    """
+    current, i = root_type, start
+    while True:
+        match = _MEMBER_CALL_RE.match(code, i)
+        if not match:
+            return current, i
+        member = match.group(1)
+        if current:
+            receivers[match.start(1)] = current
+        end = _closing_paren(code, match.end() - 1)
+        if end < 0:
+            return None, len(code)
+        if current == "SV" and member == "create":
+            # SV.create("Note") makes an object of the named class
+            literal = _STRING_ARG_RE.match(source, match.end())
+            created = literal.group(1) if literal else None
+            current = created if created in table.classes else None
+        else:
+            current = table.returns.get(current, {}).get(member) if current else None
+        i = end
+
+
+def infer_receivers(code: str, source: str, table: SymbolTable) -> Dict[int, str]:
+    """
+    Class of the receiver of each `.member(` call whose receiver is typed: `SV`, a chain
+    starting at `SV`, or a variable only ever assigned such chains. Keyed by member offset.
+    """
+    variables: Dict[str, Optional[str]] = {}
+    assignments = [(m.group(1), m.end()) for m in _ASSIGN_RE.finditer(code)]
+    # Variables can be assigned from each other, so repeat until the types settle
+    for _ in range(4):
+        inferred: Dict[str, Set[Optional[str]]] = {}
+        for name, start in assignments:
+            root = _ROOT_RE.match(code, start)
+            value = None
+            if root:
+                root_type = "SV" if root.group(1) == "SV" else variables.get(root.group(1))
+                value, end = _chain(code, source, root.end(), root_type, table, {})
+                if not _EXPRESSION_END_RE.match(code, end):
+                    value = None  # Part of a larger expression
+            inferred.setdefault(name, set()).add(value)
+        settled = {name: next(iter(types)) if len(types) == 1 else None for name, types in inferred.items()}
+        if settled == variables:
+            break
+        variables = settled
+
+    receivers: Dict[int, str] = {}
+    for root in _ROOT_RE.finditer(code):
+        root_type = "SV" if root.group(1) == "SV" else variables.get(root.group(1))
+        if root_type:
+            _chain(code, source, root.end(), root_type, table, receivers)
+    return receivers
+
+
+def scan_source(source: str, path: str, table: SymbolTable,
+                previous: Optional[SymbolTable] = None) -> List[Finding]:
+    """
+    Find call sites in the script that do not resolve against the symbol table.
+
+    A call whose receiver class is inferred must be a member of that class, including
+    inherited ones. Other calls can only be matched by name against all API members;
+    the ones that match are reported as unchecked rather than passed.
+    """
+    code = strip_literals(source)
+    defined = {name for pattern in _DEFINED_RES for name in pattern.findall(code)}
+    receivers = infer_receivers(code, source, table)
+
+    findings = []
+    line_starts = [0] + [i + 1 for i, ch in enumerate(code) if ch == "\n"]
+    for match in _CALL_RE.finditer(code):
+        receiver, member = match.group(1) or "", match.group(2)
+        receiver_class = receivers.get(match.start(2), "")
+        if receiver_class:
+            if member in table.classes.get(receiver_class, ()):
+                continue
+            removed = previous is not None and member in previous.classes.get(receiver_class, ())
+        elif member in JS_BUILTINS or member in defined:
+            continue
+        elif member in table.members:
+            findings.append(Finding(path, _line_of(line_starts, match.start(2)), receiver, member, "unchecked"))
+            continue
+        else:
+            removed = previous is not None and member in previous.members
+
+        line = _line_of(line_starts, match.start(2))
+        findings.append(Finding(path, line, receiver, member, "removed" if removed else "unknown", receiver_class))
+    return findings
+
+
+def _line_of(line_starts: List[int], offset: int) -> int:
+    lo, hi = 0, len(line_starts)
+    while lo + 1 < hi:
+        mid = (lo + hi) // 2
+        if line_starts[mid] <= offset:
+            lo = mid
+        else:
+            hi = mid
+    return lo + 1
+
+
+# Worker process state, set once per process by _init_worker
+_worker_tables = None
+
+
+def _init_worker(table, previous):
+    global _worker_tables
+    _worker_tables = (table, previous)
+
+
+def _scan_file(path: str) -> List[Finding]:
+    table, previous = _worker_tables
+    source = Path(path).read_text(encoding="utf-8")
+    return scan_source(source, path, table, previous)
+
+
+def api_digest(ir_path: Path, docs_dir: Path, previous_ir: Optional[Path]) -> str:
+    """Hash of everything the symbol table is built from, used to invalidate the cache."""
+    h = hashlib.sha1()
+    if ir_path.exists():
+        sources = [ir_path]
+    else:
+        sources = sorted(docs_dir.glob("*.html")) or [api_ir.DEFAULT_DTS_PATH]
+    if previous_ir:
+        sources.append(previous_ir)
+    for source in sources:
+        h.update(source.name.encode())
+        h.update(source.read_bytes())
+    return h.hexdigest()
+
+
+def load_cache(path: Path, digest: str) -> Dict[str, list]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("api") != digest:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(path: Path, digest: str, files: Dict[str, list]) -> None:
+    cache = {"version": CACHE_VERSION, "api": digest, "files": files}
+    path.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+
+
+def collect_scripts(paths: List[str]) -> List[Path]:
+    scripts = []
+    for p in map(Path, paths):
+        scripts.extend(sorted(p.glob("*.js")) if p.is_dir() else [p])
+    return scripts
+
+
+def check(scripts: List[Path], ir_path: Path, docs_dir: Path, cache_path: Optional[Path],
+          previous_ir: Optional[Path] = None, jobs: Optional[int] = None) -> List[Finding]:
+    """Check the scripts, reusing cached results for files whose content is unchanged."""
+    digest = api_digest(ir_path, docs_dir, previous_ir)
+    cached = load_cache(cache_path, digest) if cache_path else {}
+
+    hashes = {str(p): hashlib.sha1(p.read_bytes()).hexdigest() for p in scripts}
+    results: Dict[str, list] = {}
+    pending = []
+    for path, file_hash in hashes.items():
+        entry = cached.get(path)
+        if entry and entry[0] == file_hash:
+            results[path] = entry
+        else:
+            pending.append(path)
+
+    if pending:
+        table = build_symbol_table(api_ir.load_classes(ir_path, docs_dir))
+        previous = build_symbol_table(api_ir.load_ir(previous_ir)) if previous_ir else None
+        if len(pending) > 1 and jobs != 1:
+            # Imported here so fully cached runs don't pay for multiprocessing startup
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                     initargs=(table, previous)) as pool:
+                scanned = list(pool.map(_scan_file, pending))
+        else:
+            _init_worker(table, previous)
+            scanned = [_scan_file(path) for path in pending]
+        for path, findings in zip(pending, scanned):
+            results[path] = [hashes[path], [list(f) for f in findings]]
+
+        if cache_path:
+            save_cache(cache_path, digest, results)
+
+    return [Finding(*f) for path in hashes for f in results[path][1]]
+
+
+def main():
+    repo_root = Path(__file__).resolve().parent.parent
+
+    parser = argparse.ArgumentParser(description="Check scripts against the Synthesizer V Scripting API.")
+    parser.add_argument("paths", nargs="*", default=[str(repo_root)],
+                        help="scripts or directories of scripts (default: repository root)")
+    parser.add_argument("--ir", default=api_ir.DEFAULT_IR_PATH, help="API IR written by generate_types.py")
+    parser.add_argument("--docs-dir", default=api_ir.DEFAULT_DOCS_DIR, help="HTML docs, used when the IR is missing; the .d.ts is used when both are")
+    parser.add_argument("--unchecked", action="store_true",
+                        help="also list calls whose receiver class could not be inferred")
+    parser.add_argument("--previous-ir", help="IR of the previous API version, to report removed members")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="result cache file, empty to disable")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    scripts = collect_scripts(args.paths)
+    try:
+        findings = check(
+            scripts, Path(args.ir), Path(args.docs_dir),
+            Path(args.cache) if args.cache else None,
+            Path(args.previous_ir) if args.previous_ir else None,
+            args.jobs,
+        )
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 2
+
+    problems = [f for f in findings if f.kind != "unchecked"]
+    unchecked = len(findings) - len(problems)
+    for finding in findings if args.unchecked else problems:
+        print(finding)
+    print(f"Checked {len(scripts)} scripts: {len(problems)} problem(s), "
+          f"{unchecked} call(s) only matched by name because the receiver's class is not known"
+          + ("" if args.unchecked or not unchecked else " (list them with --unchecked)"))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
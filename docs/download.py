@@ -93,37 +93,55 @@ def download_page(url, output_path, delay=0.5):
         return False
 
 
-def main():
-    """Main function to download all documentation."""
-    # Create output directory
-    output_dir = Path("dreamtonics-api")
-    output_dir.mkdir(parents=True, exist_ok=True)
+def download_all(base_url=BASE_URL, output_dir=Path("dreamtonics-api"), delay=0.5):
+    """
+    Download the additional pages and every class page.
 
-    print(f"Downloading Dreamtonics Scripting API documentation to: {output_dir}")
-    print(f"Base URL: {BASE_URL}")
-    print("-" * 60)
+    Args:
+        base_url: URL the page names are appended to
+        output_dir: Directory the pages are saved in
+        delay: Delay in seconds after each request, passed to download_page
+
+    Returns:
+        (success_count, fail_count)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     success_count = 0
     fail_count = 0
 
     # Download additional pages (like index.html)
     for page in ADDITIONAL_PAGES:
-        url = BASE_URL + page
+        url = base_url + page
         output_path = output_dir / page
-        if download_page(url, output_path):
+        if download_page(url, output_path, delay):
             success_count += 1
         else:
             fail_count += 1
 
     # Download each class documentation page
     for class_name in CLASSES:
-        url = BASE_URL + class_name + ".html"
+        url = base_url + class_name + ".html"
         output_path = output_dir / f"{class_name}.html"
-        if download_page(url, output_path):
+        if download_page(url, output_path, delay):
             success_count += 1
         else:
             fail_count += 1
 
+    return success_count, fail_count
+
+
+def main():
+    """Main function to download all documentation."""
+    output_dir = Path("dreamtonics-api")
+
+    print(f"Downloading Dreamtonics Scripting API documentation to: {output_dir}")
+    print(f"Base URL: {BASE_URL}")
+    print("-" * 60)
+
+    success_count, fail_count = download_all(BASE_URL, output_dir)
+
     # Summary
     print("-" * 60)
     print(f"Download complete!")
@@ -9,34 +9,20 @@ This script parses the HTML documentation files and extracts:
 - Inheritance relationships
 """
 
+import argparse
+import json
 import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from html.parser import HTMLParser
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional
 
+import api_ir
+from api_ir import ClassInfo, MethodInfo, ParamInfo
 
-class MethodInfo:
-    """Information about a method or property."""
-    def __init__(self):
-        self.name = ""
-        self.params: List[Tuple[str, str, str]] = []  # (name, type, description)
-        self.return_type = "void"
-        self.return_desc = ""  # Detailed return type description from HTML
-        self.description = ""
-        self.inherited_from: Optional[str] = None
-        self.is_static = False
-        self.is_property = False  # True for constants/properties, False for methods
-
-
-class ClassInfo:
-    """Information about a class."""
-    def __init__(self, name: str):
-        self.name = name
-        self.methods: Dict[str, MethodInfo] = {}  # Use dict to avoid duplicates
-        self.description = ""
-        self.extends: Optional[str] = None
+_intern = sys.intern
 
 
 class APIDocParser(HTMLParser):
@@ -149,7 +135,7 @@ class APIDocParser(HTMLParser):
             # Extract class name from href like "ClassName.html#methodName"
             match = re.match(r'([^.]+)\.html#', href)
             if match and self.current_method:
-                self.current_method.inherited_from = match.group(1)
+                self.current_method.inherited_from = _intern(match.group(1))
 
         # Detect Returns section: <h5>Returns:</h5>
         elif tag == "h5":
@@ -194,7 +180,7 @@ class APIDocParser(HTMLParser):
             self.in_returns_section = False
             # Save the return description to the current method
             if self.current_method and self.current_return_desc:
-                self.current_method.return_desc = self.current_return_desc
+                self.current_method.return_desc = _intern(self.current_return_desc)
 
         # End of return description paragraph - save description
         elif self.in_return_desc and tag == "p":
@@ -211,7 +197,7 @@ class APIDocParser(HTMLParser):
                 if not self.current_method.description:
                     desc = " ".join(self.text_buffer).strip()
                     desc = re.sub(r'\s+', ' ', desc)
-                    self.current_method.description = desc
+                    self.current_method.description = _intern(desc)
             self.text_buffer = []
 
         # End of code tag
@@ -226,10 +212,10 @@ class APIDocParser(HTMLParser):
         elif tag == "tr" and self.in_param_row:
             self.in_param_row = False
             if self.current_method and self.current_param_name:
-                self.current_method.params.append((
-                    self.current_param_name,
-                    self.current_param_type,
-                    self.current_param_desc
+                self.current_method.params.append(ParamInfo(
+                    _intern(self.current_param_name),
+                    _intern(self.current_param_type),
+                    _intern(self.current_param_desc),
                 ))
 
         # End of parameter cell
@@ -256,7 +242,7 @@ class APIDocParser(HTMLParser):
         # Capture method name
         if self.in_method_name and self.current_method:
             if not self.current_method.name:
-                self.current_method.name = data
+                self.current_method.name = _intern(data)
 
         # Capture return type from type signature
         elif self.in_type_signature and self.current_method:
@@ -268,12 +254,12 @@ class APIDocParser(HTMLParser):
             property_match = re.search(r':\s*(\w+)', full_text)
             if property_match:
                 self.current_method.is_property = True
-                self.current_method.return_type = property_match.group(1)
+                self.current_method.return_type = _intern(property_match.group(1))
             else:
                 # Method return type pattern: "→ {Type}"
                 method_match = re.search(r'→\s*\{([^}]+)\}', full_text)
                 if method_match:
-                    self.current_method.return_type = method_match.group(1)
+                    self.current_method.return_type = _intern(method_match.group(1))
 
         # Capture h5 text (to detect "Returns:")
         elif self.text_buffer is not None and not self.in_description and not self.in_return_desc and not self.in_param_cell:
@@ -540,6 +526,26 @@ def convert_type_to_typescript(doc_type: str, class_name: str = "", return_desc:
     return result
 
 
+class Emitter(NamedTuple):
+    """An output backend that renders the parsed classes into a single file."""
+    name: str
+    output: str  # Default output file name
+    render: Callable[[List[ClassInfo]], str]
+
+
+# Registered emitters by name, in registration order
+EMITTERS: Dict[str, Emitter] = {}
+
+
+def register_emitter(name: str, output: str):
+    """Decorator registering `render(classes) -> str` as an emitter."""
+    def decorator(render):
+        EMITTERS[name] = Emitter(name, output, render)
+        return render
+    return decorator
+
+
+@register_emitter("ts", "synthesizer-v-api.d.ts")
 def generate_typescript_definitions(classes: List[ClassInfo]) -> str:
     """Generate TypeScript definition file content."""
     lines = []
@@ -767,21 +773,401 @@ def generate_typescript_definitions(classes: List[ClassInfo]) -> str:
     return "\n".join(lines)
 
 
-def main():
-    """Main function to generate TypeScript definitions."""
-    # Input and output paths
-    docs_dir = Path("dreamtonics-api")
-    output_file = Path("synthesizer-v-api.d.ts")
+def own_methods(class_info: ClassInfo) -> List[MethodInfo]:
+    """Methods declared by the class itself, sorted by name."""
+    return sorted((m for m in class_info.methods.values() if not m.inherited_from), key=lambda m: m.name)
+
+
+@register_emitter("index", "synthesizer-v-api.index.json")
+def generate_symbol_index(classes: List[ClassInfo]) -> str:
+    """Generate a JSON symbol index of all classes and their own members, with TypeScript types."""
+    index = {}
+    for class_info in sorted(classes, key=lambda c: c.name):
+        members = {}
+        for method in own_methods(class_info):
+            returns = convert_type_to_typescript(method.return_type, class_info.name, method.return_desc, method.name)
+            entry = {
+                "kind": "property" if method.is_property else "method",
+                "static": method.is_static,
+                "returns": returns,
+            }
+            if not method.is_property:
+                entry["params"] = [
+                    {"name": name, "type": convert_type_to_typescript(ptype, class_info.name, "", method.name, name)}
+                    for name, ptype, _ in method.params
+                ]
+            members[method.name] = entry
+        index[class_info.name] = {"extends": class_info.extends, "members": members}
 
-    if not docs_dir.exists():
-        print(f"Error: Documentation directory not found: {docs_dir}")
-        print("Please run download_docs.py first.")
-        return 1
+    return json.dumps({"version": 1, "classes": index}, indent=1, sort_keys=True) + "\n"
 
-    print(f"Parsing documentation from: {docs_dir}")
-    print("-" * 60)
 
-    # Parse all HTML files
+# Interfaces declared in the .d.ts header, typed loosely in Python stubs
+_TS_INTERFACES = {
+    "VoiceParameters", "ComputedAttributes", "NoteAttributes", "HostInfo",
+    "TempoMark", "MeasureMark", "Form", "Widget",
+}
+
+
+def convert_typescript_to_python(ts_type: str) -> str:
+    """Convert a TypeScript type produced by `convert_type_to_typescript` to a Python annotation."""
+    ts_type = ts_type.strip()
+    if ts_type.startswith("(") and ts_type.endswith(")") and ts_type.count("(") == 1:
+        ts_type = ts_type[1:-1].strip()
+
+    if "|" in ts_type and not ts_type.endswith("[]"):
+        parts = [p.strip() for p in ts_type.split("|")]
+        optional = any(p in ("undefined", "null") for p in parts)
+        parts = [convert_typescript_to_python(p) for p in parts if p not in ("undefined", "null")]
+        inner = parts[0] if len(parts) == 1 else f"Union[{', '.join(parts)}]"
+        return f"Optional[{inner}]" if optional else inner
+
+    if ts_type.endswith("[]"):
+        return f"List[{convert_typescript_to_python(ts_type[:-2])}]"
+
+    type_map = {
+        "string": "str",
+        "number": "float",
+        "boolean": "bool",
+        "any": "Any",
+        "object": "Any",
+        "void": "None",
+        "undefined": "None",
+        "null": "None",
+        "Function": "Callable[..., Any]",
+    }
+    if ts_type in type_map:
+        return type_map[ts_type]
+    if ts_type in _TS_INTERFACES:
+        return "Dict[str, Any]"
+    return ts_type
+
+
+@register_emitter("pyi", "synthesizer_v_api.pyi")
+def generate_python_stubs(classes: List[ClassInfo]) -> str:
+    """Generate Python type stubs (.pyi) mirroring the TypeScript definitions."""
+    lines = [
+        '"""',
+        "Type stubs for Dreamtonics Synthesizer V Studio Scripting API",
+        "Generated from official documentation",
+        "https://resource.dreamtonics.com/scripting/index.html",
+        '"""',
+        "",
+        "from typing import Any, Callable, ClassVar, Dict, List, Optional, Union",
+        "",
+    ]
+
+    for class_info in sorted(classes, key=lambda c: c.name):
+        base = f"({class_info.extends})" if class_info.extends else ""
+        lines.append("")
+        lines.append(f"class {class_info.name}{base}:")
+        if class_info.description:
+            lines.append(f'    """{class_info.description}"""')
+
+        methods = own_methods(class_info)
+        for method in methods:
+            returns = convert_typescript_to_python(convert_type_to_typescript(
+                method.return_type, class_info.name, method.return_desc, method.name))
+            if method.is_property:
+                lines.append(f"    {method.name}: ClassVar[{returns}]")
+                continue
+
+            params = ["self"] if not method.is_static else []
+            params += [
+                f"{name}: {convert_typescript_to_python(convert_type_to_typescript(ptype, class_info.name, '', method.name, name))}"
+                for name, ptype, _ in method.params
+            ]
+            if method.is_static:
+                lines.append("    @staticmethod")
+            lines.append(f"    def {method.name}({', '.join(params)}) -> {returns}: ...")
+
+        if not methods and not class_info.description:
+            lines.append("    ...")
+
+    return "\n".join(lines) + "\n"
+
+
+class SnapshotField(NamedTuple):
+    """A primitive Note property that the prelude can cache."""
+    name: str        # Field name in the snapshot, e.g. "onset"
+    getter: str
+    setter: Optional[str]
+    ts_type: str
+
+
+def note_snapshot_fields(classes: List[ClassInfo]) -> List[SnapshotField]:
+    """Primitive getters of `Note`, paired with their setters when one exists."""
+    note = next((c for c in classes if c.name == "Note"), None)
+    if note is None:
+        raise ValueError("The parsed API has no Note class, cannot generate the prelude")
+
+    fields = []
+    for method in own_methods(note):
+        match = re.match(r"get([A-Z]\w*)$", method.name)
+        if not match or method.params or method.is_property:
+            continue
+        ts_type = convert_type_to_typescript(method.return_type, note.name, method.return_desc, method.name)
+        if ts_type not in ("number", "string", "boolean"):
+            continue
+        setter = note.methods.get("set" + match.group(1))
+        setter_name = setter.name if setter and len(setter.params) == 1 else None
+        fields.append(SnapshotField(match.group(1)[0].lower() + match.group(1)[1:], method.name, setter_name, ts_type))
+    return fields
+
+
+def _has_time_range(classes: List[ClassInfo]) -> bool:
+    note = next((c for c in classes if c.name == "Note"), None)
+    method = note.methods.get("setTimeRange") if note else None
+    return bool(method and len(method.params) == 2)
+
+
+@register_emitter("prelude", "sv-prelude.js")
+def generate_prelude(classes: List[ClassInfo]) -> str:
+    """Generate a JavaScript prelude that batches Note reads and writes through snapshots."""
+    fields = note_snapshot_fields(classes)
+    writable = [f for f in fields if f.setter]
+    time_range = _has_time_range(classes) and {"onset", "duration"} <= {f.name for f in writable}
+    follows_time_range = "end" in {f.name for f in fields} and {"onset", "duration"} & {f.name for f in writable}
+
+    table = ",\n".join(
+        f'\t{f.name}: {{ get: "{f.getter}", set: {json.dumps(f.setter)} }}' for f in fields)
+    defaults = ", ".join(f'"{f.name}"' for f in writable)
+
+    lines = [
+        '/// <reference path="./synthesizer-v-api.d.ts" />',
+        '/// <reference path="./sv-prelude.d.ts" />',
+        "",
+        "/*",
+        "",
+        "Generated by docs/generate_types.py, do not edit; regenerate with",
+        "`python3 generate_types.py --from-dts` when only the definitions are at hand.",
+        "",
+        "Each Note getter and setter is a call into the host. These helpers read the notes of a",
+        "group once into plain arrays, serve reads from those arrays and write back only the",
+        "fields that were changed. Copy this file into a script's \"Common\" section.",
+        "",
+        "*/",
+        "",
+        "// Note fields with their host getter and setter (null when read-only).",
+        "var NOTE_SNAPSHOT_FIELDS = {",
+        table,
+        "};",
+        "",
+        "// Fields read when snapshotNotes / snapshotNoteGroup is called without a field list.",
+        f"var NOTE_SNAPSHOT_DEFAULT_FIELDS = [{defaults}];",
+        "",
+        "// Reads the given fields of every note; pass only the fields the script needs.",
+        "function snapshotNotes(notes, fields) {",
+        "\tfields = fields || NOTE_SNAPSHOT_DEFAULT_FIELDS;",
+        "\tvar snapshot = {",
+        "\t\tgroup: null,",
+        "\t\tlength: notes.length,",
+        "\t\tnotes: notes,",
+        "\t\tfields: fields,",
+        "\t\tdirty: {},",
+        "\t\thostCalls: 0",
+        "\t};",
+        "\tfor(var f = 0; f < fields.length; f ++) {",
+        "\t\tvar field = NOTE_SNAPSHOT_FIELDS[fields[f]];",
+        "\t\tif(!field) throw new Error(\"unknown note field: \" + fields[f]);",
+        "\t\tvar values = new Array(notes.length);",
+        "\t\tfor(var i = 0; i < notes.length; i ++) {",
+        "\t\t\tvalues[i] = notes[i][field.get]();",
+        "\t\t}",
+        "\t\tsnapshot[fields[f]] = values;",
+        "\t\tsnapshot.dirty[fields[f]] = [];",
+        "\t\tsnapshot.hostCalls += notes.length;",
+        "\t}",
+        "\treturn snapshot;",
+        "}",
+        "",
+        "// Reads every note of the group, with one getNote call per note.",
+        "function snapshotNoteGroup(group, fields) {",
+        "\tvar count = group.getNumNotes();",
+        "\tvar notes = new Array(count);",
+        "\tfor(var i = 0; i < count; i ++) {",
+        "\t\tnotes[i] = group.getNote(i);",
+        "\t}",
+        "\tvar snapshot = snapshotNotes(notes, fields);",
+        "\tsnapshot.group = group;",
+        "\tsnapshot.hostCalls += count + 1;",
+        "\treturn snapshot;",
+        "}",
+        "",
+        "// Sorts the snapshot by onset using the cached values instead of calling getOnset.",
+        "function sortSnapshotByOnset(snapshot) {",
+        "\tif(!snapshot.onset) throw new Error(\"note field was not read: onset\");",
+        "\tvar order = [];",
+        "\tfor(var i = 0; i < snapshot.length; i ++) order.push(i);",
+        "\tvar onset = snapshot.onset;",
+        "\torder.sort(function(a, b) { return onset[a] - onset[b]; });",
+        "",
+        "\tvar columns = snapshot.fields.concat([\"notes\"]);",
+        "\tfor(var c = 0; c < columns.length; c ++) {",
+        "\t\tvar values = snapshot[columns[c]];",
+        "\t\tvar sorted = new Array(values.length);",
+        "\t\tfor(var i = 0; i < order.length; i ++) sorted[i] = values[order[i]];",
+        "\t\tsnapshot[columns[c]] = sorted;",
+        "\t}",
+        "\tfor(var f = 0; f < snapshot.fields.length; f ++) {",
+        "\t\tvar dirty = snapshot.dirty[snapshot.fields[f]];",
+        "\t\tvar sortedDirty = [];",
+        "\t\tfor(var i = 0; i < order.length; i ++) sortedDirty[i] = dirty[order[i]];",
+        "\t\tsnapshot.dirty[snapshot.fields[f]] = sortedDirty;",
+        "\t}",
+        "}",
+        "",
+        "// Updates a cached field; the host is only updated by commitSnapshot.",
+        "function setSnapshotField(snapshot, field, index, value) {",
+        "\tif(!NOTE_SNAPSHOT_FIELDS[field] || !NOTE_SNAPSHOT_FIELDS[field].set) {",
+        "\t\tthrow new Error(\"note field is not writable: \" + field);",
+        "\t}",
+        "\tif(!snapshot[field]) throw new Error(\"note field was not read: \" + field);",
+        "\tif(snapshot[field][index] === value) return;",
+        "\tvar previous = snapshot[field][index];",
+        "\tsnapshot[field][index] = value;",
+        "\tsnapshot.dirty[field][index] = true;",
+    ]
+    if follows_time_range:
+        lines += [
+            "\t// The end is onset + duration, keep the cached one in step",
+            "\tif(snapshot.end && (field === \"onset\" || field === \"duration\")) {",
+            "\t\tsnapshot.end[index] += value - previous;",
+            "\t}",
+        ]
+    lines += [
+        "}",
+        "",
+        "// Writes changed fields back to the notes and returns the number of host calls made.",
+        "function commitSnapshot(snapshot) {",
+        "\tvar calls = 0;",
+    ]
+    if time_range:
+        lines += [
+            "\tvar onsetDirty = snapshot.dirty.onset || [];",
+            "\tvar durationDirty = snapshot.dirty.duration || [];",
+        ]
+    lines += [
+        "\tfor(var f = 0; f < snapshot.fields.length; f ++) {",
+        "\t\tvar name = snapshot.fields[f];",
+        "\t\tvar dirty = snapshot.dirty[name];",
+        "\t\tvar setter = NOTE_SNAPSHOT_FIELDS[name].set;",
+        "\t\tfor(var i = 0; i < snapshot.length; i ++) {",
+        "\t\t\tif(!dirty[i]) continue;",
+    ]
+    if time_range:
+        lines += [
+            "\t\t\t// Onset and duration changed together: one setTimeRange instead of two calls.",
+            "\t\t\tif(onsetDirty[i] && durationDirty[i]) {",
+            "\t\t\t\tif(name == \"onset\") {",
+            "\t\t\t\t\tsnapshot.notes[i].setTimeRange(snapshot.onset[i], snapshot.duration[i]);",
+            "\t\t\t\t\tcalls ++;",
+            "\t\t\t\t}",
+            "\t\t\t\tcontinue;",
+            "\t\t\t}",
+        ]
+    lines += [
+        "\t\t\tsnapshot.notes[i][setter](snapshot[name][i]);",
+        "\t\t\tcalls ++;",
+        "\t\t}",
+        "\t}",
+        "\tfor(var f = 0; f < snapshot.fields.length; f ++) {",
+        "\t\tsnapshot.dirty[snapshot.fields[f]] = [];",
+        "\t}",
+        "\tsnapshot.hostCalls += calls;",
+        "\treturn calls;",
+        "}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@register_emitter("prelude-dts", "sv-prelude.d.ts")
+def generate_prelude_definitions(classes: List[ClassInfo]) -> str:
+    """Generate TypeScript declarations for the prelude emitted by `generate_prelude`."""
+    fields = note_snapshot_fields(classes)
+    writable = [f for f in fields if f.setter]
+
+    lines = [
+        "/**",
+        " * Type definitions for sv-prelude.js",
+        " * Generated from official documentation",
+        " */",
+        "",
+        f"type NoteSnapshotField = {' | '.join(json.dumps(f.name) for f in fields)};",
+        f"type WritableNoteSnapshotField = {' | '.join(json.dumps(f.name) for f in writable)};",
+        "",
+        "/**",
+        " * Notes and their cached fields, one array entry per note.",
+        " * Only the fields passed to the snapshot function are filled in.",
+        " */",
+        "interface NoteSnapshot {",
+        "  group: NoteGroup | null;",
+        "  length: number;",
+        "  notes: Note[];",
+        "  fields: NoteSnapshotField[];",
+        "  dirty: { [field: string]: boolean[] };",
+        "  /** Number of host calls made through this snapshot */",
+        "  hostCalls: number;",
+    ]
+    for f in fields:
+        note = "" if f.setter else ", read-only"
+        if f.name == "end" and {"onset", "duration"} & {w.name for w in writable}:
+            note += ", follows onset and duration edits"
+        lines.append(f"  /** Cached {f.getter}(){note} */")
+        lines.append(f"  {f.name}: {f.ts_type}[];")
+    lines += [
+        "}",
+        "",
+        "declare const NOTE_SNAPSHOT_FIELDS: { [field in NoteSnapshotField]: { get: string; set: string | null } };",
+        "declare const NOTE_SNAPSHOT_DEFAULT_FIELDS: WritableNoteSnapshotField[];",
+        "",
+        "/** Read the given fields (default: all writable fields) of every note. */",
+        "declare function snapshotNotes(notes: Note[], fields?: NoteSnapshotField[]): NoteSnapshot;",
+        "/** Read every note of the group. */",
+        "declare function snapshotNoteGroup(group: NoteGroup, fields?: NoteSnapshotField[]): NoteSnapshot;",
+        "/** Sort the snapshot by the cached onsets; requires the onset field. */",
+        "declare function sortSnapshotByOnset(snapshot: NoteSnapshot): void;",
+        "/** Update a cached field without calling the host. */",
+        "declare function setSnapshotField<K extends WritableNoteSnapshotField>(",
+        "  snapshot: NoteSnapshot, field: K, index: number, value: NoteSnapshot[K][number]): void;",
+        "/** Write changed fields back to the notes, returning the number of host calls. */",
+        "declare function commitSnapshot(snapshot: NoteSnapshot): number;",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _render(name: str, classes: List[ClassInfo]) -> str:
+    return EMITTERS[name].render(classes)
+
+
+def emit_all(classes: List[ClassInfo], names: List[str], output_dir: Path = Path("."), jobs: int = 1) -> Dict[str, Path]:
+    """
+    Render the parsed classes with each named emitter and write the results.
+
+    With `jobs > 1` the emitters run in parallel worker processes; the classes are
+    parsed once and shared by all of them.
+    """
+    unknown = [name for name in names if name not in EMITTERS]
+    if unknown:
+        raise ValueError(f"Unknown emitter(s): {', '.join(unknown)}; available: {', '.join(EMITTERS)}")
+
+    if jobs > 1 and len(names) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(names))) as pool:
+            contents = list(pool.map(_render, names, [classes] * len(names)))
+    else:
+        contents = [_render(name, classes) for name in names]
+
+    written = {}
+    for name, content in zip(names, contents):
+        path = output_dir / EMITTERS[name].output
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        written[name] = path
+    return written
+
+
+def parse_docs_dir(docs_dir: Path, verbose: bool = True) -> List[ClassInfo]:
+    """Parse every class page in the documentation directory."""
     classes: List[ClassInfo] = []
     html_files = sorted(docs_dir.glob("*.html"))
 
@@ -790,26 +1176,77 @@ def main():
         if html_file.name == "index.html":
             continue
 
-        print(f"Parsing: {html_file.name}")
+        if verbose:
+            print(f"Parsing: {html_file.name}")
         class_info = parse_html_file(html_file)
         if class_info and class_info.methods:
             classes.append(class_info)
-            print(f"  Found {len(class_info.methods)} methods")
-        else:
+            if verbose:
+                print(f"  Found {len(class_info.methods)} methods")
+        elif verbose:
             print(f"  No methods found")
 
+    return classes
+
+
+def main():
+    """Main function to generate TypeScript definitions and other registered outputs."""
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--ir", default=api_ir.DEFAULT_IR_PATH,
+                            help="write the parsed IR here (.json or .bin), empty to skip")
+    arg_parser.add_argument("--from-ir", metavar="PATH",
+                            help="load a previously written IR instead of parsing HTML")
+    arg_parser.add_argument("--from-dts", metavar="PATH", nargs="?", const=str(api_ir.DEFAULT_DTS_PATH),
+                            help="read the classes back from TypeScript definitions written by this tool "
+                                 "(default: the committed synthesizer-v-api.d.ts), for outputs other than ts")
+    arg_parser.add_argument("--emit",
+                            help=f"comma-separated emitters to run ({', '.join(EMITTERS)}), "
+                                 f"default: ts,prelude,prelude-dts, or prelude,prelude-dts with --from-dts")
+    arg_parser.add_argument("--output-dir", default=".", help="directory for emitted files")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=1, help="render emitters in parallel processes")
+    args = arg_parser.parse_args()
+
+    emit = args.emit or ("prelude,prelude-dts" if args.from_dts else "ts,prelude,prelude-dts")
+    names = [name.strip() for name in emit.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EMITTERS]
+    if unknown:
+        arg_parser.error(f"unknown emitter(s) {', '.join(unknown)}; available: {', '.join(EMITTERS)}")
+    if args.from_dts and "ts" in names:
+        # The definitions don't carry the documentation's own types, so ts would not round-trip
+        arg_parser.error("--from-dts can't regenerate the ts output it reads from")
+
+    # Input and output paths
+    docs_dir = api_ir.DEFAULT_DOCS_DIR
+
+    if args.from_ir:
+        print(f"Loading IR from: {args.from_ir}")
+        classes = api_ir.load_ir(Path(args.from_ir))
+    elif args.from_dts:
+        print(f"Reading definitions from: {args.from_dts}")
+        classes = api_ir.parse_dts(Path(args.from_dts).read_text(encoding="utf-8"))
+    else:
+        if not docs_dir.exists():
+            print(f"Error: Documentation directory not found: {docs_dir}")
+            print("Please run download_docs.py first, or use --from-dts to regenerate from synthesizer-v-api.d.ts.")
+            return 1
+
+        print(f"Parsing documentation from: {docs_dir}")
+        print("-" * 60)
+
+        # Parse all HTML files
+        classes = parse_docs_dir(docs_dir)
+
     print("-" * 60)
     print(f"Parsed {len(classes)} classes")
 
-    # Generate TypeScript definitions
-    print(f"\nGenerating TypeScript definitions...")
-    ts_content = generate_typescript_definitions(classes)
-
-    # Write to file
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(ts_content)
+    if args.ir and not (args.from_ir or args.from_dts):
+        api_ir.dump_ir(classes, Path(args.ir))
+        print(f"✓ IR written to: {Path(args.ir).absolute()}")
 
-    print(f"✓ TypeScript definitions written to: {output_file.absolute()}")
+    # Render every requested output from the single parse
+    print(f"\nGenerating: {', '.join(names)}")
+    for name, path in emit_all(classes, names, Path(args.output_dir), args.jobs).items():
+        print(f"✓ {name} written to: {path.absolute()}")
 
     # Statistics
     total_methods = sum(len(c.methods) for c in classes)
@@ -0,0 +1,45 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// CantoneseChineseXSAMPA phonemes and their categories; check with PHONEMES_CantoneseChineseXSAMPA.hasOwnProperty(p).
+var PHONEMES_CantoneseChineseXSAMPA = {
+	"6": "vowel",
+	"8": "vowel",
+	"9": "vowel",
+	":N": "coda",
+	":i": "coda",
+	":k_}": "coda",
+	":m": "coda",
+	":n": "coda",
+	":p_}": "coda",
+	":t_}": "coda",
+	":u": "coda",
+	"E": "vowel",
+	"N": "nasal",
+	"N=": "vowel",
+	"O": "vowel",
+	"U": "vowel",
+	"a": "vowel",
+	"e": "vowel",
+	"f": "fricative",
+	"h": "fricative",
+	"i": "vowel",
+	"j": "semivowel",
+	"k": "stop",
+	"kh": "stop",
+	"kw": "stop",
+	"kwh": "stop",
+	"l": "vowel",
+	"m": "nasal",
+	"m=": "vowel",
+	"n": "nasal",
+	"o": "vowel",
+	"p": "stop",
+	"ph": "stop",
+	"s": "fricative",
+	"t": "stop",
+	"th": "stop",
+	"ts": "affricate",
+	"tsh": "affricate",
+	"u": "vowel",
+	"w": "semivowel",
+	"y": "vowel",
+};
@@ -0,0 +1,7 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// CommonPhonemes phonemes and their categories; check with PHONEMES_CommonPhonemes.hasOwnProperty(p).
+var PHONEMES_CommonPhonemes = {
+	"br": "other",
+	"cl": "other",
+	"sil": "other",
+};
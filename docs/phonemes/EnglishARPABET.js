@@ -0,0 +1,47 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// EnglishARPABET phonemes and their categories; check with PHONEMES_EnglishARPABET.hasOwnProperty(p).
+var PHONEMES_EnglishARPABET = {
+	"aa": "vowel",
+	"ae": "vowel",
+	"ah": "vowel",
+	"ao": "vowel",
+	"aw": "diphthong",
+	"ax": "vowel",
+	"ay": "diphthong",
+	"b": "stop",
+	"ch": "affricate",
+	"d": "stop",
+	"dh": "fricative",
+	"dr": "affricate",
+	"dx": "stop",
+	"eh": "vowel",
+	"er": "vowel",
+	"ey": "diphthong",
+	"f": "fricative",
+	"g": "stop",
+	"hh": "aspirate",
+	"ih": "vowel",
+	"iy": "vowel",
+	"jh": "affricate",
+	"k": "stop",
+	"l": "liquid",
+	"m": "nasal",
+	"n": "nasal",
+	"ng": "nasal",
+	"ow": "diphthong",
+	"oy": "diphthong",
+	"p": "stop",
+	"r": "semivowel",
+	"s": "fricative",
+	"sh": "fricative",
+	"t": "stop",
+	"th": "fricative",
+	"tr": "affricate",
+	"uh": "vowel",
+	"uw": "vowel",
+	"v": "fricative",
+	"w": "semivowel",
+	"y": "semivowel",
+	"z": "fricative",
+	"zh": "fricative",
+};
@@ -0,0 +1,40 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// JapaneseROMAJI phonemes and their categories; check with PHONEMES_JapaneseROMAJI.hasOwnProperty(p).
+var PHONEMES_JapaneseROMAJI = {
+	"N": "vowel",
+	"a": "vowel",
+	"b": "stop",
+	"by": "stop",
+	"ch": "affricate",
+	"d": "stop",
+	"dy": "stop",
+	"e": "vowel",
+	"f": "fricative",
+	"g": "stop",
+	"gy": "stop",
+	"h": "aspirate",
+	"hy": "aspirate",
+	"i": "vowel",
+	"j": "affricate",
+	"k": "stop",
+	"ky": "stop",
+	"m": "nasal",
+	"my": "nasal",
+	"n": "nasal",
+	"ny": "nasal",
+	"o": "vowel",
+	"p": "stop",
+	"py": "stop",
+	"r": "liquid",
+	"ry": "liquid",
+	"s": "fricative",
+	"sh": "fricative",
+	"t": "stop",
+	"ts": "affricate",
+	"ty": "stop",
+	"u": "vowel",
+	"v": "semivowel",
+	"w": "semivowel",
+	"y": "semivowel",
+	"z": "affricate",
+};
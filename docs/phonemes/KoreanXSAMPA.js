@@ -0,0 +1,32 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// KoreanXSAMPA phonemes and their categories; check with PHONEMES_KoreanXSAMPA.hasOwnProperty(p).
+var PHONEMES_KoreanXSAMPA = {
+	"4": "liquid",
+	"6": "vowel",
+	"M": "vowel",
+	"M_": "semivowel",
+	"N": "coda",
+	"V": "vowel",
+	"b": "stop",
+	"d": "stop",
+	"e_o": "vowel",
+	"g": "stop",
+	"h": "fricative",
+	"i": "vowel",
+	"j": "semivowel",
+	"k": "stop",
+	"k_t": "stop",
+	"l": "liquid",
+	"m": "nasal",
+	"n": "nasal",
+	"o": "vowel",
+	"p": "stop",
+	"pp": "stop",
+	"s": "fricative",
+	"s_t": "fricative",
+	"t": "stop",
+	"ts\\_h": "affricate",
+	"ts\\h ": "affricate",
+	"tt": "stop",
+	"w": "semivowel",
+};
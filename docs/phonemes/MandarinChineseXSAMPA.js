@@ -0,0 +1,59 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// MandarinChineseXSAMPA phonemes and their categories; check with PHONEMES_MandarinChineseXSAMPA.hasOwnProperty(p).
+var PHONEMES_MandarinChineseXSAMPA = {
+	"7": "vowel",
+	":\\i": "coda",
+	":n": "coda",
+	"@": "vowel",
+	"@U": "diphthong",
+	"A": "vowel",
+	"AU": "diphthong",
+	"N": "coda",
+	"U": "vowel",
+	"a": "vowel",
+	"e": "vowel",
+	"f": "fricative",
+	"i": "vowel",
+	"i@U": "diphthong",
+	"iA": "diphthong",
+	"iAU": "diphthong",
+	"iE": "diphthong",
+	"iU": "diphthong",
+	"i\\": "vowel",
+	"i`": "vowel",
+	"ia": "diphthong",
+	"ie": "diphthong",
+	"j": "semivowel",
+	"k": "stop",
+	"kh": "stop",
+	"l": "liquid",
+	"m": "nasal",
+	"n": "nasal",
+	"o": "vowel",
+	"p": "stop",
+	"ph": "stop",
+	"r\\`": "coda",
+	"s": "fricative",
+	"s\\": "fricative",
+	"s`": "fricative",
+	"t": "stop",
+	"th": "stop",
+	"ts": "affricate",
+	"ts\\": "affricate",
+	"ts\\h": "fricative",
+	"ts`": "affricate",
+	"ts`h": "affricate",
+	"tsh": "affricate",
+	"u": "vowel",
+	"u@": "diphthong",
+	"uA": "diphthong",
+	"ua": "diphthong",
+	"ue": "diphthong",
+	"uo": "diphthong",
+	"w": "semivowel",
+	"x": "aspirate",
+	"y": "vowel",
+	"yE": "diphthong",
+	"y{": "diphthong",
+	"z`": "semivowel",
+};
@@ -0,0 +1,8 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// STDExclusive phonemes and their categories; check with PHONEMES_STDExclusive.hasOwnProperty(p).
+var PHONEMES_STDExclusive = {
+	"br1": "other",
+	"br2": "other",
+	"brl1": "other",
+	"brl2": "other",
+};
@@ -0,0 +1,34 @@
+// Generated by docs/build_phonemes.py from docs/phonemes.json, do not edit.
+// SpanishXSAMPA phonemes and their categories; check with PHONEMES_SpanishXSAMPA.hasOwnProperty(p).
+var PHONEMES_SpanishXSAMPA = {
+	"B": "stop",
+	"C": "fricative",
+	"D": "stop",
+	"I": "semivowel",
+	"J": "nasal",
+	"N": "nasal",
+	"U": "semivowel",
+	"a": "vowel",
+	"b": "stop",
+	"ch": "affricate",
+	"d": "stop",
+	"e": "vowel",
+	"f": "fricative",
+	"g": "stop",
+	"i": "vowel",
+	"k": "stop",
+	"l": "liquid",
+	"ll": "semivowel",
+	"m": "nasal",
+	"n": "nasal",
+	"o": "vowel",
+	"p": "stop",
+	"r": "liquid",
+	"rr": "liquid",
+	"s": "fricative",
+	"sh": "fricative",
+	"t": "stop",
+	"u": "vowel",
+	"x": "fricative",
+	"y": "semivowel",
+};
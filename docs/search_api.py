@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Offline full-text search over the Synthesizer V Studio Scripting API documentation.
+
+`--build` creates an inverted index from the parsed `MethodInfo` records: method and class
+names (including their camelCase parts), descriptions, and parameter and return docs.
+Queries read the index through `mmap` and binary-search its sorted term table, so a
+query only touches the pages it needs.
+
+Index file layout (`synthesizer-v-api.search.idx`), all integers little-endian:
+
+    header   "SVSX" | u16 version | u16 0 | u32 doc count | u32 term count
+             | u32 docs offset | u32 terms offset | u32 postings offset | u32 strings offset
+    docs     per document:  u32 label offset | u32 label length | u32 signature offset | u32 signature length
+    terms    per term, sorted by UTF-8 bytes:
+             u32 term offset | u32 term length | u32 postings index | u32 postings count | f32 idf
+    postings per posting:   u32 doc id | f32 weight
+    strings  UTF-8 text referenced by the offsets above (relative to the strings offset)
+
+Rebuilding is incremental: a manifest next to the index keeps the hash and extracted
+terms of every page, and only pages whose content changed are parsed again.
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import re
+import struct
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+import api_ir
+from api_ir import ClassInfo, MethodInfo
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = api_ir.DOCS_DIR / "synthesizer-v-api.search.idx"
+
+_MAGIC = b"SVSX"
+_HEADER = struct.Struct("<4sHHIIIIII")
+_DOC = struct.Struct("<IIII")
+_TERM = struct.Struct("<IIIIf")
+_POSTING = struct.Struct("<If")
+
+# Relative weight of a term by where it appears
+FIELD_WEIGHTS = {
+    "name": 6.0,
+    "class": 2.0,
+    "description": 1.0,
+    "params": 1.0,
+    "returns": 1.0,
+}
+
+STOPWORDS = frozenset("""
+    a an and are as at be by for from if in into is it its of on or that the this to was when which with
+""".split())
+
+_WORD_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+class Document(NamedTuple):
+    label: str        # "Class.method"
+    signature: str
+    terms: Dict[str, float]
+
+
+class Hit(NamedTuple):
+    score: float
+    label: str
+    signature: str
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """Lowercase words of text, with camelCase identifiers also split into their parts."""
+    for word in _WORD_RE.findall(text):
+        lower = word.lower()
+        if lower not in STOPWORDS:
+            yield lower
+        parts = _CAMEL_RE.findall(word)
+        if len(parts) > 1:
+            for part in parts:
+                part = part.lower()
+                if part not in STOPWORDS:
+                    yield part
+
+
+def method_signature(class_info: ClassInfo, method: MethodInfo) -> str:
+    # generate_types is only needed while building; queries skip importing it
+    from generate_types import convert_type_to_typescript
+
+    returns = convert_type_to_typescript(method.return_type, class_info.name, method.return_desc, method.name)
+    if method.is_property:
+        return f"{class_info.name}.{method.name}: {returns}"
+    params = ", ".join(
+        f"{name}: {convert_type_to_typescript(ptype, class_info.name, '', method.name, name)}"
+        for name, ptype, _ in method.params
+    )
+    return f"{class_info.name}.{method.name}({params}): {returns}"
+
+
+def class_documents(class_info: ClassInfo) -> List[Document]:
+    """Index entries for the methods a class declares itself."""
+    documents = []
+    for method in class_info.methods.values():
+        if method.inherited_from:
+            continue
+        fields = {
+            "name": method.name,
+            "class": class_info.name,
+            "description": method.description,
+            "params": " ".join(" ".join(p) for p in method.params),
+            "returns": f"{method.return_type} {method.return_desc}",
+        }
+        terms: Counter = Counter()
+        for field, text in fields.items():
+            for token in tokenize(text):
+                terms[token] += FIELD_WEIGHTS[field]
+        documents.append(Document(f"{class_info.name}.{method.name}", method_signature(class_info, method), terms))
+    return documents
+
+
+def _manifest_path(index_path: Path) -> Path:
+    return index_path.with_suffix(".manifest.json")
+
+
+def _class_sources(ir_path: Path, docs_dir: Path) -> Iterator[Tuple[str, str, Callable[[], ClassInfo]]]:
+    """(unit name, content hash, loader) for every class page, or IR class when there are no pages."""
+    pages = [p for p in sorted(docs_dir.glob("*.html")) if p.name != "index.html"] if docs_dir.exists() else []
+    if pages:
+        from generate_types import parse_html_file
+        for page in pages:
+            digest = hashlib.sha1(page.read_bytes()).hexdigest()
+            yield page.name, digest, (lambda page=page: parse_html_file(page))
+        return
+
+    for class_info in api_ir.load_classes(ir_path, docs_dir):
+        doc = api_ir.classes_to_json([class_info])["classes"][0]
+        digest = hashlib.sha1(json.dumps(doc, sort_keys=True).encode("utf-8")).hexdigest()
+        yield class_info.name, digest, (lambda class_info=class_info: class_info)
+
+
+def build_index(index_path: Path, ir_path: Path, docs_dir: Path) -> Tuple[int, int]:
+    """(Re)build the index; returns (pages parsed, pages reused from the manifest)."""
+    manifest_path = _manifest_path(index_path)
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("version") != INDEX_VERSION:
+            manifest = {}
+    except (OSError, ValueError):
+        manifest = {}
+    previous = manifest.get("units", {})
+
+    units = {}
+    parsed = reused = 0
+    for name, digest, load in _class_sources(ir_path, docs_dir):
+        entry = previous.get(name)
+        if entry and entry["hash"] == digest:
+            reused += 1
+        else:
+            class_info = load()
+            documents = class_documents(class_info) if class_info else []
+            entry = {"hash": digest, "documents": [list(d) for d in documents]}
+            parsed += 1
+        units[name] = entry
+
+    documents = [Document(*d) for unit in units.values() for d in unit["documents"]]
+    write_index(index_path, documents)
+    manifest_path.write_text(json.dumps({"version": INDEX_VERSION, "units": units}), encoding="utf-8")
+    return parsed, reused
+
+
+def write_index(path: Path, documents: List[Document]) -> None:
+    strings = bytearray()
+
+    def add_string(text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    doc_table = bytearray()
+    postings_by_term: Dict[str, List[Tuple[int, float]]] = {}
+    for doc_id, document in enumerate(documents):
+        doc_table += _DOC.pack(*add_string(document.label), *add_string(document.signature))
+        # Length-normalise so long descriptions don't dominate
+        norm = math.sqrt(sum(w * w for w in document.terms.values())) or 1.0
+        for term, weight in document.terms.items():
+            postings_by_term.setdefault(term, []).append((doc_id, weight / norm))
+
+    term_table = bytearray()
+    postings = bytearray()
+    posting_count = 0
+    for term in sorted(postings_by_term, key=lambda t: t.encode("utf-8")):
+        entries = postings_by_term[term]
+        idf = math.log(1 + len(documents) / len(entries))
+        term_table += _TERM.pack(*add_string(term), posting_count, len(entries), idf)
+        for doc_id, weight in entries:
+            postings += _POSTING.pack(doc_id, weight)
+        posting_count += len(entries)
+
+    docs_offset = _HEADER.size
+    terms_offset = docs_offset + len(doc_table)
+    postings_offset = terms_offset + len(term_table)
+    strings_offset = postings_offset + len(postings)
+    header = _HEADER.pack(_MAGIC, INDEX_VERSION, 0, len(documents), len(postings_by_term),
+                          docs_offset, terms_offset, postings_offset, strings_offset)
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(b"".join((header, doc_table, term_table, postings, strings)))
+    tmp.replace(path)
+
+
+class SearchIndex:
+    """Read-only view of an index file through mmap."""
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.doc_count, self.term_count,
+         self.docs_offset, self.terms_offset, self.postings_offset, self.strings_offset) = _HEADER.unpack_from(self.buf)
+        if magic != _MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} search index, rebuild it with --build")
+
+    def close(self):
+        self.buf.close()
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self.strings_offset + offset
+        return self.buf[start:start + length]
+
+    def _term(self, i: int) -> Tuple[bytes, int, int, float]:
+        offset, length, postings, count, idf = _TERM.unpack_from(self.buf, self.terms_offset + i * _TERM.size)
+        return self._string(offset, length), postings, count, idf
+
+    def _lower_bound(self, key: bytes) -> int:
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _matching_terms(self, token: str, prefix: bool) -> List[Tuple[int, int, float, float]]:
+        """Postings index, count, idf and score factor of the terms a query token matches."""
+        key = token.encode("utf-8")
+        i = self._lower_bound(key)
+        exact, expansions = [], []
+        # Every term sharing the prefix is read, stopping early would favour the alphabetically first ones
+        while i < self.term_count:
+            term, postings, count, idf = self._term(i)
+            if term == key:
+                exact.append((postings, count, idf, 1.0))
+            elif prefix and term.startswith(key):
+                expansions.append((postings, count, idf))
+            else:
+                break
+            i += 1
+
+        # Prefix matches count less than exact ones, and each by its share of the matched
+        # postings: "ge" mostly means get, not the rare generate and generatetake
+        total = sum(count for _, count, _ in expansions)
+        return exact + [(postings, count, idf, 0.5 * count / total) for postings, count, idf in expansions]
+
+    def document(self, doc_id: int) -> Tuple[str, str]:
+        label_off, label_len, sig_off, sig_len = _DOC.unpack_from(self.buf, self.docs_offset + doc_id * _DOC.size)
+        return self._string(label_off, label_len).decode("utf-8"), self._string(sig_off, sig_len).decode("utf-8")
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> List[Hit]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+        for token in tokens:
+            seen = set()
+            for postings, count, idf, factor in self._matching_terms(token, prefix):
+                base = self.postings_offset + postings * _POSTING.size
+                for k in range(count):
+                    doc_id, weight = _POSTING.unpack_from(self.buf, base + k * _POSTING.size)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * factor
+                    seen.add(doc_id)
+            for doc_id in seen:
+                matched[doc_id] = matched.get(doc_id, 0) + 1
+
+        # Documents matching more of the query rank first
+        best = heapq.nlargest(limit, scores, key=lambda d: (matched[d], scores[d]))
+        return [Hit(scores[d], *self.document(d)) for d in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the Synthesizer V Scripting API documentation.")
+    parser.add_argument("query", nargs="*", help="words to search for, e.g. 'note onset'")
+    parser.add_argument("--build", action="store_true", help="(re)build the index, parsing only changed pages")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="index file")
+    parser.add_argument("--ir", default=api_ir.DEFAULT_IR_PATH, help="API IR, used when there are no HTML pages")
+    parser.add_argument("--docs-dir", default=api_ir.DEFAULT_DOCS_DIR, help="downloaded HTML documentation")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="number of results")
+    parser.add_argument("--exact", action="store_true", help="don't match term prefixes")
+    args = parser.parse_args()
+
+    index_path = Path(args.index)
+    if args.build or not index_path.exists():
+        try:
+            parsed, reused = build_index(index_path, Path(args.ir), Path(args.docs_dir))
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return 2
+        print(f"Index written to {index_path} ({parsed} pages parsed, {reused} unchanged)", file=sys.stderr)
+
+    if not args.query:
+        return 0
+
+    index = SearchIndex(index_path)
+    try:
+        hits = index.search(" ".join(args.query), args.limit, prefix=not args.exact)
+    finally:
+        index.close()
+
+    if not hits:
+        print("No matches")
+        return 1
+    width = max(len(h.label) for h in hits)
+    for hit in hits:
+        print(f"{hit.score:6.2f}  {hit.label:<{width}}  {hit.signature}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+/**
+ * Type definitions for sv-prelude.js
+ * Generated from official documentation
+ */
+
+type NoteSnapshotField = "detune" | "duration" | "end" | "languageOverride" | "lyrics" | "musicalType" | "onset" | "phonemes" | "pitch" | "pitchAutoMode" | "rapAccent";
+type WritableNoteSnapshotField = "detune" | "duration" | "languageOverride" | "lyrics" | "musicalType" | "onset" | "phonemes" | "pitch" | "pitchAutoMode" | "rapAccent";
+
+/**
+ * Notes and their cached fields, one array entry per note.
+ * Only the fields passed to the snapshot function are filled in.
+ */
+interface NoteSnapshot {
+  group: NoteGroup | null;
+  length: number;
+  notes: Note[];
+  fields: NoteSnapshotField[];
+  dirty: { [field: string]: boolean[] };
+  /** Number of host calls made through this snapshot */
+  hostCalls: number;
+  /** Cached getDetune() */
+  detune: number[];
+  /** Cached getDuration() */
+  duration: number[];
+  /** Cached getEnd(), read-only, follows onset and duration edits */
+  end: number[];
+  /** Cached getLanguageOverride() */
+  languageOverride: string[];
+  /** Cached getLyrics() */
+  lyrics: string[];
+  /** Cached getMusicalType() */
+  musicalType: string[];
+  /** Cached getOnset() */
+  onset: number[];
+  /** Cached getPhonemes() */
+  phonemes: string[];
+  /** Cached getPitch() */
+  pitch: number[];
+  /** Cached getPitchAutoMode() */
+  pitchAutoMode: boolean[];
+  /** Cached getRapAccent() */
+  rapAccent: string[];
+}
+
+declare const NOTE_SNAPSHOT_FIELDS: { [field in NoteSnapshotField]: { get: string; set: string | null } };
+declare const NOTE_SNAPSHOT_DEFAULT_FIELDS: WritableNoteSnapshotField[];
+
+/** Read the given fields (default: all writable fields) of every note. */
+declare function snapshotNotes(notes: Note[], fields?: NoteSnapshotField[]): NoteSnapshot;
+/** Read every note of the group. */
+declare function snapshotNoteGroup(group: NoteGroup, fields?: NoteSnapshotField[]): NoteSnapshot;
+/** Sort the snapshot by the cached onsets; requires the onset field. */
+declare function sortSnapshotByOnset(snapshot: NoteSnapshot): void;
+/** Update a cached field without calling the host. */
+declare function setSnapshotField<K extends WritableNoteSnapshotField>(
+  snapshot: NoteSnapshot, field: K, index: number, value: NoteSnapshot[K][number]): void;
+/** Write changed fields back to the notes, returning the number of host calls. */
+declare function commitSnapshot(snapshot: NoteSnapshot): number;
@@ -0,0 +1,138 @@
+/// <reference path="./synthesizer-v-api.d.ts" />
+/// <reference path="./sv-prelude.d.ts" />
+
+/*
+
+Generated by docs/generate_types.py, do not edit; regenerate with
+`python3 generate_types.py --from-dts` when only the definitions are at hand.
+
+Each Note getter and setter is a call into the host. These helpers read the notes of a
+group once into plain arrays, serve reads from those arrays and write back only the
+fields that were changed. Copy this file into a script's "Common" section.
+
+*/
+
+// Note fields with their host getter and setter (null when read-only).
+var NOTE_SNAPSHOT_FIELDS = {
+	detune: { get: "getDetune", set: "setDetune" },
+	duration: { get: "getDuration", set: "setDuration" },
+	end: { get: "getEnd", set: null },
+	languageOverride: { get: "getLanguageOverride", set: "setLanguageOverride" },
+	lyrics: { get: "getLyrics", set: "setLyrics" },
+	musicalType: { get: "getMusicalType", set: "setMusicalType" },
+	onset: { get: "getOnset", set: "setOnset" },
+	phonemes: { get: "getPhonemes", set: "setPhonemes" },
+	pitch: { get: "getPitch", set: "setPitch" },
+	pitchAutoMode: { get: "getPitchAutoMode", set: "setPitchAutoMode" },
+	rapAccent: { get: "getRapAccent", set: "setRapAccent" }
+};
+
+// Fields read when snapshotNotes / snapshotNoteGroup is called without a field list.
+var NOTE_SNAPSHOT_DEFAULT_FIELDS = ["detune", "duration", "languageOverride", "lyrics", "musicalType", "onset", "phonemes", "pitch", "pitchAutoMode", "rapAccent"];
+
+// Reads the given fields of every note; pass only the fields the script needs.
+function snapshotNotes(notes, fields) {
+	fields = fields || NOTE_SNAPSHOT_DEFAULT_FIELDS;
+	var snapshot = {
+		group: null,
+		length: notes.length,
+		notes: notes,
+		fields: fields,
+		dirty: {},
+		hostCalls: 0
+	};
+	for(var f = 0; f < fields.length; f ++) {
+		var field = NOTE_SNAPSHOT_FIELDS[fields[f]];
+		if(!field) throw new Error("unknown note field: " + fields[f]);
+		var values = new Array(notes.length);
+		for(var i = 0; i < notes.length; i ++) {
+			values[i] = notes[i][field.get]();
+		}
+		snapshot[fields[f]] = values;
+		snapshot.dirty[fields[f]] = [];
+		snapshot.hostCalls += notes.length;
+	}
+	return snapshot;
+}
+
+// Reads every note of the group, with one getNote call per note.
+function snapshotNoteGroup(group, fields) {
+	var count = group.getNumNotes();
+	var notes = new Array(count);
+	for(var i = 0; i < count; i ++) {
+		notes[i] = group.getNote(i);
+	}
+	var snapshot = snapshotNotes(notes, fields);
+	snapshot.group = group;
+	snapshot.hostCalls += count + 1;
+	return snapshot;
+}
+
+// Sorts the snapshot by onset using the cached values instead of calling getOnset.
+function sortSnapshotByOnset(snapshot) {
+	if(!snapshot.onset) throw new Error("note field was not read: onset");
+	var order = [];
+	for(var i = 0; i < snapshot.length; i ++) order.push(i);
+	var onset = snapshot.onset;
+	order.sort(function(a, b) { return onset[a] - onset[b]; });
+
+	var columns = snapshot.fields.concat(["notes"]);
+	for(var c = 0; c < columns.length; c ++) {
+		var values = snapshot[columns[c]];
+		var sorted = new Array(values.length);
+		for(var i = 0; i < order.length; i ++) sorted[i] = values[order[i]];
+		snapshot[columns[c]] = sorted;
+	}
+	for(var f = 0; f < snapshot.fields.length; f ++) {
+		var dirty = snapshot.dirty[snapshot.fields[f]];
+		var sortedDirty = [];
+		for(var i = 0; i < order.length; i ++) sortedDirty[i] = dirty[order[i]];
+		snapshot.dirty[snapshot.fields[f]] = sortedDirty;
+	}
+}
+
+// Updates a cached field; the host is only updated by commitSnapshot.
+function setSnapshotField(snapshot, field, index, value) {
+	if(!NOTE_SNAPSHOT_FIELDS[field] || !NOTE_SNAPSHOT_FIELDS[field].set) {
+		throw new Error("note field is not writable: " + field);
+	}
+	if(!snapshot[field]) throw new Error("note field was not read: " + field);
+	if(snapshot[field][index] === value) return;
+	var previous = snapshot[field][index];
+	snapshot[field][index] = value;
+	snapshot.dirty[field][index] = true;
+	// The end is onset + duration, keep the cached one in step
+	if(snapshot.end && (field === "onset" || field === "duration")) {
+		snapshot.end[index] += value - previous;
+	}
+}
+
+// Writes changed fields back to the notes and returns the number of host calls made.
+function commitSnapshot(snapshot) {
+	var calls = 0;
+	var onsetDirty = snapshot.dirty.onset || [];
+	var durationDirty = snapshot.dirty.duration || [];
+	for(var f = 0; f < snapshot.fields.length; f ++) {
+		var name = snapshot.fields[f];
+		var dirty = snapshot.dirty[name];
+		var setter = NOTE_SNAPSHOT_FIELDS[name].set;
+		for(var i = 0; i < snapshot.length; i ++) {
+			if(!dirty[i]) continue;
+			// Onset and duration changed together: one setTimeRange instead of two calls.
+			if(onsetDirty[i] && durationDirty[i]) {
+				if(name == "onset") {
+					snapshot.notes[i].setTimeRange(snapshot.onset[i], snapshot.duration[i]);
+					calls ++;
+				}
+				continue;
+			}
+			snapshot.notes[i][setter](snapshot[name][i]);
+			calls ++;
+		}
+	}
+	for(var f = 0; f < snapshot.fields.length; f ++) {
+		snapshot.dirty[snapshot.fields[f]] = [];
+	}
+	snapshot.hostCalls += calls;
+	return calls;
+}
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check the batch PitchPerfect implementation.
+
+- Times `plan_controls` against a per-note Python loop ported line by line from
+  PitchPerfect.js `processNotes`, on a synthetic group with and without vibrato, and
+  checks that both plan identical controls.
+- With `--check-js` (needs node), runs PitchPerfect.js itself on fixture projects
+  through pitchperfect_harness.js and compares its pitch controls with
+  `apply_project`. Random noise is fixed to a constant on both sides.
+"""
+
+import argparse
+import copy
+import json
+import math
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from svp import QUARTER, load_svp, save_svp
+from pitch_perfect import (
+    DEFAULT_NOISE, FLAG, OFFSET_EPSILON, ONSET_NATURAL, TRANSITION_DURATION,
+    Controls, TempoMap, apply_project, plan_controls,
+)
+
+HERE = Path(__file__).resolve().parent
+
+
+def plan_loop(notes, offset, tempo, cents, hz, noise, random_value):
+    """Per-note port of `processNotes`; notes are (onset, duration, pitch) sorted by onset."""
+    controls = []  # (kind, pos, pitch, start, end)
+    for i, (onset, duration, pitch) in enumerate(notes):
+        following = notes[i + 1] if i + 1 < len(notes) else None
+        length = duration - ONSET_NATURAL
+        joined = False
+        if following:
+            transition = following[0] - (onset + duration)
+            if transition < TRANSITION_DURATION:
+                joined = True
+                length -= TRANSITION_DURATION - transition
+                if length <= 0:
+                    continue
+        if length <= 0:
+            continue
+
+        if cents <= 0:
+            controls.append((1, onset, pitch, ONSET_NATURAL, length - ONSET_NATURAL))
+            continue
+
+        controls.append((0, onset, pitch, 0, 0))
+        note_end = onset + length
+        start_seconds = float(tempo.seconds(np.array([onset + offset], dtype=np.float64))[0])
+        period = float(tempo.blicks(np.array([start_seconds + 1.0 / hz]))[0]
+                       - tempo.blicks(np.array([start_seconds]))[0])
+
+        position = onset + ONSET_NATURAL
+        half_cycles = 0
+        fade = 0.0
+        while position < note_end:
+            if half_cycles > 0:
+                amplitude = -1.0 if half_cycles % 2 == 0 else 1.0
+                fade = min(fade + 0.1, 1)
+                controls.append((0, position, pitch + cents * amplitude * fade / 100.0, 0, 0))
+            jitter = math.floor(period * (random_value * noise) + 0.5)
+            position += period / 2 + jitter
+            half_cycles += 1
+
+        if not joined:
+            controls.append((1, onset + duration, pitch, -OFFSET_EPSILON, OFFSET_EPSILON))
+    return controls
+
+
+def synthetic_notes(count, seed):
+    rng = random.Random(seed)
+    notes, t = [], 0
+    for _ in range(count):
+        duration = rng.choice((QUARTER // 8, QUARTER // 2, QUARTER, QUARTER * 2, QUARTER * 4))
+        notes.append((t, duration, rng.randrange(48, 72)))
+        t += duration + rng.choice((0, 0, 0, QUARTER // 16, QUARTER // 2, QUARTER))
+    return notes
+
+
+def same_plan(loop, planned: Controls) -> bool:
+    if len(loop) != len(planned.kind):
+        return False
+    expected = np.array(loop, dtype=np.float64).reshape(-1, 5)
+    actual = np.column_stack((planned.kind, planned.pos, planned.pitch, planned.start, planned.end))
+    # Positions are summed in a different order, so allow for float error far into a long group
+    tolerance = np.array([0, 1, 1e-9, 1e-6, 1e-6])
+    return bool(np.all(np.abs(expected - actual) <= tolerance))
+
+
+def benchmark(count, seed):
+    notes = synthetic_notes(count, seed)
+    tempo = TempoMap([{"position": 0, "bpm": 120.0}, {"position": QUARTER * 400, "bpm": 96.0}])
+    onset = np.array([n[0] for n in notes], dtype=np.int64)
+    duration = np.array([n[1] for n in notes], dtype=np.int64)
+    pitch = np.array([n[2] for n in notes], dtype=np.int64)
+    print(f"{count} notes:")
+
+    ok = True
+    for label, cents in (("flat", 0), ("vibrato", 5)):
+        started = time.perf_counter()
+        loop = plan_loop(notes, 0, tempo, cents, 5.0, DEFAULT_NOISE, 0.5)
+        loop_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        planned = plan_controls(onset, duration, pitch, 0, tempo, cents, 5.0, DEFAULT_NOISE,
+                                lambda n: np.full(n, 0.5))
+        plan_time = time.perf_counter() - started
+
+        match = same_plan(loop, planned)
+        ok &= match
+        print(f"  {label:<8} loop {loop_time * 1000:8.1f} ms  vectorized {plan_time * 1000:7.1f} ms  "
+              f"{loop_time / plan_time:6.1f}x  {len(loop)} controls  {'ok' if match else 'MISMATCH'}")
+    return ok
+
+
+def fixture_projects(directory: Path):
+    """The repository's test project plus synthetic ones with tempo changes and group offsets."""
+    fixtures = [HERE.parent / "musicxml-to-svp" / "testdata" / "loudness.svp"]
+    template = load_svp(fixtures[0])
+    for seed, tempos in ((1, [{"position": 0, "bpm": 120.0}]),
+                         (2, [{"position": 0, "bpm": 90.0}, {"position": QUARTER * 24, "bpm": 140.0}])):
+        project = copy.deepcopy(template)
+        project["time"]["tempo"] = tempos
+        group = project["library"][0]
+        note = group["notes"][0]
+        group["notes"] = [dict(note, onset=o, duration=d, pitch=p) for o, d, p in synthetic_notes(120, seed)]
+        group["pitchControls"] = [
+            {"pos": QUARTER * 8, "pitch": 60.0, "id": "kept", "type": "point", "points": []},
+            {"pos": QUARTER * 12, "pitch": 61.0, "id": "stale", "type": "curve", "points": [0, 0, QUARTER, 0],
+             "scriptData": {FLAG: True}},
+        ]
+        project["tracks"][0]["groups"][0]["blickOffset"] = QUARTER * 3 * seed
+        path = directory / f"fixture-{seed}.svp"
+        save_svp(project, path)
+        fixtures.append(path)
+    return fixtures
+
+
+def check_js(directory: Path) -> bool:
+    ok = True
+    for path in fixture_projects(directory):
+        for cents, hz, noise_value in ((0, 5.0, 0.0), (5, 5.0, 0.0), (20, 6.5, 0.5)):
+            js = json.loads(subprocess.run(
+                ["node", str(HERE / "pitchperfect_harness.js"), str(path), str(cents), str(hz), str(noise_value)],
+                capture_output=True, text=True, check=True).stdout)
+
+            project = load_svp(path)
+            apply_project(project, cents, hz, DEFAULT_NOISE, lambda n: np.full(n, noise_value))
+            groups = {g["uuid"]: g for g in project["library"]}
+            groups.update({t["mainGroup"]["uuid"]: t["mainGroup"] for t in project["tracks"] if "uuid" in t["mainGroup"]})
+
+            mismatches = 0
+            for uuid, expected in js.items():
+                actual = groups[uuid].get("pitchControls", [])
+                if len(actual) != len(expected):
+                    mismatches += 1
+                    continue
+                for a, e in zip(actual, expected):
+                    if (a["type"] != e["type"] or a["pos"] != math.floor(e["pos"] + 0.5)
+                            or abs(a["pitch"] - e["pitch"]) > 1e-9
+                            or not np.allclose(a["points"], e["points"])
+                            or (a.get("scriptData") or {}).get(FLAG, False) != e["flagged"]):
+                        mismatches += 1
+            count = sum(len(c) for c in js.values())
+            ok &= mismatches == 0
+            print(f"  {path.name:<16} cents={cents:<3} hz={hz:<4} random={noise_value}: "
+                  f"{count} controls, {'ok' if mismatches == 0 else f'{mismatches} MISMATCHES'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark and check the batch PitchPerfect implementation.")
+    parser.add_argument("--notes", type=int, default=50000, help="notes in the synthetic group")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--check-js", action="store_true", help="compare with PitchPerfect.js run under node")
+    args = parser.parse_args()
+
+    ok = benchmark(args.notes, args.seed)
+    if args.check_js:
+        if not shutil.which("node"):
+            print("node not found, skipping the PitchPerfect.js comparison")
+        else:
+            print("PitchPerfect.js fixtures:")
+            with tempfile.TemporaryDirectory() as tmp:
+                ok &= check_js(Path(tmp))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the columnar quantization against a per-note Python loop.
+
+The loop versions below are line-by-line ports of QuantizeNotes.js. Each run checks
+that both produce identical onsets and durations before reporting timings, on a
+synthetic project of `--notes` notes spread over `--groups` groups with a mix of
+legato runs, rests, overlaps and notes shorter than the grid.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from svp import QUARTER
+from svp_columnar import GRID_CHOICES, MODES, TOUCH_EPSILON, quantize_both, quantize_end, quantize_start
+
+
+def snap_loop(blicks, grid):
+    return (2 * blicks + grid) // (2 * grid) * grid
+
+
+def quantize_loop(mode, notes, grid):
+    """Quantize a list of [onset, duration] sorted by onset, in place."""
+    if mode == "start":
+        for note in notes:
+            note[0] = snap_loop(note[0], grid)
+    elif mode == "end":
+        for note in notes:
+            duration = snap_loop(note[0] + note[1], grid) - note[0]
+            note[1] = max(duration, grid // 8)
+    else:
+        i = 0
+        while i < len(notes):
+            run_start = i
+            while i + 1 < len(notes) and abs(notes[i + 1][0] - (notes[i][0] + notes[i][1])) < TOUCH_EPSILON:
+                i += 1
+            run = notes[run_start:i + 1]
+            i += 1
+
+            edges = [run[0][0]] + [n[0] + n[1] for n in run]
+            snapped = [snap_loop(e, grid) for e in edges]
+            for k in range(1, len(snapped)):
+                if snapped[k] <= snapped[k - 1]:
+                    snapped[k] = snapped[k - 1] + grid
+            for k, note in enumerate(run):
+                note[0], note[1] = snapped[k], snapped[k + 1] - snapped[k]
+
+
+def synthetic_groups(note_count, group_count, seed):
+    rng = random.Random(seed)
+    groups = []
+    for _ in range(group_count):
+        notes, t = [], rng.randrange(0, QUARTER)
+        for _ in range(note_count // group_count):
+            duration = rng.choice([QUARTER // 16, QUARTER // 3, QUARTER // 2, QUARTER, QUARTER * 2])
+            duration += rng.randrange(-QUARTER // 20, QUARTER // 20)
+            notes.append([t, max(duration, QUARTER // 64)])
+            gap = rng.random()
+            if gap < 0.6:
+                t += notes[-1][1] + rng.randrange(-TOUCH_EPSILON // 2, TOUCH_EPSILON // 2)  # legato
+            elif gap < 0.7:
+                t += notes[-1][1] // 2  # overlap
+            else:
+                t += notes[-1][1] + rng.randrange(QUARTER // 8, QUARTER * 2)  # rest
+        notes.sort(key=lambda n: n[0])
+        groups.append(notes)
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar quantization against a per-note loop.")
+    parser.add_argument("--notes", type=int, default=200000, help="notes in the synthetic project")
+    parser.add_argument("--groups", type=int, default=16, help="note groups in the synthetic project")
+    parser.add_argument("--grid", default="1/16", choices=list(GRID_CHOICES), help="grid to snap to")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    grid = GRID_CHOICES[args.grid]
+    groups = synthetic_groups(args.notes, args.groups, args.seed)
+    group = np.repeat(np.arange(len(groups), dtype=np.int32), [len(g) for g in groups])
+    onset = np.array([n[0] for g in groups for n in g], dtype=np.int64)
+    duration = np.array([n[1] for g in groups for n in g], dtype=np.int64)
+    print(f"{len(onset)} notes in {len(groups)} groups, grid {args.grid}")
+
+    failed = False
+    for mode in MODES:
+        loop_groups = [[list(n) for n in g] for g in groups]
+        started = time.perf_counter()
+        for notes in loop_groups:
+            quantize_loop(mode, notes, grid)
+        loop_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if mode == "start":
+            new_onset, new_duration = quantize_start(onset, duration, grid)
+        elif mode == "end":
+            new_onset, new_duration = quantize_end(onset, duration, grid)
+        else:
+            new_onset, new_duration = quantize_both(onset, duration, grid, group)
+        column_time = time.perf_counter() - started
+
+        expected = np.array([n for g in loop_groups for n in g], dtype=np.int64).reshape(-1, 2)
+        match = np.array_equal(expected[:, 0], new_onset) and np.array_equal(expected[:, 1], new_duration)
+        failed |= not match
+        print(f"  {mode:<5}  loop {loop_time * 1000:8.1f} ms  columnar {column_time * 1000:7.1f} ms"
+              f"  {loop_time / column_time:6.1f}x  {'ok' if match else 'MISMATCH'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
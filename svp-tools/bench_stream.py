@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming reader and writer against `json.load` on large synthetic projects.
+
+Each project has a few tracks with dense loudness/pitch automation and pitch controls,
+written directly to a temporary file so the generator itself stays small. Every
+measurement runs in a fresh process and reports wall time and peak resident memory:
+
+    json.load     load the whole document and walk its notes
+    iter_notes    stream the notes, skipping automation
+    rewrite       stream a copy with every note transposed
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from svp import QUARTER
+
+MODES = ("json.load", "iter_notes", "rewrite")
+
+
+def write_project(path: Path, size_mb: int, seed: int = 1) -> None:
+    """Write a project of roughly `size_mb` megabytes, about 80% of it automation points."""
+    rng = random.Random(seed)
+    tracks = 8
+    budget = size_mb * 1_000_000 // tracks
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"version":196,"time":{"meter":[{"index":0,"numerator":4,"denominator":4}],'
+                '"tempo":[{"position":0,"bpm":120.0}]},"library":[],"tracks":[')
+        for t in range(tracks):
+            f.write("," if t else "")
+            f.write(f'{{"name":"Track {t}","dispColor":"ff7db235","dispOrder":{t},'
+                    '"mixer":{"gainDecibel":0.0,"pan":0.0,"mute":false,"solo":false,"display":true},'
+                    f'"mainGroup":{{"name":"main","uuid":"g{t}","parameters":{{')
+            for p, name in enumerate(("pitchDelta", "loudness")):
+                f.write(f'{"," if p else ""}"{name}":{{"mode":"cubic","points":[')
+                written, blick = 0, 0
+                while written < budget * 0.43:
+                    blick += rng.randrange(1000000, 5000000)
+                    item = f'{"," if written else ""}{blick},{rng.uniform(-12, 12):.6f}'
+                    f.write(item)
+                    written += len(item)
+                f.write("]}")
+            f.write('},"pitchControls":[')
+            for c in range(2000):
+                f.write(f'{"," if c else ""}{{"pos":{c * QUARTER},"pitch":60.0,"id":"c{c}","type":"curve",'
+                        f'"points":[[0,0],[{QUARTER // 4},0.5],[{QUARTER // 2},0]]}}')
+            f.write('],"notes":[')
+            onset = 0
+            for n in range(int(budget * 0.15) // 180):
+                duration = rng.choice((QUARTER // 2, QUARTER, QUARTER * 2))
+                f.write(f'{"," if n else ""}{{"onset":{onset},"duration":{duration},"lyrics":"la",'
+                        f'"phonemes":"","pitch":{rng.randrange(48, 72)},"detune":0,'
+                        '"attributes":{"evenSyllableDuration":true}}')
+                onset += duration
+            f.write(f']}},"mainRef":{{"groupID":"g{t}","blickOffset":0,"pitchOffset":0,'
+                    f'"isInstrumental":false}},"groups":[],"uuid":"t{t}"}}')
+        f.write("]}\0")
+
+
+def measure(mode: str, path: Path) -> dict:
+    """Run one measurement in this process."""
+    import svp_stream
+
+    started = time.perf_counter()
+    notes = 0
+    if mode == "json.load":
+        with open(path, encoding="utf-8") as f:
+            project = json.loads(f.read().rstrip("\0"))
+        for track in project["tracks"]:
+            notes += sum(1 for _ in track["mainGroup"]["notes"])
+    elif mode == "iter_notes":
+        with open(path, encoding="utf-8") as f:
+            notes = sum(1 for _ in svp_stream.iter_notes(f))
+    else:
+        def transpose(key, value):
+            if len(key) == 5 and key[3] == "notes":
+                value["pitch"] += 1
+                return value
+            return None
+
+        with open(path, encoding="utf-8") as src, tempfile.TemporaryFile("w", encoding="utf-8") as dst:
+            notes = svp_stream.rewrite(src, dst, transpose)
+
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"seconds": elapsed, "peak_mb": peak_kb / 1024, "notes": notes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming .svp access against json.load.")
+    parser.add_argument("--sizes", default="25,100", help="comma separated project sizes in MB")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure[0], Path(args.measure[1]))))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = json.loads(subprocess.run(
+            [sys.executable, "-c", "import json, resource; import svp_stream;"
+             "print(json.dumps(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent).stdout)
+        print(f"interpreter baseline: {baseline:.0f} MB")
+
+        for size in map(int, args.sizes.split(",")):
+            path = Path(tmp) / f"project-{size}.svp"
+            write_project(path, size)
+            print(f"{os.path.getsize(path) / 1e6:.0f} MB project:")
+            for mode in MODES:
+                result = json.loads(subprocess.run(
+                    [sys.executable, __file__, "--measure", mode, str(path)],
+                    capture_output=True, text=True, check=True).stdout)
+                throughput = os.path.getsize(path) / 1e6 / result["seconds"]
+                print(f"  {mode:<11} {result['seconds']:6.2f}s  {throughput:6.1f} MB/s  "
+                      f"peak {result['peak_mb']:7.1f} MB  ({result['notes']} notes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
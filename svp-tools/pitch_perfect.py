@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Batch version of PitchPerfect.js: lock notes to their base pitch with pitch controls.
+
+For every note group placed on a track, the controls PitchPerfect.js would add are
+computed for all notes at once with NumPy and written into the group's `pitchControls`
+(the `pos` / `pitch` / `id` / `type` / `points` entries of musicxml-to-svp/svp.go,
+curve points flattened to [x0, y0, x1, y1, ...] relative to `pos`):
+
+- Each note is shortened by ONSET_NATURAL. Notes followed within TRANSITION_DURATION
+  by the next note ("joined") also give up the rest of the transition. Notes left with
+  no duration are skipped.
+- Without vibrato, a flat curve from ONSET_NATURAL to `duration - ONSET_NATURAL`.
+- With vibrato, a point at the onset, one point per half cycle alternating around the
+  base pitch with a 10% per step fade in, and, unless joined, a flat curve around the
+  note end. The period comes from the tempo at the note, and every half cycle is
+  lengthened by up to `noise` of a period.
+
+Controls are flagged with `scriptData["precise-pitch-control"]`. Flagged controls
+overlapping the processed notes are removed first, so re-running replaces them.
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("pitch_perfect.py requires NumPy: pip install numpy")
+
+from svp import QUARTER, collect_svp, load_svp, save_svp, track_groups
+
+FLAG = "precise-pitch-control"
+
+ONSET_NATURAL = QUARTER // 16
+OFFSET_EPSILON = QUARTER // 16
+TRANSITION_DURATION = QUARTER // 4
+
+DEFAULT_NOISE = 0.15
+
+# Fade in after k half cycles, accumulated like the script's `fadeIn = Math.min(fadeIn + 0.1, 1)`
+_FADE = [0.0]
+while _FADE[-1] < 1:
+    _FADE.append(min(_FADE[-1] + 0.1, 1))
+_FADE = np.array(_FADE)
+
+Random = Callable[[int], np.ndarray]
+
+
+class TempoMap:
+    """Blick <-> seconds conversion for a project's tempo marks."""
+
+    def __init__(self, tempos: List[dict]):
+        tempos = sorted(tempos, key=lambda t: t.get("position", 0)) or [{"position": 0, "bpm": 120.0}]
+        self.positions = np.array([t.get("position", 0) for t in tempos], dtype=np.float64)
+        self.positions[0] = min(self.positions[0], 0.0)
+        self.seconds_per_blick = 60.0 / np.array([t.get("bpm", 120.0) for t in tempos]) / QUARTER
+        spans = np.diff(self.positions) * self.seconds_per_blick[:-1]
+        self.starts = np.concatenate(([0.0], np.cumsum(spans)))
+
+    def seconds(self, blicks: np.ndarray) -> np.ndarray:
+        k = np.searchsorted(self.positions, blicks, side="right") - 1
+        k = np.maximum(k, 0)
+        return self.starts[k] + (blicks - self.positions[k]) * self.seconds_per_blick[k]
+
+    def blicks(self, seconds: np.ndarray) -> np.ndarray:
+        k = np.searchsorted(self.starts, seconds, side="right") - 1
+        k = np.maximum(k, 0)
+        return self.positions[k] + (seconds - self.starts[k]) / self.seconds_per_blick[k]
+
+
+class Controls(NamedTuple):
+    """Planned pitch controls in output order, one entry per control."""
+    kind: np.ndarray  # 0 = point, 1 = curve
+    pos: np.ndarray  # float64 blicks
+    pitch: np.ndarray  # float64 semitones
+    start: np.ndarray  # curve points [start, 0, end, 0]; unused for points
+    end: np.ndarray
+
+
+def _round_half_up(x: np.ndarray) -> np.ndarray:
+    return np.floor(x + 0.5)
+
+
+def plan_controls(onset: np.ndarray, duration: np.ndarray, pitch: np.ndarray, offset: int,
+                  tempo: TempoMap, cents: float, hz: float, noise: float = DEFAULT_NOISE,
+                  random: Optional[Random] = None) -> Controls:
+    """Pitch controls for notes sorted by onset, as PitchPerfect.js `processNotes` adds them."""
+    n = len(onset)
+    end = onset + duration
+    length = (duration - ONSET_NATURAL).astype(np.float64)
+    joined = np.zeros(n, dtype=bool)
+    transition = onset[1:] - end[:-1]
+    joined[:-1] = transition < TRANSITION_DURATION
+    length[:-1] -= np.where(joined[:-1], TRANSITION_DURATION - transition, 0)
+
+    keep = length > 0
+    notes = np.flatnonzero(keep)
+    base = pitch[notes].astype(np.float64)
+
+    if cents <= 0:
+        return Controls(
+            np.ones(len(notes), dtype=np.int8), onset[notes].astype(np.float64), base,
+            np.full(len(notes), float(ONSET_NATURAL)), length[notes] - ONSET_NATURAL,
+        )
+
+    # Half cycles: position k of a note is first + k * period / 2 plus the noise of the steps before it
+    start_seconds = tempo.seconds((onset[notes] + offset).astype(np.float64))
+    period = tempo.blicks(start_seconds + 1.0 / hz) - tempo.blicks(start_seconds)
+    half = period / 2
+    first = (onset[notes] + ONSET_NATURAL).astype(np.float64)
+    note_end = onset[notes] + length[notes]
+    # Noise only lengthens steps, so this bounds the number of iterations
+    steps = np.maximum(np.ceil((note_end - first) / half), 0).astype(np.int64)
+
+    total = int(steps.sum())
+    owner = np.repeat(np.arange(len(notes)), steps)
+    segment = np.concatenate(([0], np.cumsum(steps)[:-1]))
+    k = np.arange(total) - segment[owner]
+    draws = (random or np.random.default_rng().random)(total)
+    jitter = _round_half_up(period[owner] * (draws * noise)).astype(np.int64)
+    jitter_before = np.cumsum(jitter) - jitter
+    jitter_before -= jitter_before[segment[owner]]
+    position = first[owner] + k * half[owner] + jitter_before
+
+    vibrato = (k > 0) & (position < note_end[owner])
+    k, owner, position = k[vibrato], owner[vibrato], position[vibrato]
+    amplitude = np.where(k % 2 == 0, -1.0, 1.0)
+    fade = _FADE[np.minimum(k, len(_FADE) - 1)]
+    vibrato_pitch = base[owner] + cents * amplitude * fade / 100.0
+
+    tail = np.flatnonzero(~joined[notes])
+    count = len(notes)
+    # Sort key: note, then onset point (0), vibrato points (k), end curve (max)
+    order_note = np.concatenate((np.arange(count), owner, tail))
+    order_step = np.concatenate((np.zeros(count, dtype=np.int64), k, np.full(len(tail), np.iinfo(np.int64).max)))
+    order = np.lexsort((order_step, order_note))
+
+    kind = np.concatenate((np.zeros(count + len(owner), dtype=np.int8), np.ones(len(tail), dtype=np.int8)))
+    pos = np.concatenate((onset[notes].astype(np.float64), position, end[notes][tail].astype(np.float64)))
+    pitches = np.concatenate((base, vibrato_pitch, base[tail]))
+    starts = np.concatenate((np.zeros(count + len(owner)), np.full(len(tail), -float(OFFSET_EPSILON))))
+    ends = np.concatenate((np.zeros(count + len(owner)), np.full(len(tail), float(OFFSET_EPSILON))))
+    return Controls(kind[order], pos[order], pitches[order], starts[order], ends[order])
+
+
+def control_range(control: dict):
+    """Blick range a pitch control covers, as `clearPitchControlsInRange` measures it."""
+    pos = control.get("pos", 0)
+    points = control.get("points") or []
+    if control.get("type") == "curve" and len(points) >= 2:
+        return pos + points[0], pos + points[-2]
+    return pos, pos
+
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def to_svp(controls: Controls) -> List[dict]:
+    """Serialize planned controls as `.svp` pitchControls entries."""
+    entries = []
+    for kind, pos, pitch, start, end in zip(controls.kind.tolist(), _round_half_up(controls.pos).tolist(),
+                                            controls.pitch.tolist(), controls.start.tolist(), controls.end.tolist()):
+        entries.append({
+            "pos": int(pos),
+            "pitch": pitch,
+            "id": new_id(),
+            "type": "curve" if kind else "point",
+            "points": [start, 0.0, end, 0.0] if kind else [],
+            "scriptData": {FLAG: True},
+        })
+    return entries
+
+
+def apply_group(group: dict, offset: int, tempo: TempoMap, cents: float, hz: float,
+                noise: float = DEFAULT_NOISE, random: Optional[Random] = None) -> int:
+    """Replace the group's flagged pitch controls with fresh ones; returns how many were added."""
+    notes = sorted(group.get("notes", []), key=lambda n: n.get("onset", 0))
+    if not notes:
+        return 0
+
+    onset = np.array([n["onset"] for n in notes], dtype=np.int64)
+    duration = np.array([n["duration"] for n in notes], dtype=np.int64)
+    pitch = np.array([n.get("pitch", 0) for n in notes], dtype=np.int64)
+
+    first, last = onset[0], onset[-1] + duration[-1]
+    kept = []
+    for control in group.get("pitchControls", []):
+        if (control.get("scriptData") or {}).get(FLAG) is True:
+            start, end = control_range(control)
+            if not (end < first or start > last):
+                continue
+        kept.append(control)
+
+    added = to_svp(plan_controls(onset, duration, pitch, offset, tempo, cents, hz, noise, random))
+    group["pitchControls"] = kept + added
+    return len(added)
+
+
+def apply_project(project: dict, cents: float, hz: float, noise: float = DEFAULT_NOISE,
+                  random: Optional[Random] = None) -> int:
+    """Process every group of every track, like the script's "Entire Project" scope."""
+    tempo = TempoMap(project.get("time", {}).get("tempo", []))
+    # A group shared by several tracks is processed once per track, and each pass replaces
+    # the previous one's controls, so only the last placement matters.
+    last = {}
+    for placement in track_groups(project):
+        last[placement.group.get("uuid") or id(placement.group)] = placement
+    return sum(
+        apply_group(p.group, p.ref.get("blickOffset", 0), tempo, cents, hz, noise, random)
+        for p in last.values()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add PitchPerfect.js pitch controls to .svp projects.")
+    parser.add_argument("paths", nargs="+", help=".svp files or directories of them")
+    parser.add_argument("--vibrato-cents", type=float, default=5, help="vibrato depth, 0 for flat curves (default: 5)")
+    parser.add_argument("--vibrato-hz", type=float, default=5.0, help="vibrato rate (default: 5)")
+    parser.add_argument("--noise", type=float, default=DEFAULT_NOISE,
+                        help=f"random lengthening of half cycles, in periods (default: {DEFAULT_NOISE})")
+    parser.add_argument("--seed", type=int, help="seed for the vibrato noise")
+    parser.add_argument("-o", "--output-dir", help="write results here instead of in place")
+    args = parser.parse_args()
+
+    files = collect_svp(args.paths)
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+
+    started = time.perf_counter()
+    total = 0
+    for path in files:
+        project = load_svp(path)
+        added = apply_project(project, args.vibrato_cents, args.vibrato_hz, args.noise, rng.random)
+        save_svp(project, output_dir / path.name if output_dir else path)
+        total += added
+        print(f"{path}: {added} pitch controls")
+
+    print(f"✓ Added {total} pitch controls to {len(files)} files in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+// Runs PitchPerfect.js outside the editor against a mock of the scripting API.
+//
+//   node pitchperfect_harness.js project.svp <vibrato cents> <vibrato hz> <random>
+//
+// The script is run with the "Entire Project" scope and Math.random returning the
+// constant <random>. Prints {groupUUID: [pitch control, ...]} in the .svp layout.
+
+"use strict";
+
+var fs = require("fs");
+var path = require("path");
+var vm = require("vm");
+
+var QUARTER = 705600000;
+var FLAG = "precise-pitch-control";
+
+var args = process.argv.slice(2);
+var project = JSON.parse(fs.readFileSync(args[0], "utf8").replace(/\0+$/, ""));
+var answers = {
+	vibrato_cents: parseFloat(args[1]),
+	vibrato_hz: parseFloat(args[2]),
+	scope: 2
+};
+var randomValue = parseFloat(args[3]);
+
+function TimeAxis(tempos) {
+	tempos = tempos.slice().sort(function(a, b) { return a.position - b.position; });
+	if(tempos.length == 0) tempos = [{ position: 0, bpm: 120 }];
+	this.positions = [];
+	this.secondsPerBlick = [];
+	this.starts = [];
+	var seconds = 0;
+	for(var i = 0; i < tempos.length; i++) {
+		var position = i == 0 ? Math.min(tempos[i].position, 0) : tempos[i].position;
+		if(i > 0) seconds += (position - this.positions[i - 1]) * this.secondsPerBlick[i - 1];
+		this.positions.push(position);
+		this.secondsPerBlick.push(60.0 / tempos[i].bpm / QUARTER);
+		this.starts.push(seconds);
+	}
+}
+
+TimeAxis.prototype.segment = function(values, value) {
+	var k = 0;
+	while(k + 1 < values.length && values[k + 1] <= value) k++;
+	return k;
+};
+
+TimeAxis.prototype.getSecondsFromBlick = function(blicks) {
+	var k = this.segment(this.positions, blicks);
+	return this.starts[k] + (blicks - this.positions[k]) * this.secondsPerBlick[k];
+};
+
+TimeAxis.prototype.getBlickFromSeconds = function(seconds) {
+	var k = this.segment(this.starts, seconds);
+	return this.positions[k] + (seconds - this.starts[k]) / this.secondsPerBlick[k];
+};
+
+function Control(type) {
+	this.type = type;
+	this.scriptData = {};
+	this.position = 0;
+	this.pitch = 0;
+	this.points = [];
+}
+Control.prototype.setScriptData = function(key, value) { this.scriptData[key] = value; };
+Control.prototype.getScriptData = function(key) { return this.scriptData[key]; };
+Control.prototype.setPosition = function(position) { this.position = position; };
+Control.prototype.getPosition = function() { return this.position; };
+Control.prototype.setPitch = function(pitch) { this.pitch = pitch; };
+Control.prototype.setPoints = function(points) { this.points = points; };
+Control.prototype.getPoints = function() { return this.points; };
+
+function controlFromSVP(data) {
+	var control = new Control(data.type == "curve" ? "PitchControlCurve" : "PitchControlPoint");
+	control.position = data.pos;
+	control.pitch = data.pitch;
+	control.scriptData = data.scriptData || {};
+	var points = data.points || [];
+	for(var i = 0; i + 1 < points.length; i += 2) control.points.push([points[i], points[i + 1]]);
+	return control;
+}
+
+function Note(data) {
+	this.data = data;
+}
+Note.prototype.getOnset = function() { return this.data.onset; };
+Note.prototype.getDuration = function() { return this.data.duration; };
+Note.prototype.getEnd = function() { return this.data.onset + this.data.duration; };
+Note.prototype.getPitch = function() { return this.data.pitch; };
+
+function Group(data) {
+	var notes = (data.notes || []).slice().sort(function(a, b) { return a.onset - b.onset; });
+	this.data = data;
+	this.notes = notes.map(function(n) { return new Note(n); });
+	this.controls = (data.pitchControls || []).map(controlFromSVP);
+	// groupAsNotesArray() reads notes by index and length from the group object
+	for(var i = 0; i < this.notes.length; i++) this[i] = this.notes[i];
+	this.length = this.notes.length;
+}
+Group.prototype.getUUID = function() { return this.data.uuid; };
+Group.prototype.getNumNotes = function() { return this.notes.length; };
+Group.prototype.getNote = function(i) { return this.notes[i]; };
+Group.prototype.getNumPitchControls = function() { return this.controls.length; };
+Group.prototype.getPitchControl = function(i) { return this.controls[i]; };
+Group.prototype.removePitchControl = function(i) { this.controls.splice(i, 1); };
+Group.prototype.addPitchControl = function(control) { this.controls.push(control); };
+
+var groups = {};
+function groupFor(data) {
+	if(!groups[data.uuid]) groups[data.uuid] = new Group(data);
+	return groups[data.uuid];
+}
+
+var library = {};
+(project.library || []).forEach(function(g) { library[g.uuid] = g; });
+
+var tracks = (project.tracks || []).map(function(track) {
+	var refs = [];
+	var main = track.mainGroup || {};
+	if(main.notes) {
+		refs.push({ group: main, ref: track.mainRef || {} });
+	} else if(library[main.groupID]) {
+		refs.push({ group: library[main.groupID], ref: track.mainRef || main });
+	}
+	(track.groups || []).forEach(function(ref) {
+		if(library[ref.groupID]) refs.push({ group: library[ref.groupID], ref: ref });
+	});
+	return {
+		getNumGroups: function() { return refs.length; },
+		getGroupReference: function(i) {
+			return {
+				getTarget: function() { return groupFor(refs[i].group); },
+				getTimeOffset: function() { return refs[i].ref.blickOffset || 0; }
+			};
+		}
+	};
+});
+
+var timeAxis = new TimeAxis((project.time || {}).tempo || []);
+
+var SV = {
+	QUARTER: QUARTER,
+	T: function(text) { return text; },
+	finish: function() {},
+	showMessageBox: function(title, message) { throw new Error(message); },
+	showCustomDialog: function() { return { status: 1, answers: answers }; },
+	create: function(type) { return new Control(type); },
+	getProject: function() {
+		return {
+			getTimeAxis: function() { return timeAxis; },
+			getNumTracks: function() { return tracks.length; },
+			getTrack: function(i) { return tracks[i]; }
+		};
+	},
+	getMainEditor: function() {
+		return { getSelection: function() { return { hasSelectedNotes: function() { return false; } }; } };
+	}
+};
+
+var context = vm.createContext({ SV: SV, Proxy: Proxy, Math: Object.create(Math) });
+context.Math.random = function() { return randomValue; };
+var source = fs.readFileSync(path.join(__dirname, "..", "PitchPerfect.js"), "utf8");
+vm.runInContext(source, context);
+vm.runInContext("main()", context);
+
+var result = {};
+Object.keys(groups).forEach(function(uuid) {
+	result[uuid] = groups[uuid].controls.map(function(c) {
+		var points = [];
+		c.points.forEach(function(p) { points.push(p[0], p[1]); });
+		return {
+			pos: c.position,
+			pitch: c.pitch,
+			type: c.type == "PitchControlCurve" ? "curve" : "point",
+			points: points,
+			flagged: c.scriptData[FLAG] === true
+		};
+	});
+});
+process.stdout.write(JSON.stringify(result));
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Scan folders of `.svp` projects for notes with missing or unusable phonemes.
+
+Applies the rules of FindMissingPhonemes.js to the note data stored in the project.
+The editor's dictionary isn't available outside of it, so a note's phonemes are its
+explicit `phonemes` field, or its lyrics when written in phoneme notation (".hh ah").
+Groups are visited per track as the script does, and groups with a single note are
+skipped. Findings:
+
+    missing    no phonemes and no lyrics to derive them from (lyrics "-" continue the
+               previous note and are fine)
+    unknown    explicit phonemes that are not in the inventory of the group's language,
+               from docs/phonemes/ (see docs/build_phonemes.py)
+    split      a word whose "-"/"+" continuation notes are separated by a rest; the
+               report proposes a syllable split of the first note's phonemes, made
+               with the script's `distributePhonemes` / `isConsonant` rules
+
+Files are scanned in parallel and results are cached by file size, modification time and
+content hash, so re-scanning an unchanged corpus doesn't open the projects.
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set
+
+import svp_stream
+from svp import QUARTER, collect_svp, track_groups
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = ".scan-phonemes-cache.json"
+DEFAULT_PHONEME_DIR = Path(__file__).resolve().parent.parent / "docs" / "phonemes"
+
+# Database languages to phoneme inventories built by docs/build_phonemes.py
+LANGUAGE_TABLES = {
+    "english": "EnglishARPABET",
+    "japanese": "JapaneseROMAJI",
+    "mandarin": "MandarinChineseXSAMPA",
+    "cantonese": "CantoneseChineseXSAMPA",
+    "spanish": "SpanishXSAMPA",
+    "korean": "KoreanXSAMPA",
+}
+SHARED_TABLES = ("CommonPhonemes", "STDExclusive")
+
+CONSONANTS = frozenset("""
+    p t k b d g m n w h r l s z sh ch dh th f v j y x q ng
+""".split())
+
+
+class Finding(NamedTuple):
+    path: str
+    track: str
+    onset: int  # Absolute, in blicks
+    measure: int  # 1-based, as shown in the editor
+    kind: str
+    lyrics: str
+    detail: str
+
+    def __str__(self):
+        return (f"{self.path}: track '{self.track}' measure {self.measure} (onset {self.onset}): "
+                f"{self.kind} '{self.lyrics}' {self.detail}".rstrip())
+
+
+def is_consonant(phoneme: str) -> bool:
+    return phoneme in CONSONANTS
+
+
+def distribute_phonemes(phonemes: List[str]) -> List[List[str]]:
+    """Split phonemes into syllables: leading consonants, a vowel, and one of two following consonants."""
+    groups = []
+    i = 0
+    while i < len(phonemes):
+        group: List[str] = []
+        groups.append(group)
+
+        while i < len(phonemes) and is_consonant(phonemes[i]):
+            group.append(phonemes[i])
+            i += 1
+        if i >= len(phonemes):
+            break
+
+        group.append(phonemes[i])
+        i += 1
+
+        if i + 1 < len(phonemes) and is_consonant(phonemes[i]) and is_consonant(phonemes[i + 1]):
+            group.append(phonemes[i])
+            i += 1
+    return groups
+
+
+def load_inventories(phoneme_dir: Path) -> Dict[str, Set[str]]:
+    """Phonemes accepted for each database language, shared phonemes included."""
+    def table(name):
+        shard = json.loads((phoneme_dir / f"{name}.json").read_text(encoding="utf-8"))
+        return set(shard["phonemes"])
+
+    if not phoneme_dir.exists():
+        return {}
+    shared = set().union(*(table(name) for name in SHARED_TABLES))
+    return {language: table(name) | shared for language, name in LANGUAGE_TABLES.items()}
+
+
+def measure_at(meters: List[dict], blicks: int) -> int:
+    """0-based measure containing the position, following the project's time signatures."""
+    meters = sorted(meters, key=lambda m: m.get("index", 0)) or [{"index": 0, "numerator": 4, "denominator": 4}]
+    start = 0
+    for k, meter in enumerate(meters):
+        length = QUARTER * 4 * meter.get("numerator", 4) // meter.get("denominator", 4)
+        if k + 1 < len(meters):
+            span = (meters[k + 1]["index"] - meter["index"]) * length
+            if blicks < start + span:
+                return meter["index"] + (blicks - start) // length
+            start += span
+        else:
+            return meter["index"] + max(blicks - start, 0) // length
+    return 0
+
+
+def note_phonemes(note: dict) -> Optional[str]:
+    """Phonemes the project itself specifies for the note, or None."""
+    phonemes = (note.get("phonemes") or "").strip()
+    if phonemes and phonemes != "sil":
+        return phonemes
+    lyrics = (note.get("lyrics") or "").strip()
+    if lyrics.startswith(".") and len(lyrics) > 1:
+        return lyrics[1:].strip()
+    return None
+
+
+def scan_project(project: dict, path: str, inventories: Dict[str, Set[str]]) -> List[Finding]:
+    meters = project.get("time", {}).get("meter", [])
+    findings = []
+
+    for placement in track_groups(project):
+        notes = sorted(placement.group.get("notes", []), key=lambda n: n.get("onset", 0))
+        if len(notes) <= 1:
+            continue
+
+        track = placement.track
+        main_database = track.get("mainRef", {}).get("database") or {}
+        database = placement.ref.get("database") or {}
+        offset = placement.ref.get("blickOffset", 0)
+        default_language = (database.get("languageOverride") or database.get("language")
+                            or main_database.get("languageOverride") or main_database.get("language") or "")
+
+        def report(note, kind, detail=""):
+            onset = note.get("onset", 0) + offset
+            findings.append(Finding(path, track.get("name", ""), onset, measure_at(meters, onset + 1) + 1,
+                                    kind, note.get("lyrics", ""), detail))
+
+        for note in notes:
+            lyrics = (note.get("lyrics") or "").strip()
+            phonemes = note_phonemes(note)
+            if phonemes is None:
+                if not lyrics:
+                    report(note, "missing")
+                continue
+
+            language = (note.get("attributes") or {}).get("languageOverride") or default_language
+            inventory = inventories.get(language.lower())
+            if inventory:
+                unknown = [p for p in phonemes.split() if p not in inventory]
+                if unknown:
+                    report(note, "unknown", f"phonemes {' '.join(unknown)} not in {LANGUAGE_TABLES[language.lower()]}")
+
+        # Words continued by "-"/"+" notes across a rest
+        first = 0
+        while first < len(notes):
+            end = notes[first].get("onset", 0) + notes[first].get("duration", 0)
+            following = first + 1
+            disjoint = False
+            while following < len(notes) and notes[following].get("lyrics") in ("-", "+"):
+                disjoint = disjoint or notes[following].get("onset", 0) != end
+                end = notes[following].get("onset", 0) + notes[following].get("duration", 0)
+                following += 1
+
+            if disjoint:
+                phonemes = note_phonemes(notes[first])
+                proposal = "; ".join(" ".join(g) for g in distribute_phonemes(phonemes.split())) if phonemes else ""
+                report(notes[first], "split", f"spans a rest over {following - first} notes"
+                       + (f", syllables: {proposal}" if proposal else ""))
+            first = following
+
+    findings.sort(key=lambda f: (f.track, f.onset))
+    return findings
+
+
+def scan_file(path: str, inventories: Dict[str, Set[str]]) -> List[Finding]:
+    """Scan one project, reading only the note data the rules look at."""
+    with open(path, encoding="utf-8") as f:
+        project = svp_stream.load(f, svp_stream.SKIP_AUTOMATION | {"parameters", "vocalModes"})
+    return scan_project(project, path, inventories)
+
+
+def rules_digest(phoneme_dir: Path) -> str:
+    """Hash of the rule inputs, used to invalidate the cache."""
+    h = hashlib.sha1(Path(__file__).read_bytes())
+    for shard in sorted(phoneme_dir.glob("*.json")):
+        h.update(shard.name.encode())
+        h.update(shard.read_bytes())
+    return h.hexdigest()
+
+
+def read_cache(path: Path, digest: str) -> Dict[str, list]:
+    """Cached entries by file path; empty when the file is unreadable or was written for other rules."""
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    valid = cache.get("version") == CACHE_VERSION and cache.get("rules") == digest
+    return cache.get("files", {}) if valid else {}
+
+
+def write_cache(path: Path, digest: str, files: Dict[str, list]) -> None:
+    document = {"version": CACHE_VERSION, "rules": digest, "files": files}
+    path.write_text(json.dumps(document, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+
+
+def scan(files: List[Path], phoneme_dir: Path, cache_path: Optional[Path],
+         jobs: Optional[int] = None) -> List[Finding]:
+    """Scan the projects, reusing cached results for files that haven't changed."""
+    digest = rules_digest(phoneme_dir)
+    cached = read_cache(cache_path, digest) if cache_path else {}
+
+    # Entries are [size, mtime_ns, sha1, findings]; the hash is only computed when the stat differs
+    results: Dict[str, list] = {}
+    pending = []
+    for p in files:
+        path, stat = str(p), p.stat()
+        entry = cached.get(path)
+        if entry and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+            results[path] = entry
+            continue
+        file_hash = hashlib.sha1(p.read_bytes()).hexdigest()
+        if entry and entry[2] == file_hash:
+            results[path] = [stat.st_size, stat.st_mtime_ns] + entry[2:]
+        else:
+            results[path] = [stat.st_size, stat.st_mtime_ns, file_hash, None]
+            pending.append(path)
+
+    if pending:
+        scan_one = functools.partial(scan_file, inventories=load_inventories(phoneme_dir))
+        if len(pending) > 1 and jobs != 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                scanned = list(pool.map(scan_one, pending, chunksize=4))
+        else:
+            scanned = [scan_one(path) for path in pending]
+        for path, findings in zip(pending, scanned):
+            results[path][3] = [list(f) for f in findings]
+
+    if cache_path and (pending or results != {p: cached.get(p) for p in results}):
+        write_cache(cache_path, digest, results)
+
+    return [Finding(*f) for p in files for f in results[str(p)][3]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find notes with missing phonemes in folders of .svp projects.")
+    parser.add_argument("paths", nargs="+", help=".svp files or directories of them")
+    parser.add_argument("--phonemes", default=str(DEFAULT_PHONEME_DIR), help="phoneme tables from build_phonemes.py")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="result cache file, empty to disable")
+    parser.add_argument("--json", help="also write the report as JSON to this file")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    files = collect_svp(args.paths)
+    findings = scan(files, Path(args.phonemes), Path(args.cache) if args.cache else None, args.jobs)
+
+    for finding in findings:
+        print(finding)
+    if args.json:
+        report: Dict[str, Dict[str, list]] = {}
+        for f in findings:
+            report.setdefault(f.path, {}).setdefault(f.track, []).append(
+                {"onset": f.onset, "measure": f.measure, "kind": f.kind, "lyrics": f.lyrics, "detail": f.detail})
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
+
+    affected = len({f.path for f in findings})
+    print(f"Scanned {len(files)} projects: {len(findings)} problem note(s) in {affected} file(s)")
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
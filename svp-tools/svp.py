@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Reading and writing Synthesizer V Studio project (`.svp`) files.
+
+An `.svp` file is a JSON document, the schema is the one written by
+musicxml-to-svp/svp.go:
+
+    project  version, time {meter, tempo}, library [group], tracks [track]
+    group    name, uuid, notes [note], parameters {name: {mode, points}}, pitchControls
+    note     onset, duration (blicks, relative to the group), lyrics, phonemes, pitch, detune, attributes
+    track    name, mixer {gainDecibel, ...}, mainGroup, mainRef, groups [{groupID, blickOffset, ...}]
+
+Projects saved by the editor hold the track's own notes in `mainGroup`, projects written
+by musicxml-to-svp keep every group in `library` and reference it by uuid. Files saved by
+the editor end with a NUL byte; both forms load in the editor.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+QUARTER = 705600000  # Blicks per quarter note, SV.QUARTER
+
+PROJECT_TERMINATOR = "\0"
+
+
+def load_svp(path: Path) -> dict:
+    """Read a project, tolerating the trailing NUL written by the editor."""
+    text = Path(path).read_text(encoding="utf-8")
+    return json.loads(text.rstrip(PROJECT_TERMINATOR))
+
+
+def save_svp(project: dict, path: Path, terminated: bool = False) -> None:
+    """Write a project; `terminated` appends the NUL byte the editor writes."""
+    text = json.dumps(project, ensure_ascii=False, separators=(",", ":"))
+    Path(path).write_text(text + (PROJECT_TERMINATOR if terminated else ""), encoding="utf-8")
+
+
+def note_groups(project: dict) -> Iterator[Tuple[str, dict]]:
+    """Yield (name, group) for every group that holds notes: library groups and track main groups."""
+    for group in project.get("library", []):
+        yield group.get("name", ""), group
+    for track in project.get("tracks", []):
+        main = track.get("mainGroup", {})
+        if "notes" in main:
+            yield track.get("name", ""), main
+
+
+class Placement(NamedTuple):
+    """A note group as placed on a track by a group reference."""
+    track_index: int
+    track: dict
+    group: dict
+    ref: dict  # blickOffset, pitchOffset, database, ...
+
+
+def track_groups(project: dict) -> Iterator[Placement]:
+    """
+    Yield the note groups of every track, main group first.
+
+    Like the editor scripts, a group referenced several times by one track is visited once.
+    """
+    library = {g.get("uuid"): g for g in project.get("library", [])}
+    for index, track in enumerate(project.get("tracks", [])):
+        yield from track_placements(track, library, index)
+
+
+def track_placements(track: dict, library: Dict[str, dict], index: int = 0) -> Iterator[Placement]:
+    """The groups placed on one track, as `track_groups` yields them; `library` maps uuids to groups."""
+    main, main_ref = track.get("mainGroup", {}), track.get("mainRef", {})
+    candidates = []
+    if "notes" in main:
+        candidates.append((main, main_ref))
+    elif main.get("groupID") in library:
+        candidates.append((library[main["groupID"]], main_ref or main))
+    for ref in track.get("groups", []):
+        if ref.get("groupID") in library:
+            candidates.append((library[ref["groupID"]], ref))
+
+    visited = set()
+    for group, ref in candidates:
+        key = group.get("uuid") or id(group)
+        if key in visited:
+            continue
+        visited.add(key)
+        yield Placement(index, track, group, ref)
+
+
+def collect_svp(paths: List[str]) -> List[Path]:
+    """Expand directories into the `.svp` files below them."""
+    files = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.rglob("*.svp")) if p.is_dir() else [p])
+    return files
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Run several editor-script transforms over `.svp` projects in one pass.
+
+Each project is parsed once, every stage is applied to the in-memory document, and the
+result is written once. Stages are composed in the order given and visit the project
+track by track: a track goes through all stages before the next track is touched, so
+ten stages still cost a single traversal. Stages that create tracks hand them to the
+remaining stages; stages that write into other tracks (`move-to-voice`) split the
+traversal, because the stages before them have to finish every track first.
+
+A library group placed on several tracks is seen by each stage at some of its
+placements: the first (merge-tied, quantize), the last (pitch-perfect) or every one
+(split-voices). In projects with such groups a traversal is also split where a stage
+would see a group at an earlier placement than a stage before it has changed it, so
+the result is always the one of running the stages one at a time.
+
+    merge-tied       MergeTiedNotes.js: "-" notes continuing a note at the same pitch
+                     are merged into it
+    split-voices     SplitVoices.js: overlapping notes of a track are spread over new
+                     "<name> (Voice N)" tracks
+    move-to-voice    MoveCopyToVoice.js for whole tracks: the notes of a track (within
+                     an optional pitch / time window) are moved or copied to the track
+                     displayed above or below it
+    gain             AdjustAllGain.js: set or adjust the mixer gain of every track
+    quantize         QuantizeNotes.js, with svp_columnar (needs NumPy)
+    pitch-perfect    PitchPerfect.js, with pitch_perfect (needs NumPy)
+
+On the command line a stage is `name` or `name:option=value,...`:
+
+    python3 svp_pipeline.py --stage merge-tied --stage split-voices --stage gain:db=-3 projects/
+
+Projects are processed in a pool of worker processes, and the time spent parsing,
+in every stage, and writing is reported summed over all projects.
+"""
+
+import argparse
+import copy
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Type
+
+from svp import Placement, collect_svp, load_svp, save_svp, track_groups, track_placements
+
+GAIN_LIMIT = 24.0  # The mixer's range in dB, as AdjustAllGain.js clamps it
+
+
+class StageError(ValueError):
+    """An unknown stage or a bad stage option."""
+
+
+class Stage:
+    """
+    A transform applied to one track at a time.
+
+    `run` may modify any group placed on the track and returns the tracks it added to
+    the project. Stages reading or writing other tracks set `cross_track`.
+    """
+
+    name = ""
+    options: Dict[str, object] = {}  # Option name -> default, the type is taken from the default
+    cross_track = False
+    # Placements of a group placed more than once at which the stage reads or changes
+    # it: "first", "last", "every", or "" when the stage leaves notes alone
+    group_access = "every"
+
+    def __init__(self, **options):
+        unknown = set(options) - set(self.options)
+        if unknown:
+            raise StageError(f"{self.name}: unknown option(s) {', '.join(sorted(unknown))}, "
+                             f"expected {', '.join(self.options) or 'none'}")
+        for key, default in self.options.items():
+            setattr(self, key, options.get(key, default))
+
+    def __str__(self):
+        changed = [f"{k}={getattr(self, k)}" for k, v in self.options.items() if getattr(self, k) != v]
+        return f"{self.name}:{','.join(changed)}" if changed else self.name
+
+    def start(self, project: dict) -> None:
+        """Called once per project before the first track."""
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        raise NotImplementedError
+
+
+class GroupStage(Stage):
+    """A stage rewriting each note group once per project, however many tracks place it."""
+
+    group_access = "first"
+
+    def start(self, project: dict) -> None:
+        self._visited = set()
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        for placement in placements(project, track):
+            key = placement.group.get("uuid") or id(placement.group)
+            if key in self._visited:
+                continue
+            self._visited.add(key)
+            self.group(project, placement)
+        return []
+
+    def group(self, project: dict, placement: Placement) -> None:
+        raise NotImplementedError
+
+
+STAGES: Dict[str, Type[Stage]] = {}
+
+
+def stage(cls: Type[Stage]) -> Type[Stage]:
+    """Register a stage class under its name."""
+    STAGES[cls.name] = cls
+    return cls
+
+
+def placements(project: dict, track: dict) -> List[Placement]:
+    """The note groups placed on one track, main group first."""
+    library = {g.get("uuid"): g for g in project.get("library", [])}
+    return list(track_placements(track, library))
+
+
+def sorted_notes(group: dict) -> List[dict]:
+    return sorted(group.get("notes", []), key=lambda n: n.get("onset", 0))
+
+
+def note_end(note: dict) -> int:
+    return note.get("onset", 0) + note.get("duration", 0)
+
+
+def new_uuid() -> str:
+    return str(uuid.uuid4())
+
+
+def is_main(track: dict, placement: Placement) -> bool:
+    return placement.ref is track.get("mainRef") or placement.ref is track.get("mainGroup")
+
+
+@stage
+class MergeTied(GroupStage):
+    name = "merge-tied"
+
+    def group(self, project: dict, placement: Placement) -> None:
+        notes = sorted_notes(placement.group)
+        if len(notes) <= 1:
+            return
+
+        kept = []
+        fragment, fragment_pitch, fragment_end = None, 0, 0
+        for note in notes:
+            if (fragment is not None and note.get("lyrics") == "-"
+                    and note.get("pitch") == fragment_pitch and note.get("onset", 0) == fragment_end):
+                fragment_end = note_end(note)
+                continue
+            if fragment is not None:
+                fragment["duration"] = fragment_end - fragment.get("onset", 0)
+            fragment, fragment_pitch, fragment_end = note, note.get("pitch"), note_end(note)
+            kept.append(note)
+        fragment["duration"] = fragment_end - fragment.get("onset", 0)
+
+        placement.group["notes"] = kept
+
+
+@stage
+class SplitVoices(Stage):
+    """
+    Notes are ordered by placed onset, higher pitch first, and each goes to the first
+    voice that has ended by its onset. Voice 1 stays on the track; the notes of the
+    other voices move to the main group of a new track at their placed onset.
+    """
+
+    name = "split-voices"
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        entries = []
+        for placement in placements(project, track):
+            offset = placement.ref.get("blickOffset", 0)
+            for note in placement.group.get("notes", []):
+                entries.append((note.get("onset", 0) + offset, -note.get("pitch", 0), offset, note, placement.group))
+        entries.sort(key=lambda e: e[:2])
+
+        voice_ends: List[int] = []
+        voices: List[List[Tuple[int, dict, dict]]] = []
+        for onset, _, offset, note, group in entries:
+            for v, end in enumerate(voice_ends):
+                if onset >= end:
+                    break
+            else:
+                v = len(voice_ends)
+                voice_ends.append(0)
+                voices.append([])
+            voice_ends[v] = onset + note.get("duration", 0)
+            voices[v].append((offset, note, group))
+
+        if len(voices) <= 1:
+            return []
+
+        name = track.get("name") or "Track"
+        order = max(t.get("dispOrder", 0) for t in project["tracks"])
+        added = []
+        moved = set()
+        for v, notes in enumerate(voices[1:], start=2):
+            order += 1
+            new_track, main_group = empty_track(project, track, f"{name} (Voice {v})", order)
+            for offset, note, _ in notes:
+                clone = copy.deepcopy(note)
+                clone["onset"] = note.get("onset", 0) + offset
+                main_group["notes"].append(clone)
+                moved.add(id(note))
+            main_group["notes"].sort(key=lambda n: n["onset"])
+            added.append(new_track)
+        track["name"] = f"{name} (Voice 1)"
+
+        for group in {id(g): g for _, _, _, _, g in entries}.values():
+            group["notes"] = [n for n in group.get("notes", []) if id(n) not in moved]
+        return added
+
+
+def empty_track(project: dict, template: dict, name: str, order: int) -> Tuple[dict, dict]:
+    """
+    Add a track without notes, using the template's voice and mixer, and return it with its main group.
+
+    The main group is stored the way the template stores its own: inline in editor
+    projects, in the library for projects written by musicxml-to-svp.
+    """
+    main = template.get("mainGroup", {})
+    track = {k: copy.deepcopy(v) for k, v in template.items() if k not in ("mainGroup", "mainRef", "groups")}
+    track.update(name=name, dispOrder=order, uuid=new_uuid(), groups=[])
+
+    if "notes" in main:
+        group = {k: copy.deepcopy(v) for k, v in main.items() if k not in ("notes", "pitchControls", "parameters")}
+        group["parameters"] = {k: dict(p, points=[]) for k, p in main.get("parameters", {}).items()}
+        group.update(uuid=new_uuid(), notes=[])
+        track["mainGroup"] = group
+    else:
+        group = {"name": name, "uuid": new_uuid(), "notes": [], "parameters": {}}
+        project.setdefault("library", []).append(group)
+        track["mainGroup"] = dict(copy.deepcopy(main), groupID=group["uuid"], blickOffset=0, uuid=new_uuid())
+
+    if "mainRef" in template:
+        track["mainRef"] = dict(copy.deepcopy(template["mainRef"]), groupID=group["uuid"], blickOffset=0,
+                                uuid=new_uuid())
+    project["tracks"].append(track)
+    return track, group
+
+
+def ref_range(placement: Placement) -> Tuple[int, int]:
+    """Absolute blick range of a group reference: its stored bounds, or the span of its notes."""
+    begin, end = placement.ref.get("blickAbsoluteBegin"), placement.ref.get("blickAbsoluteEnd")
+    if begin is not None and end is not None and end >= begin:
+        return begin, end
+    notes = placement.group.get("notes", [])
+    offset = placement.ref.get("blickOffset", 0)
+    if not notes:
+        return offset, offset
+    return offset + min(n.get("onset", 0) for n in notes), offset + max(note_end(n) for n in notes)
+
+
+@stage
+class MoveToVoice(Stage):
+    """
+    Transfer the notes of the tracks named `track` (every track if empty) to the track
+    displayed `direction` (-1 above, 1 below) from them, group by group, with the target
+    group chosen by MoveCopyToVoice.js's `findTargetGroupRef`. Only notes with pitch in
+    [low, high] and placed onset in [begin, end) are transferred; end 0 means no limit.
+    """
+
+    name = "move-to-voice"
+    options = {"track": "", "direction": 1, "copy": False, "low": 0, "high": 127, "begin": 0, "end": 0}
+    cross_track = True
+
+    def start(self, project: dict) -> None:
+        # Only notes present before the stage are transferred, so notes passed on to a
+        # track aren't passed on again when that track's turn comes. The notes are kept
+        # referenced so their ids aren't reused by clones.
+        self._original = {id(n): n for p in track_groups(project) for n in p.group.get("notes", [])}
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        if self.track and track.get("name") != self.track:
+            return []
+        order = track.get("dispOrder", 0) + (1 if self.direction > 0 else -1)
+        target = next((t for t in project["tracks"] if t.get("dispOrder") == order), None)
+        if target is None:
+            return []
+
+        target_placements = placements(project, target)
+        for source in placements(project, track):
+            destination = self.target_group(track, source, target, target_placements)
+            if destination is None:
+                continue
+            source_offset = source.ref.get("blickOffset", 0)
+            target_offset = destination.ref.get("blickOffset", 0)
+
+            transfer = [n for n in source.group.get("notes", []) if self.selects(n, source_offset)]
+            if not transfer:
+                continue
+            for note in transfer:
+                clone = copy.deepcopy(note)
+                clone["onset"] = note.get("onset", 0) + source_offset - target_offset
+                destination.group.setdefault("notes", []).append(clone)
+            destination.group["notes"].sort(key=lambda n: n.get("onset", 0))
+            if not self.copy:
+                chosen = {id(n) for n in transfer}
+                source.group["notes"] = [n for n in source.group["notes"] if id(n) not in chosen]
+        return []
+
+    def selects(self, note: dict, offset: int) -> bool:
+        onset = note.get("onset", 0) + offset
+        return (id(note) in self._original and self.low <= note.get("pitch", 0) <= self.high
+                and onset >= self.begin and (self.end <= 0 or onset < self.end))
+
+    @staticmethod
+    def target_group(track: dict, source: Placement, target: dict,
+                     candidates: List[Placement]) -> Optional[Placement]:
+        if is_main(track, source):
+            return next((p for p in candidates if is_main(target, p)), None)
+
+        source_uuid = source.group.get("uuid")
+        source_start, source_end = ref_range(source)
+        for candidate in candidates:
+            if is_main(target, candidate) or candidate.ref.get("isInstrumental"):
+                continue
+            if candidate.group.get("uuid") == source_uuid:
+                continue
+            start, end = ref_range(candidate)
+            if start < source_end and end > source_start:
+                return candidate
+        return None
+
+
+@stage
+class Gain(Stage):
+    """Add `db` to each track's mixer gain, or set it with mode=absolute; clamped to the mixer's range."""
+
+    name = "gain"
+    options = {"db": 0.0, "mode": "relative"}
+    group_access = ""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        if self.mode not in ("relative", "absolute"):
+            raise StageError(f"gain: mode must be relative or absolute, not {self.mode!r}")
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        mixer = track.setdefault("mixer", {})
+        gain = mixer.get("gainDecibel", 0.0) + self.db if self.mode == "relative" else self.db
+        mixer["gainDecibel"] = max(-GAIN_LIMIT, min(GAIN_LIMIT, gain))
+        return []
+
+
+@stage
+class Quantize(GroupStage):
+    name = "quantize"
+    options = {"mode": "both", "grid": "1/16"}
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        import svp_columnar
+        if self.mode not in svp_columnar.MODES:
+            raise StageError(f"quantize: mode must be one of {', '.join(svp_columnar.MODES)}")
+        self._grid = svp_columnar.GRID_CHOICES.get(self.grid)
+        if self._grid is None:
+            self._grid = int(self.grid) if self.grid.isdigit() else 0
+        if self._grid <= 0:
+            raise StageError(f"quantize: grid must be one of {', '.join(svp_columnar.GRID_CHOICES)} "
+                             f"or a positive number of blicks, not {self.grid!r}")
+        self._quantize = {"start": svp_columnar.quantize_start, "end": svp_columnar.quantize_end,
+                          "both": svp_columnar.quantize_both}[self.mode]
+        self._np = svp_columnar.np
+
+    def group(self, project: dict, placement: Placement) -> None:
+        notes = sorted_notes(placement.group)
+        if not notes:
+            return
+        np = self._np
+        onset = np.array([n.get("onset", 0) for n in notes], dtype=np.int64)
+        duration = np.array([n.get("duration", 0) for n in notes], dtype=np.int64)
+        onset, duration = self._quantize(onset, duration, self._grid)
+        for note, o, d in zip(notes, onset.tolist(), duration.tolist()):
+            note["onset"], note["duration"] = o, d
+        placement.group["notes"] = notes
+
+
+@stage
+class PitchPerfect(Stage):
+    name = "pitch-perfect"
+    options = {"cents": 5.0, "hz": 5.0, "noise": 0.15}
+    group_access = "last"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        import pitch_perfect
+        self._pitch_perfect = pitch_perfect
+
+    def start(self, project: dict) -> None:
+        # As in pitch_perfect.apply_project, a shared group is planned for its last placement
+        self._tempo = self._pitch_perfect.TempoMap(project.get("time", {}).get("tempo", []))
+        self._last = {}
+        for placement in track_groups(project):
+            self._last[placement.group.get("uuid") or id(placement.group)] = id(placement.ref)
+
+    def run(self, project: dict, track: dict) -> List[dict]:
+        for placement in placements(project, track):
+            # Groups of tracks added by earlier stages aren't placed anywhere else
+            last = self._last.get(placement.group.get("uuid") or id(placement.group))
+            if last is None or last == id(placement.ref):
+                self._pitch_perfect.apply_group(placement.group, placement.ref.get("blickOffset", 0),
+                                                self._tempo, self.cents, self.hz, self.noise)
+        return []
+
+
+def parse_stage(spec: str) -> Stage:
+    """Build a stage from `name` or `name:option=value,...`."""
+    name, _, rest = spec.partition(":")
+    cls = STAGES.get(name.strip())
+    if cls is None:
+        raise StageError(f"unknown stage {name!r}, expected one of {', '.join(STAGES)}")
+
+    options = {}
+    for item in filter(None, (s.strip() for s in rest.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep or key not in cls.options:
+            raise StageError(f"{cls.name}: bad option {item!r}, expected one of "
+                             f"{', '.join(f'{k}=' for k in cls.options) or 'none'}")
+        default = cls.options[key]
+        try:
+            if isinstance(default, bool):
+                options[key] = value.lower() in ("1", "true", "yes")
+            else:
+                options[key] = type(default)(value)
+        except ValueError:
+            raise StageError(f"{cls.name}: {key} must be a {type(default).__name__}, not {value!r}") from None
+    return cls(**options)
+
+
+# Earliest and latest placement of a shared group a stage sees, by group_access
+_ACCESS_SPAN = {"first": (0, 0), "every": (0, 1), "last": (1, 1)}
+
+
+def has_shared_groups(project: dict) -> bool:
+    """Whether any note group is placed more than once."""
+    seen = set()
+    for placement in track_groups(project):
+        key = placement.group.get("uuid") or id(placement.group)
+        if key in seen:
+            return True
+        seen.add(key)
+    return False
+
+
+class Pipeline:
+    """Stages applied in order, in as few traversals of the tracks as the stages allow."""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = stages
+        # Timing keys; numbered so a stage used twice is timed twice
+        self.labels = [f"{i}. {s}" for i, s in enumerate(stages, start=1)]
+        self.passes = self._split(shared=False)
+        self.shared_passes = self._split(shared=True)
+
+    def _split(self, shared: bool) -> List[List[Tuple[str, Stage]]]:
+        """
+        Group the stages into traversals. With shared groups, a stage seeing a group at
+        an earlier placement than a stage before it in the traversal starts a new one.
+        """
+        passes: List[List[Tuple[str, Stage]]] = []
+        reach = 0
+        for label, s in zip(self.labels, self.stages):
+            span = _ACCESS_SPAN.get(s.group_access) if shared else None
+            if (s.cross_track or not passes or passes[-1][-1][1].cross_track
+                    or (span and span[0] < reach)):
+                passes.append([])
+                reach = 0
+            passes[-1].append((label, s))
+            if span:
+                reach = max(reach, span[1])
+        return passes
+
+    def run(self, project: dict, timings: Dict[str, float]) -> int:
+        """
+        Transform the project in place, adding the seconds spent per stage to `timings`.
+        Returns the number of traversals made.
+        """
+        project.setdefault("tracks", [])
+        passes = self.shared_passes if has_shared_groups(project) else self.passes
+        for stages in passes:
+            for label, s in stages:
+                started = time.perf_counter()
+                s.start(project)
+                timings[label] = timings.get(label, 0.0) + time.perf_counter() - started
+
+            # Tracks added by a stage go through the stages after it
+            pending = deque((track, 0) for track in project["tracks"])
+            while pending:
+                track, first = pending.popleft()
+                for k in range(first, len(stages)):
+                    label, s = stages[k]
+                    started = time.perf_counter()
+                    added = s.run(project, track)
+                    timings[label] = timings.get(label, 0.0) + time.perf_counter() - started
+                    pending.extend((t, k + 1) for t in added)
+        return len(passes)
+
+
+class Result(NamedTuple):
+    path: str
+    tracks: int
+    notes: int
+    traversals: int
+    timings: Dict[str, float]  # "parse", each stage, "write"
+
+
+def count_notes(project: dict) -> int:
+    seen = {}
+    for placement in track_groups(project):
+        seen[placement.group.get("uuid") or id(placement.group)] = len(placement.group.get("notes", []))
+    return sum(seen.values())
+
+
+# Worker process state, set once per process by _init_worker
+_worker_pipeline: Optional[Pipeline] = None
+_worker_output: Optional[Path] = None
+
+
+def _init_worker(specs: List[str], output_dir: Optional[Path]):
+    global _worker_pipeline, _worker_output
+    _worker_pipeline = Pipeline([parse_stage(spec) for spec in specs])
+    _worker_output = output_dir
+
+
+def _process_file(path: str) -> Result:
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    project = load_svp(path)
+    with open(path, "rb") as f:
+        # Keep the editor's trailing NUL if the file had one
+        f.seek(-1, 2)
+        terminated = f.read(1) == b"\0"
+    timings["parse"] = time.perf_counter() - started
+
+    traversals = _worker_pipeline.run(project, timings)
+
+    started = time.perf_counter()
+    save_svp(project, _worker_output / Path(path).name if _worker_output else Path(path), terminated)
+    timings["write"] = time.perf_counter() - started
+    return Result(path, len(project["tracks"]), count_notes(project), traversals, timings)
+
+
+def process(files: List[Path], specs: List[str], output_dir: Optional[Path] = None,
+            jobs: Optional[int] = None, progress: Callable[[Result], None] = None) -> List[Result]:
+    """Run the pipeline described by `specs` over the files, in worker processes unless jobs == 1."""
+    Pipeline([parse_stage(spec) for spec in specs])  # Report bad stages before starting workers
+    paths = [str(p) for p in files]
+    if len(paths) > 1 and jobs != 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(specs, output_dir)) as pool:
+            results = []
+            for result in pool.map(_process_file, paths, chunksize=4):
+                results.append(result)
+                if progress:
+                    progress(result)
+            return results
+
+    _init_worker(specs, output_dir)
+    results = []
+    for path in paths:
+        results.append(_process_file(path))
+        if progress:
+            progress(results[-1])
+    return results
+
+
+def report(results: List[Result], specs: List[str], wall: float) -> None:
+    """Print the time per step summed over all projects."""
+    pipeline = Pipeline([parse_stage(spec) for spec in specs])
+    steps = ["parse"] + pipeline.labels + ["write"]
+    total = sum(sum(r.timings.values()) for r in results) or 1.0
+    print(f"{'step':<28} {'total':>9} {'per file':>10} {'share':>6}")
+    for step in steps:
+        seconds = sum(r.timings.get(step, 0.0) for r in results)
+        print(f"{step:<28} {seconds:8.2f}s {seconds / max(len(results), 1) * 1000:8.1f}ms {seconds / total:6.1%}")
+    traversals = sorted({r.traversals for r in results}) or [len(pipeline.passes)]
+    per_project = f"{traversals[0]}" if len(traversals) == 1 else f"{traversals[0]}-{traversals[-1]}"
+    print(f"{len(results)} projects, {per_project} traversal(s) per project, "
+          f"{sum(r.notes for r in results)} notes, {wall:.2f}s wall time")
+
+
+def main():
+    stage_help = [f"{name} ({', '.join(f'{k}={v}' for k, v in cls.options.items()) or 'no options'})"
+                  for name, cls in STAGES.items()]
+    parser = argparse.ArgumentParser(description="Apply several transforms to .svp projects in one pass.",
+                                     epilog="stages: " + ", ".join(stage_help))
+    parser.add_argument("paths", nargs="+", help=".svp files or directories of them")
+    parser.add_argument("-s", "--stage", action="append", required=True, dest="stages",
+                        metavar="NAME[:OPTION=VALUE,...]", help="a stage to run, repeat in order")
+    parser.add_argument("-o", "--output-dir", help="write results here instead of in place")
+    parser.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each project as it is done")
+    args = parser.parse_args()
+
+    try:
+        Pipeline([parse_stage(spec) for spec in args.stages])
+    except StageError as e:
+        parser.error(str(e))
+
+    files = collect_svp(args.paths)
+    output_dir = Path(args.output_dir) if args.output_dir else None
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    def progress(result: Result):
+        if args.verbose:
+            print(f"{result.path}: {result.tracks} tracks, {result.notes} notes")
+
+    started = time.perf_counter()
+    results = process(files, args.stages, output_dir, args.jobs, progress)
+    report(results, args.stages, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
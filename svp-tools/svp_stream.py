@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Streaming reader and writer for large `.svp` projects.
+
+The document is scanned in fixed-size chunks. Only the containers of the project
+structure are walked (the project, `library` groups, `tracks`, their `mainGroup`,
+`notes` and `parameters`); every other value is decoded on its own with `json.loads`,
+one note or field at a time. Values under a skipped key, by default automation
+`points` and `pitchControls`, are scanned past without being decoded, so memory use
+stays bounded by the chunk size and the largest single value that is decoded.
+
+Values are reported as `(path, value)` pairs, for example
+
+    ("version",)                          196
+    ("library", 0, "name")                "Soprano"
+    ("library", 0, "notes", 12)           {"onset": ..., "duration": ..., ...}
+    ("tracks", 1, "mixer")                {"gainDecibel": 0.0, ...}
+    ("tracks", 1, "mainGroup", "notes", 0)
+
+With `containers` set, every walked container is also reported, as an empty dict or
+list, when it opens, so documents can be rebuilt with their empty containers.
+
+`rewrite` copies a project to a new file in the same single pass, replacing the values
+an edit function changes and copying everything else, skipped subtrees included,
+byte for byte.
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Optional, TextIO, Tuple
+
+SKIP_AUTOMATION = frozenset({"points", "pitchControls"})
+
+CHUNK_SIZE = 1 << 20
+
+PathKey = Tuple[Any, ...]
+
+# Containers walked into; ints in a path match "#", the parameter name after "parameters" matches "*"
+_GROUP_SHAPES = {(), ("notes",), ("parameters",), ("parameters", "*")}
+_CONTAINERS = frozenset(
+    {(), ("library",), ("tracks",), ("tracks", "#")}
+    | {("library", "#") + s for s in _GROUP_SHAPES}
+    | {("tracks", "#", "mainGroup") + s for s in _GROUP_SHAPES}
+)
+
+_WHITESPACE = re.compile(r"[\s\0]*")
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SCALAR_END = re.compile(r"[\s,\]}\0]")
+
+_decoder = json.JSONDecoder()
+
+
+class SvpStreamError(ValueError):
+    """Raised when the input is not a well-formed project document."""
+
+
+def _shape(path: PathKey) -> PathKey:
+    shape = []
+    for i, key in enumerate(path):
+        if isinstance(key, int):
+            shape.append("#")
+        elif i > 0 and path[i - 1] == "parameters":
+            shape.append("*")
+        else:
+            shape.append(key)
+    return tuple(shape)
+
+
+class ProjectStream:
+    """
+    Single pass over a project document.
+
+    With `out` set, all input text is copied to `out` as it is consumed, and `replace`
+    substitutes the value last yielded by `events`. With `containers` set, walked
+    containers are yielded as an empty dict or list when they open.
+    """
+
+    def __init__(self, f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION,
+                 out: Optional[TextIO] = None, chunk_size: int = CHUNK_SIZE, containers: bool = False):
+        self.f = f
+        self.skip = frozenset(skip)
+        self.out = out
+        self.chunk_size = chunk_size
+        self.containers = containers
+        self.buf = ""
+        self.pos = 0
+        self.mark = 0  # Text before mark has been written to out
+        self.last = (0, 0)  # Extent of the last decoded value in buf
+
+    def _more(self, hold: int) -> int:
+        """Read a chunk, dropping buffered text before `hold`; returns how far indices moved."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            raise SvpStreamError("unexpected end of project")
+        if self.out is not None and self.mark < hold:
+            self.out.write(self.buf[self.mark:hold])
+        self.mark = max(self.mark - hold, 0)
+        self.buf = self.buf[hold:] + chunk
+        self.pos -= hold
+        return hold
+
+    def _skip_whitespace(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._more(self.pos)
+
+    def _decode(self) -> Any:
+        """Decode the value at the cursor and move past it."""
+        self._skip_whitespace()
+        begin = self.pos
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, begin)
+                # A number that ends with the buffer may continue in the next chunk
+                if end < len(self.buf):
+                    break
+            except json.JSONDecodeError:
+                pass
+            begin -= self._more(begin)
+
+        self.pos = end
+        self.last = (begin, end)
+        return value
+
+    def _skip(self) -> None:
+        """Move past the value at the cursor without decoding it."""
+        i = self.pos
+        if self.buf[i] not in '"[{':
+            while True:
+                m = _SCALAR_END.search(self.buf, i)
+                if m:
+                    self.pos = m.start()
+                    return
+                i = len(self.buf)
+                i -= self._more(i)
+        depth = 0
+        while True:
+            m = _STRUCTURE.search(self.buf, i)
+            if m is None:
+                i = len(self.buf)
+                i -= self._more(i)
+                continue
+            if m.group() == '"':
+                s = _STRING.match(self.buf, m.start())
+                if s is None:  # String continues in the next chunk
+                    i = m.start()
+                    i -= self._more(i)
+                    continue
+                i = s.end()
+            elif m.group() in "[{":
+                depth += 1
+                i = m.end()
+            else:
+                depth -= 1
+                i = m.end()
+            if depth == 0:
+                self.pos = i
+                return
+
+    def _expect(self, ch: str) -> None:
+        if self._skip_whitespace() != ch:
+            raise SvpStreamError(f"expected {ch!r} at {self.buf[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def events(self) -> Iterator[Tuple[PathKey, Any]]:
+        """Yield (path, value) for every decoded value, in document order."""
+        yield from self._walk(())
+        if self.out is not None:
+            self.out.write(self.buf[self.mark:])
+            self.mark = len(self.buf)
+            for chunk in iter(lambda: self.f.read(self.chunk_size), ""):
+                self.out.write(chunk)
+
+    def _walk(self, path: PathKey) -> Iterator[Tuple[PathKey, Any]]:
+        opener = self._skip_whitespace()
+        if path and path[-1] in self.skip:
+            self._skip()
+        elif opener == "{" and _shape(path) in _CONTAINERS:
+            self.pos += 1
+            if self.containers and path:
+                yield path, {}
+            while True:
+                ch = self._skip_whitespace()
+                if ch == "}":
+                    self.pos += 1
+                    return
+                if ch == ",":
+                    self.pos += 1
+                    continue
+                key = self._decode()
+                self._expect(":")
+                yield from self._walk(path + (key,))
+        elif opener == "[" and _shape(path) in _CONTAINERS:
+            self.pos += 1
+            if self.containers and path:
+                yield path, []
+            index = 0
+            while True:
+                ch = self._skip_whitespace()
+                if ch == "]":
+                    self.pos += 1
+                    return
+                if ch == ",":
+                    self.pos += 1
+                    continue
+                yield from self._walk(path + (index,))
+                index += 1
+        else:
+            yield path, self._decode()
+
+    def replace(self, value: Any) -> None:
+        """Write `value` in place of the value last yielded by `events`."""
+        if self.out is None:
+            raise SvpStreamError("replace needs an output stream")
+        begin, end = self.last
+        self.out.write(self.buf[self.mark:begin])
+        self.out.write(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+        self.mark = end
+
+
+def read_events(f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION,
+                containers: bool = False) -> Iterator[Tuple[PathKey, Any]]:
+    return ProjectStream(f, skip, containers=containers).events()
+
+
+def _insert(root: Any, path: PathKey, value: Any) -> None:
+    """Add a value reported with `containers` set; its parent has been reported before it."""
+    node = root
+    for key in path[:-1]:
+        node = node[key]
+    if isinstance(node, list):
+        node.append(value)
+    else:
+        node[path[-1]] = value
+
+
+def load(f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION) -> dict:
+    """Load a project as nested dicts and lists, leaving out the skipped subtrees."""
+    project: dict = {}
+    for path, value in read_events(f, skip, containers=True):
+        _insert(project, path, value)
+    return project
+
+
+def _group_path(path: PathKey) -> Tuple[PathKey, PathKey]:
+    """Split a path into the group it belongs to and the rest, or ((), path) outside groups."""
+    if path[:1] == ("library",) and len(path) > 1:
+        return path[:2], path[2:]
+    if path[:1] == ("tracks",) and path[2:3] == ("mainGroup",):
+        return path[:3], path[3:]
+    return (), path
+
+
+def iter_notes(f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION) -> Iterator[Tuple[PathKey, int, dict]]:
+    """Yield (group path, index, note); group paths are ("library", i) or ("tracks", j, "mainGroup")."""
+    for path, value in read_events(f, skip | {"parameters"}):
+        group, rest = _group_path(path)
+        if rest[:1] == ("notes",) and len(rest) == 2:
+            yield group, rest[1], value
+
+
+def _assemble(events: Iterator[Tuple[PathKey, Any]], depth: int, root: str) -> Iterator[Tuple[PathKey, dict]]:
+    current: Optional[PathKey] = None
+    record: Dict[str, Any] = {}
+    for path, value in events:
+        if path[:1] != (root,) or len(path) < depth:
+            continue
+        if path[:depth] != current:
+            if current is not None:
+                yield current, record
+            current, record = path[:depth], {}
+        if len(path) > depth:
+            _insert(record, path[depth:], value)
+    if current is not None:
+        yield current, record
+
+
+def iter_groups(f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION) -> Iterator[Tuple[PathKey, dict]]:
+    """Yield (("library", i), group) for library groups, without their notes."""
+    return _assemble(read_events(f, skip | {"notes"}, containers=True), 2, "library")
+
+
+def iter_tracks(f: TextIO, skip: FrozenSet[str] = SKIP_AUTOMATION) -> Iterator[Tuple[PathKey, dict]]:
+    """Yield (("tracks", j), track) without the notes of the track's main group."""
+    return _assemble(read_events(f, skip | {"notes"}, containers=True), 2, "tracks")
+
+
+def rewrite(src: TextIO, dst: TextIO, edit: Callable[[PathKey, Any], Any],
+            skip: FrozenSet[str] = SKIP_AUTOMATION) -> int:
+    """
+    Copy a project from src to dst, passing every decoded value through `edit(path, value)`.
+
+    `edit` returns the replacement value, or None to keep the original text. Returns the
+    number of replaced values.
+    """
+    stream = ProjectStream(src, skip, out=dst)
+    edits = 0
+    for path, value in stream.events():
+        new = edit(path, value)
+        if new is not None:
+            stream.replace(new)
+            edits += 1
+    return edits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the notes, groups or tracks of a large .svp project.")
+    parser.add_argument("project", help=".svp file")
+    parser.add_argument("--list", choices=("notes", "groups", "tracks"), default="tracks", help="what to print")
+    parser.add_argument("--transpose", type=int, help="write the project shifted by this many semitones")
+    parser.add_argument("-o", "--output", help="output file for --transpose")
+    args = parser.parse_args()
+
+    if args.transpose is not None:
+        if not args.output:
+            parser.error("--transpose needs --output")
+
+        def transpose(path, value):
+            if _group_path(path)[1][:1] != ("notes",):
+                return None
+            value["pitch"] += args.transpose
+            return value
+
+        with open(args.project, encoding="utf-8") as src, open(args.output, "w", encoding="utf-8") as dst:
+            edits = rewrite(src, dst, transpose)
+        print(f"✓ Transposed {edits} notes to: {Path(args.output).absolute()}")
+        return 0
+
+    with open(args.project, encoding="utf-8") as f:
+        if args.list == "notes":
+            for group, index, note in iter_notes(f):
+                print(f"{'/'.join(map(str, group))}#{index}: onset={note.get('onset')} "
+                      f"duration={note.get('duration')} pitch={note.get('pitch')} lyrics={note.get('lyrics')!r}")
+        else:
+            for path, record in (iter_groups if args.list == "groups" else iter_tracks)(f):
+                print(f"{'/'.join(map(str, path))}: {record.get('name', '')!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""scan_phonemes rules against FindMissingPhonemes.js, on hand-built projects."""
+
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scan_phonemes import distribute_phonemes, measure_at, scan_project
+from svp import QUARTER
+
+SCRIPT = Path(__file__).resolve().parent.parent / "FindMissingPhonemes.js"
+
+PHONEMES = [
+    "s ih ng", "hh ah l ow", "s t r ih ng z", "ah", "k", "ae n d", "ih k s t r ah", "m ay n d", "",
+]
+
+
+def js_distribute(phonemes):
+    """Run the grouping loop of the script's distributePhonemes under node."""
+    source = SCRIPT.read_text(encoding="utf-8")
+    consonant = re.search(r"function isConsonant\(p\) \{.*?\n\}", source, re.DOTALL).group(0)
+    body = re.search(r"function distributePhonemes\(.*?(var groups = \[\];.*?)\n\tvar result", source, re.DOTALL)
+    program = (f"{consonant}\nvar cases = {json.dumps([p.split(' ') if p else [] for p in phonemes])};\n"
+               "console.log(JSON.stringify(cases.map(function(phonemes) {\n"
+               f"{body.group(1)}\nreturn groups; }})));")
+    return json.loads(subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout)
+
+
+def test_distribute_phonemes():
+    assert distribute_phonemes("s ih ng".split()) == [["s", "ih"], ["ng"]]
+    assert distribute_phonemes("s t r ih ng z".split()) == [["s", "t", "r", "ih", "ng"], ["z"]]
+    assert distribute_phonemes("ih k s t r ah".split()) == [["ih", "k"], ["s", "t", "r", "ah"]]
+    assert distribute_phonemes([]) == []
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="needs node")
+def test_distribute_phonemes_matches_script():
+    assert [distribute_phonemes(p.split()) for p in PHONEMES] == js_distribute(PHONEMES)
+
+
+def test_measure_at_follows_meter_changes():
+    meters = [{"index": 0, "numerator": 4, "denominator": 4}, {"index": 2, "numerator": 3, "denominator": 4}]
+    assert measure_at(meters, 0) == 0
+    assert measure_at(meters, QUARTER * 4 - 1) == 0
+    assert measure_at(meters, QUARTER * 4) == 1
+    assert measure_at(meters, QUARTER * 8) == 2
+    assert measure_at(meters, QUARTER * 11 - 1) == 2
+    assert measure_at(meters, QUARTER * 11) == 3
+    assert measure_at([], QUARTER * 4) == 1
+
+
+def test_findings():
+    notes = [
+        {"onset": 0, "duration": QUARTER, "lyrics": "", "phonemes": ""},
+        {"onset": QUARTER, "duration": QUARTER, "lyrics": ".hh ah"},
+        {"onset": QUARTER * 2, "duration": QUARTER, "lyrics": "la", "phonemes": "l zz"},
+        {"onset": QUARTER * 8, "duration": QUARTER, "lyrics": "sing", "phonemes": "s ih ng"},
+        {"onset": QUARTER * 10, "duration": QUARTER, "lyrics": "-"},
+        {"onset": QUARTER * 11, "duration": QUARTER, "lyrics": "-"},
+    ]
+    project = {
+        "time": {"meter": [{"index": 0, "numerator": 4, "denominator": 4},
+                           {"index": 2, "numerator": 3, "denominator": 4}]},
+        "library": [],
+        "tracks": [{"name": "Lead", "mainGroup": {"notes": notes}, "mainRef": {"database": {"language": "english"}},
+                    "groups": []}],
+    }
+    inventories = {"english": {"hh", "ah", "l", "s", "ih", "ng"}}
+
+    findings = [(f.kind, f.onset, f.measure, f.lyrics, f.detail)
+                for f in scan_project(project, "song.svp", inventories)]
+    assert findings == [
+        ("missing", 0, 1, "", ""),
+        ("unknown", QUARTER * 2, 1, "la", "phonemes zz not in EnglishARPABET"),
+        ("split", QUARTER * 8, 3, "sing", "spans a rest over 3 notes, syllables: s ih; ng"),
+    ]
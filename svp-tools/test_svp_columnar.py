@@ -0,0 +1,50 @@
+"""Columnar quantization against the per-note port of QuantizeNotes.js in bench_quantize."""
+
+import copy
+
+import numpy as np
+import pytest
+
+from bench_quantize import quantize_loop, synthetic_groups
+from svp import QUARTER
+from svp_columnar import GRID_CHOICES, MODES, ColumnarProject, quantize_both, quantize_end, quantize_start
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("grid", ["1/16", "1/8T", "1/4."])
+def test_matches_loop_port(mode, grid):
+    grid = GRID_CHOICES[grid]
+    groups = synthetic_groups(3000, 6, seed=3)
+
+    expected = copy.deepcopy(groups)
+    for notes in expected:
+        quantize_loop(mode, notes, grid)
+
+    flat = [note for notes in groups for note in notes]
+    onset = np.array([n[0] for n in flat], dtype=np.int64)
+    duration = np.array([n[1] for n in flat], dtype=np.int64)
+    if mode == "both":
+        group = np.repeat(np.arange(len(groups)), [len(notes) for notes in groups])
+        onset, duration = quantize_both(onset, duration, grid, group)
+    else:
+        onset, duration = {"start": quantize_start, "end": quantize_end}[mode](onset, duration, grid)
+
+    assert [[o, d] for o, d in zip(onset.tolist(), duration.tolist())] == \
+        [note for notes in expected for note in notes]
+
+
+def test_sync_keeps_missing_keys_missing():
+    project = {"tracks": [{"mainGroup": {"notes": [
+        {"onset": 1000, "duration": QUARTER},
+        {"onset": QUARTER * 2, "duration": QUARTER, "pitch": 60},
+    ]}}], "library": []}
+    columns = ColumnarProject(project)
+    columns.quantize("start", GRID_CHOICES["1/16"])
+    notes = columns.sync()["tracks"][0]["mainGroup"]["notes"]
+    assert notes == [
+        {"onset": 0, "duration": QUARTER},
+        {"onset": QUARTER * 2, "duration": QUARTER, "pitch": 60},
+    ]
+
+    columns.pitch[0] = 62
+    assert columns.sync()["tracks"][0]["mainGroup"]["notes"][0]["pitch"] == 62
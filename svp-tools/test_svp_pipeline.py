@@ -0,0 +1,91 @@
+"""A fused pipeline gives the same projects as running its stages one at a time."""
+
+import copy
+import itertools
+import json
+import random
+import re
+
+import pytest
+
+from svp import QUARTER
+from svp_pipeline import Pipeline, StageError, has_shared_groups, parse_stage
+
+# pitch-perfect without noise, which is drawn from an unseeded generator
+STAGES = ["merge-tied", "split-voices", "quantize:grid=1/8", "gain:db=2", "pitch-perfect:noise=0",
+          "move-to-voice:low=62"]
+
+
+def random_notes(rng):
+    notes, t = [], rng.randrange(0, QUARTER)
+    for _ in range(rng.randrange(4, 14)):
+        duration = rng.choice([QUARTER // 3, QUARTER // 2, QUARTER, QUARTER * 2]) + rng.randrange(-999, 999)
+        notes.append({"onset": t, "duration": duration, "pitch": rng.randrange(55, 70),
+                      "lyrics": rng.choice(["la", "-", "-", "a"])})
+        t += rng.choice([duration, duration, duration // 2, duration + QUARTER])
+    return notes
+
+
+def random_project(seed, inline_main):
+    """Three tracks; some also place the library group of another track."""
+    rng = random.Random(seed)
+    project = {"version": 153, "time": {"tempo": [{"position": 0, "bpm": 120.0}]}, "library": [], "tracks": []}
+    for t in range(3):
+        track = {"name": f"T{t}", "dispOrder": t, "mixer": {"gainDecibel": 0.0}, "groups": [], "uuid": f"t{t}"}
+        group = {"name": f"g{t}", "uuid": f"g{seed}-{t}", "parameters": {}, "notes": random_notes(rng)}
+        ref = {"groupID": group["uuid"], "blickOffset": 0, "pitchOffset": 0, "isInstrumental": False, "uuid": f"r{t}"}
+        if inline_main:
+            track["mainGroup"], track["mainRef"] = group, ref
+            library_group = {"name": f"l{t}", "uuid": f"l{seed}-{t}", "parameters": {}, "notes": random_notes(rng)}
+            project["library"].append(library_group)
+            track["groups"].append(dict(ref, groupID=library_group["uuid"], uuid=f"lr{t}",
+                                        blickOffset=QUARTER * 8))
+        else:
+            project["library"].append(group)
+            track["mainGroup"], track["mainRef"] = dict(ref), dict(ref)
+        project["tracks"].append(track)
+
+    shared = project["library"][0]["uuid"]
+    for t, track in enumerate(project["tracks"][1:], start=1):
+        track["groups"].append({"groupID": shared, "blickOffset": rng.randrange(8) * QUARTER // 2,
+                                "pitchOffset": 0, "isInstrumental": False, "uuid": f"s{t}"})
+    return project
+
+
+def normalized(project):
+    """The project as text, with generated uuids and control ids numbered in order of appearance."""
+    ids = {}
+    text = json.dumps(project, sort_keys=True)
+    return re.sub(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|(?<=\"id\": \")[0-9a-f]{16}",
+                  lambda m: ids.setdefault(m.group(), f"id-{len(ids)}"), text)
+
+
+PROJECTS = [random_project(seed, inline_main=seed % 2 == 0) for seed in range(8)]
+
+
+@pytest.mark.parametrize("specs", [list(c) for c in itertools.permutations(STAGES, 3)], ids="+".join)
+def test_fused_matches_one_at_a_time(specs):
+    for project in PROJECTS:
+        assert has_shared_groups(project)
+        fused = copy.deepcopy(project)
+        Pipeline([parse_stage(spec) for spec in specs]).run(fused, {})
+        separate = copy.deepcopy(project)
+        for spec in specs:
+            Pipeline([parse_stage(spec)]).run(separate, {})
+        assert normalized(fused) == normalized(separate)
+
+
+def test_unshared_projects_take_one_traversal():
+    project = random_project(1, inline_main=False)
+    for track in project["tracks"]:
+        track["groups"] = []
+    pipeline = Pipeline([parse_stage(spec) for spec in ["split-voices", "quantize", "merge-tied", "pitch-perfect"]])
+    assert not has_shared_groups(project)
+    assert pipeline.run(project, {}) == 1
+    assert len(pipeline.shared_passes) == 2
+
+
+@pytest.mark.parametrize("grid", ["abc", "0", "-5", "1/3"])
+def test_quantize_rejects_bad_grids(grid):
+    with pytest.raises(StageError):
+        parse_stage(f"quantize:grid={grid}")
@@ -0,0 +1,92 @@
+"""Streaming reads and rewrites of .svp documents."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import svp_stream
+from svp import QUARTER
+
+FIXTURE = Path(__file__).resolve().parent.parent / "musicxml-to-svp" / "testdata" / "loudness.svp"
+
+PROJECT = {
+    "version": 153,
+    "time": {"meter": [{"index": 0, "numerator": 4, "denominator": 4}], "tempo": [{"position": 0, "bpm": 120.0}]},
+    "library": [{
+        "name": "Sopran \"ä\"", "uuid": "g1",
+        "parameters": {"pitchDelta": {"mode": "cubic", "points": [0, 0.0, QUARTER, 12.5]}},
+        "notes": [{"onset": QUARTER * i, "duration": QUARTER, "pitch": 60 + i, "lyrics": "laä"} for i in range(40)],
+        "pitchControls": [{"type": "point", "pos": 1, "pitch": 60}],
+    }],
+    "tracks": [{
+        "name": "Track 1", "dispOrder": 0, "mixer": {"gainDecibel": -1.5},
+        "mainGroup": {"name": "main", "uuid": "m1", "parameters": {}, "notes": []},
+        "mainRef": {"groupID": "m1", "blickOffset": 0},
+        "groups": [{"groupID": "g1", "blickOffset": QUARTER * 4}],
+    }],
+}
+
+TEXTS = {
+    "compact": json.dumps(PROJECT, ensure_ascii=False, separators=(",", ":")),
+    "indented": json.dumps(PROJECT, indent=2) + "\n",
+}
+
+
+def rewrite(text, edit, chunk_size):
+    out = io.StringIO()
+    stream = svp_stream.ProjectStream(io.StringIO(text), out=out, chunk_size=chunk_size)
+    for path, value in stream.events():
+        new = edit(path, value)
+        if new is not None:
+            stream.replace(new)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("style", TEXTS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, svp_stream.CHUNK_SIZE])
+def test_rewrite_without_edits_is_byte_identical(style, chunk_size):
+    text = TEXTS[style]
+    assert rewrite(text, lambda path, value: None, chunk_size) == text
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, svp_stream.CHUNK_SIZE])
+def test_rewrite_replaces_only_edited_values(chunk_size):
+    def transpose(path, value):
+        if len(path) > 1 and path[-2] == "notes":
+            return dict(value, pitch=value["pitch"] + 12)
+        return None
+
+    result = json.loads(rewrite(TEXTS["indented"], transpose, chunk_size))
+    expected = json.loads(TEXTS["indented"])
+    for note in expected["library"][0]["notes"]:
+        note["pitch"] += 12
+    assert result == expected
+
+
+def test_load_leaves_out_skipped_values():
+    project = svp_stream.load(io.StringIO(TEXTS["indented"]))
+    assert "pitchControls" not in project["library"][0]
+    assert "points" not in project["library"][0]["parameters"]["pitchDelta"]
+    assert project["library"][0]["notes"] == PROJECT["library"][0]["notes"]
+    assert svp_stream.load(io.StringIO(TEXTS["compact"]), skip=frozenset()) == PROJECT
+
+
+def test_load_matches_json_load():
+    text = FIXTURE.read_text(encoding="utf-8")
+    with open(FIXTURE, encoding="utf-8") as f:
+        assert svp_stream.load(f, skip=frozenset()) == json.loads(text.rstrip("\0"))
+
+
+def test_empty_containers_are_kept():
+    project = {"library": [], "tracks": [
+        {"name": "Empty", "mainGroup": {"notes": [], "parameters": {}}, "groups": []},
+        {},
+    ]}
+    text = json.dumps(project)
+    assert svp_stream.load(io.StringIO(text), skip=frozenset()) == project
+    tracks = dict(svp_stream.iter_tracks(io.StringIO(text)))
+    assert tracks == {("tracks", 0): {"name": "Empty", "mainGroup": {"parameters": {}}, "groups": []},
+                      ("tracks", 1): {}}
+    assert list(svp_stream.iter_groups(io.StringIO(text))) == []